@@ -16,6 +16,8 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+from types import ModuleType as _ModuleType
+
 from .pins import (
     Factory,
     Pin,
@@ -24,10 +26,6 @@ from .pins import (
     HeaderInfo,
     PinInfo,
 )
-from .pins.pi import (
-    PiBoardInfo,
-    pi_info,
-)
 # Yes, import * is naughty, but exc imports nothing else so there's no cross
 # contamination here ... and besides, have you *seen* the list lately?!
 from .exc import *
@@ -36,6 +34,7 @@ from .devices import (
     GPIODevice,
     CompositeDevice,
 )
+from .threads import EventExecutor
 from .mixins import (
     SharedMixin,
     SourceMixin,
@@ -44,85 +43,127 @@ from .mixins import (
     event,
     HoldMixin,
 )
-from .input_devices import (
-    InputDevice,
-    DigitalInputDevice,
-    SmoothedInputDevice,
-    Button,
-    LineSensor,
-    MotionSensor,
-    LightSensor,
-    DistanceSensor,
-    RotaryEncoder,
-)
-from .spi_devices import (
-    SPIDevice,
-    AnalogInputDevice,
-    MCP3001,
-    MCP3002,
-    MCP3004,
-    MCP3008,
-    MCP3201,
-    MCP3202,
-    MCP3204,
-    MCP3208,
-    MCP3301,
-    MCP3302,
-    MCP3304,
-)
-from .output_devices import (
-    OutputDevice,
-    DigitalOutputDevice,
-    PWMOutputDevice,
-    PWMLED,
-    LED,
-    Buzzer,
-    Motor,
-    PhaseEnableMotor,
-    Servo,
-    AngularServo,
-    RGBLED,
-    TonalBuzzer,
-)
-from .boards import (
-    CompositeOutputDevice,
-    ButtonBoard,
-    LEDCollection,
-    LEDBoard,
-    LEDBarGraph,
-    LEDCharDisplay,
-    LEDMultiCharDisplay,
-    LEDCharFont,
-    LedBorg,
-    PiHutXmasTree,
-    PiLiter,
-    PiLiterBarGraph,
-    TrafficLights,
-    PiTraffic,
-    PiStop,
-    StatusZero,
-    StatusBoard,
-    SnowPi,
-    TrafficLightsBuzzer,
-    FishDish,
-    TrafficHat,
-    TrafficpHat,
-    Robot,
-    RyanteckRobot,
-    CamJamKitRobot,
-    PololuDRV8835Robot,
-    PhaseEnableRobot,
-    Energenie,
-    PumpkinPi,
-    JamHat,
-    Pibrella,
-)
-from .internal_devices import (
-    InternalDevice,
-    PolledInternalDevice,
-    PingServer,
-    CPUTemperature,
-    LoadAverage,
-    TimeOfDay,
-    DiskUsage,
-)
+
+# The device modules (and the pin data, fonts, and tones they pull in) are
+# comparatively expensive to import, so the names below are only imported from
+# them on first access. Scripts which use a single device class then only load
+# what that class requires
+_LAZY_MODULES = {
+    '.pins.pi': (
+        'PiBoardInfo',
+        'pi_info',
+    ),
+    '.input_devices': (
+        'InputDevice',
+        'DigitalInputDevice',
+        'SmoothedInputDevice',
+        'Button',
+        'LineSensor',
+        'MotionSensor',
+        'LightSensor',
+        'DistanceSensor',
+        'RotaryEncoder',
+    ),
+    '.spi_devices': (
+        'SPIDevice',
+        'AnalogInputDevice',
+        'MCP3001',
+        'MCP3002',
+        'MCP3004',
+        'MCP3008',
+        'MCP3201',
+        'MCP3202',
+        'MCP3204',
+        'MCP3208',
+        'MCP3301',
+        'MCP3302',
+        'MCP3304',
+        'AnalogInputChannels',
+        'AnalogInputStream',
+    ),
+    '.output_devices': (
+        'OutputDevice',
+        'DigitalOutputDevice',
+        'PWMOutputDevice',
+        'PWMLED',
+        'LED',
+        'Buzzer',
+        'Motor',
+        'PhaseEnableMotor',
+        'Servo',
+        'AngularServo',
+        'RGBLED',
+        'TonalBuzzer',
+    ),
+    '.boards': (
+        'CompositeOutputDevice',
+        'ButtonBoard',
+        'LEDCollection',
+        'LEDBoard',
+        'LEDBarGraph',
+        'LEDCharDisplay',
+        'LEDMultiCharDisplay',
+        'LEDCharFont',
+        'LedBorg',
+        'PiHutXmasTree',
+        'PiLiter',
+        'PiLiterBarGraph',
+        'TrafficLights',
+        'PiTraffic',
+        'PiStop',
+        'StatusZero',
+        'StatusBoard',
+        'SnowPi',
+        'TrafficLightsBuzzer',
+        'FishDish',
+        'TrafficHat',
+        'TrafficpHat',
+        'Robot',
+        'RyanteckRobot',
+        'CamJamKitRobot',
+        'PololuDRV8835Robot',
+        'PhaseEnableRobot',
+        'Energenie',
+        'PumpkinPi',
+        'JamHat',
+        'Pibrella',
+    ),
+    '.internal_devices': (
+        'InternalDevice',
+        'PolledInternalDevice',
+        'PingServer',
+        'CPUTemperature',
+        'LoadAverage',
+        'TimeOfDay',
+        'DiskUsage',
+    ),
+}
+_LAZY_IMPORTS = {
+    name: module
+    for module, names in _LAZY_MODULES.items()
+    for name in names
+}
+
+__all__ = [
+    name for name, value in globals().items()
+    if not name.startswith('_') and not isinstance(value, _ModuleType)
+] + list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    # The builtin __import__ (rather than importlib.import_module) goes
+    # through the interpreter's own import machinery, so lazily loaded
+    # modules still show up under "python -X importtime"
+    value = getattr(
+        __import__(module.lstrip('.'), globals(), None, [name], 1), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
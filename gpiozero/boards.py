@@ -21,7 +21,7 @@ import warnings
 from time import sleep
 from itertools import repeat, cycle, chain, tee
 from threading import Lock
-from collections import OrderedDict, Counter, namedtuple
+from collections import OrderedDict, Counter, namedtuple, defaultdict
 from collections.abc import MutableMapping
 from pprint import pformat
 
@@ -44,6 +44,7 @@ from .exc import (
 from .input_devices import Button
 from .output_devices import (
     OutputDevice,
+    DigitalOutputDevice,
     LED,
     PWMLED,
     RGBLED,
@@ -53,7 +54,7 @@ from .output_devices import (
     TonalBuzzer,
     )
 from .threads import GPIOThread
-from .devices import Device, CompositeDevice
+from .devices import Device, CompositeDevice, _writes_pin_state
 from .mixins import SharedMixin, SourceMixin, HoldMixin, event
 from .fonts import load_font_7seg, load_font_14seg
 
@@ -96,21 +97,43 @@ class CompositeOutputDevice(SourceMixin, CompositeDevice):
         the composite device's tuple :attr:`value`.
     """
 
+    def _write_many(self, values, fallback):
+        # Applies an iterable of (device, value) pairs. The states of simple
+        # digital outputs are gathered by pin factory and written with a single
+        # Factory.write_many call so that backends capable of changing several
+        # pins at once can do so. All other output devices (including closed
+        # ones, so they raise DeviceClosed as usual) are passed to *fallback*
+        # along with their value; values for non-output devices are simply
+        # ignored
+        states = defaultdict(dict)
+        for device, value in values:
+            if (
+                    isinstance(device, DigitalOutputDevice) and
+                    _writes_pin_state(type(device)) and not device.closed
+            ):
+                device._stop_blink()
+                states[device.pin_factory][device.pin] = (
+                    device._value_to_state(value))
+            elif isinstance(device, (OutputDevice, CompositeOutputDevice)):
+                fallback(device, value)
+        for factory, pin_states in states.items():
+            factory.write_many(pin_states)
+
     def on(self):
         """
         Turn all the output devices on.
         """
-        for device in self:
-            if isinstance(device, (OutputDevice, CompositeOutputDevice)):
-                device.on()
+        self._write_many(
+            ((device, True) for device in self),
+            lambda device, value: device.on())
 
     def off(self):
         """
         Turn all the output devices off.
         """
-        for device in self:
-            if isinstance(device, (OutputDevice, CompositeOutputDevice)):
-                device.off()
+        self._write_many(
+            ((device, False) for device in self),
+            lambda device, value: device.off())
 
     def toggle(self):
         """
@@ -131,10 +154,11 @@ class CompositeOutputDevice(SourceMixin, CompositeDevice):
 
     @value.setter
     def value(self, value):
-        for device, v in zip(self, value):
-            if isinstance(device, (OutputDevice, CompositeOutputDevice)):
-                device.value = v
-            # Simply ignore values for non-output devices
+        self._write_many(zip(self, value), self._write_value)
+
+    @staticmethod
+    def _write_value(device, value):
+        device.value = value
 
 
 class ButtonBoard(HoldMixin, CompositeDevice):
@@ -263,7 +287,7 @@ class ButtonBoard(HoldMixin, CompositeDevice):
 
     def _fire_changed(self):
         if self.when_changed:
-            self.when_changed()
+            self._call_handler(self.when_changed)
 
     def _fire_events(self, ticks, new_value):
         super()._fire_events(ticks, new_value)
@@ -728,8 +752,9 @@ class LEDBarGraph(LEDCollection):
             calc_value = lambda index: min(1, max(0, count * value - index))
         else:
             calc_value = lambda index: value >= ((index + 1) / count)
-        for index, led in enumerate(leds):
-            led.value = calc_value(index)
+        self._write_many(
+            ((led, calc_value(index)) for index, led in enumerate(leds)),
+            self._write_value)
 
     @property
     def lit_count(self):
@@ -1034,8 +1059,7 @@ class LEDCharDisplay(LEDCollection):
 
     @value.setter
     def value(self, value):
-        for led, v in zip(self, self._parse_state(value)):
-            led.value = v
+        self._write_many(zip(self, self._parse_state(value)), self._write_value)
 
     def _parse_state(self, value):
         if hasattr(self, 'dp'):
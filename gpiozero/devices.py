@@ -13,7 +13,7 @@ import os
 import atexit
 import weakref
 import warnings
-from collections import namedtuple
+from collections import namedtuple, defaultdict
 from itertools import chain
 from types import FunctionType
 
@@ -27,6 +27,7 @@ from .threads import _threads_shutdown
 from .mixins import (
     ValuesMixin,
     SharedMixin,
+    event,
 )
 from .exc import (
     BadPinFactory,
@@ -65,8 +66,44 @@ class GPIOMeta(type):
                         if base_fn.__doc__:
                             attr.__doc__ = base_fn.__doc__
                             break
+        cls._update_attrs()
         return cls
 
+    def _update_attrs(cls):
+        # Cache the set of the class' attribute names (from which the
+        # __attrs__ of each instance is built), and the tuple of its event
+        # descriptors (used by event.__set__ and EventsMixin._all_events).
+        # Aliases of an event (e.g. Button.when_pressed) are only included
+        # once
+        type.__setattr__(cls, '__class_attrs__', frozenset(dir(cls)))
+        events = {}
+        names = set()
+        for base_cls in cls.__mro__:
+            for attr_name, attr in vars(base_cls).items():
+                if attr_name not in names:
+                    names.add(attr_name)
+                    if isinstance(attr, event):
+                        events[id(attr)] = attr
+        type.__setattr__(cls, '__events__', tuple(events.values()))
+        for sub_cls in type.__subclasses__(cls):
+            sub_cls._update_attrs()
+
+    def __setattr__(cls, name, value):
+        # Attributes (typically aliases) added to a class after its creation
+        # must be reflected in the cached attributes of the class, and its
+        # descendents. Re-assigning an existing attribute (such as
+        # Device.pin_factory) needn't be, unless it involves an event
+        update = (
+            name not in cls.__class_attrs__ or isinstance(value, event) or
+            isinstance(getattr(cls, name, None), event))
+        super().__setattr__(name, value)
+        if update:
+            cls._update_attrs()
+
+    def __delattr__(cls, name):
+        super().__delattr__(name)
+        cls._update_attrs()
+
     def __call__(cls, *args, **kwargs):
         # Make sure cls has GPIOBase somewhere in its ancestry (otherwise
         # setting __attrs__ below will be rather pointless)
@@ -107,12 +144,13 @@ class GPIOMeta(type):
             # Construct the instance as normal
             self = super().__call__(*args, **kwargs)
         # At this point __new__ and __init__ have all been run. We now fix the
-        # set of attributes on the class by dir'ing the instance and creating a
-        # frozenset of the result called __attrs__ (which is queried by
-        # GPIOBase.__setattr__). An exception is made for SharedMixin devices
-        # which can be constructed multiple times, returning the same instance
+        # set of attributes on the class by combining the (cached) attributes
+        # of the class with those of the instance, creating a frozenset of the
+        # result called __attrs__ (which is queried by GPIOBase.__setattr__).
+        # An exception is made for SharedMixin devices which can be
+        # constructed multiple times, returning the same instance
         if not issubclass(cls, SharedMixin) or self._refs == 1:
-            self.__attrs__ = frozenset(dir(self))
+            self.__attrs__ = cls.__class_attrs__.union(vars(self))
         return self
 
 
@@ -515,7 +553,30 @@ class CompositeDevice(Device):
         elements. Unnamed devices will have a unique name generated for them,
         and they will appear in the position they appeared in the constructor.
         """
-        return self.namedtuple(*(device.value for device in self))
+        return self.namedtuple(*self._read_many())
+
+    def _read_many(self):
+        # Devices whose value derives solely from their pin's state are
+        # sampled with a single Factory.read_many call per pin factory so that
+        # backends capable of reading several pins at once can do so (and the
+        # resulting values all represent the same instant). All other devices
+        # are simply queried for their value
+        batches = defaultdict(list)
+        for device in self:
+            if (
+                    isinstance(device, GPIODevice) and
+                    _reads_pin_state(type(device)) and not device.closed
+            ):
+                batches[device.pin_factory].append(device)
+        values = {}
+        for factory, devices in batches.items():
+            states = factory.read_many([device.pin for device in devices])
+            for device, state in zip(devices, states):
+                values[device] = device._state_to_value(state)
+        return [
+            values[device] if device in values else device.value
+            for device in self
+        ]
 
     @property
     def is_active(self):
@@ -539,6 +600,12 @@ class GPIODevice(Device):
         will be raised. If the pin is already in use by another device,
         :exc:`GPIOPinInUse` will be raised.
     """
+    # Declares that the value of this class is _state_to_value(pin.state), so
+    # composite devices may read it via Factory.read_many. This only applies
+    # to descendents that don't override value, _read, or _state_to_value;
+    # those that do (and still derive value from the pin's state) must
+    # declare it again (see _reads_pin_state)
+    _read_pin_state = True
 
     def __init__(self, pin=None, *, pin_factory=None):
         super().__init__(pin_factory=pin_factory)
@@ -610,6 +677,33 @@ class GPIODevice(Device):
             return f"<gpiozero.{self.__class__.__name__} object closed>"
 
 
+def _reads_pin_state(cls):
+    # Returns the _read_pin_state declared by cls, or its nearest ancestor,
+    # unless a class in between overrides how the value is derived (e.g. a
+    # user's descendent of LED with its own value property)
+    for base_cls in cls.__mro__:
+        attrs = vars(base_cls)
+        if '_read_pin_state' in attrs:
+            return attrs['_read_pin_state']
+        elif 'value' in attrs or '_read' in attrs or '_state_to_value' in attrs:
+            return False
+    return False
+
+
+def _writes_pin_state(cls):
+    # Returns the _write_pin_state declared by cls, or its nearest ancestor,
+    # unless a class in between overrides how values are written (e.g. a
+    # user's descendent of LED with its own on method)
+    for base_cls in cls.__mro__:
+        attrs = vars(base_cls)
+        if '_write_pin_state' in attrs:
+            return attrs['_write_pin_state']
+        elif any(name in attrs for name in (
+                'value', '_write', '_value_to_state', 'on', 'off')):
+            return False
+    return False
+
+
 def _devices_shutdown():
     if Device.pin_factory is not None:
         with Device.pin_factory._res_lock:
@@ -28,10 +28,12 @@ from .exc import (
 )
 from .devices import GPIODevice, CompositeDevice
 from .mixins import GPIOQueue, EventsMixin, HoldMixin, event
-try:
-    from .pins.pigpio import PiGPIOFactory
-except ImportError:
-    PiGPIOFactory = None
+
+
+# The pigpio factory class, imported on construction of the first
+# DistanceSensor (None if pigpio isn't available)
+_NOT_IMPORTED = object()
+_PiGPIOFactory = _NOT_IMPORTED
 
 
 class InputDevice(GPIODevice):
@@ -405,6 +407,8 @@ class Button(HoldMixin, DigitalInputDevice):
         See :doc:`api_pins` for more information (this is an advanced feature
         which most users can ignore).
     """
+    _read_pin_state = True
+
     def __init__(self, pin=None, *, pull_up=True, active_state=None,
                  bounce_time=None, hold_time=1, hold_repeat=False,
                  pin_factory=None):
@@ -847,7 +851,19 @@ class DistanceSensor(SmoothedInputDevice):
             self.close()
             raise
 
-        if PiGPIOFactory is None or not isinstance(self.pin_factory, PiGPIOFactory):
+        # Only import the pigpio factory here; attempting it at module level
+        # slows "import gpiozero" considerably when pigpio isn't installed.
+        # The outcome is cached so a failed import isn't retried by every
+        # sensor constructed
+        global _PiGPIOFactory
+        if _PiGPIOFactory is _NOT_IMPORTED:
+            try:
+                from .pins.pigpio import PiGPIOFactory
+            except ImportError:
+                PiGPIOFactory = None
+            _PiGPIOFactory = PiGPIOFactory
+        if _PiGPIOFactory is None or not isinstance(
+                self.pin_factory, _PiGPIOFactory):
             warnings.warn(PWMSoftwareFallback(
                 'For more accurate readings, use the pigpio pin factory.'
                 'See https://gpiozero.readthedocs.io/en/stable/api_input.html#distancesensor-hc-sr04 for more info'
@@ -1300,15 +1316,15 @@ class RotaryEncoder(EventsMixin, CompositeDevice):
 
     def _fire_rotated(self):
         if self.when_rotated:
-            self.when_rotated()
+            self._call_handler(self.when_rotated)
 
     def _fire_rotated_cw(self):
         if self.when_rotated_clockwise:
-            self.when_rotated_clockwise()
+            self._call_handler(self.when_rotated_clockwise)
 
     def _fire_rotated_ccw(self):
         if self.when_rotated_counter_clockwise:
-            self.when_rotated_counter_clockwise()
+            self._call_handler(self.when_rotated_counter_clockwise)
 
     @steps.setter
     def steps(self, value):
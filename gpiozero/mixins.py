@@ -17,7 +17,7 @@ from threading import Event
 from collections import deque
 from statistics import median
 
-from .threads import GPIOThread
+from .threads import GPIOThread, EventExecutor
 from .exc import (
     BadEventHandler,
     BadWaitTime,
@@ -218,9 +218,7 @@ class event:
             self.handlers[id(instance)] = self._wrap_callback(instance, value)
         enabled = any(
             obj.handlers.get(id(instance))
-            for name in dir(type(instance))
-            for obj in (getattr(type(instance), name),)
-            if isinstance(obj, event)
+            for obj in instance._all_events()
         )
         instance._start_stop_events(enabled)
 
@@ -245,16 +243,23 @@ class EventsMixin:
         self._inactive_event = Event()
         self._last_active = None
         self._last_changed = self.pin_factory.ticks()
+        self._event_executor = None
 
     def _all_events(self):
         """
-        Generator function which yields all :class:`event` instances defined
-        against this class.
+        Returns a sequence of all :class:`event` instances defined against this
+        class.
         """
-        for name in dir(type(self)):
-            obj = getattr(type(self), name)
-            if isinstance(obj, event):
-                yield obj
+        try:
+            # Cached by GPIOMeta on the classes it constructs
+            return type(self).__events__
+        except AttributeError:
+            return tuple({
+                id(obj): obj
+                for name in dir(type(self))
+                for obj in (getattr(type(self), name),)
+                if isinstance(obj, event)
+            }.values())
 
     def close(self):
         for ev in self._all_events():
@@ -342,15 +347,43 @@ class EventsMixin:
         else:
             return None
 
+    @property
+    def event_executor(self):
+        """
+        The :class:`~gpiozero.EventExecutor` used to run this device's event
+        handlers. If this is :data:`None` (the default), the pin factory's
+        :attr:`~gpiozero.Factory.event_executor` is used; if that is also
+        :data:`None`, handlers run immediately on the thread that detected the
+        event.
+        """
+        if self._event_executor is None:
+            return self.pin_factory.event_executor
+        return self._event_executor
+
+    @event_executor.setter
+    def event_executor(self, value):
+        if value is not None and not isinstance(value, EventExecutor):
+            raise BadEventHandler('value must be None or an EventExecutor')
+        self._event_executor = value
+
+    def _call_handler(self, handler):
+        # Run handler now, or queue it on the executor (if any) keyed by this
+        # device so that its handlers remain in order
+        executor = self.event_executor
+        if executor is None:
+            handler()
+        else:
+            executor.submit(self, handler)
+
     def _fire_activated(self):
         # These methods are largely here to be overridden by descendents
         if self.when_activated:
-            self.when_activated()
+            self._call_handler(self.when_activated)
 
     def _fire_deactivated(self):
         # These methods are largely here to be overridden by descendents
         if self.when_deactivated:
-            self.when_deactivated()
+            self._call_handler(self.when_deactivated)
 
     def _fire_events(self, ticks, new_active):
         """
@@ -437,7 +470,7 @@ class HoldMixin(EventsMixin):
 
     def _fire_held(self):
         if self.when_held:
-            self.when_held()
+            self._call_handler(self.when_held)
 
     when_held = event(
         """
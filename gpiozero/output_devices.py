@@ -32,10 +32,6 @@ from .devices import GPIODevice, Device, CompositeDevice
 from .mixins import SourceMixin
 from .threads import GPIOThread
 from .tones import Tone
-try:
-    from .pins.pigpio import PiGPIOFactory
-except ImportError:
-    PiGPIOFactory = None
 
 
 class OutputDevice(SourceMixin, GPIODevice):
@@ -69,6 +65,8 @@ class OutputDevice(SourceMixin, GPIODevice):
         See :doc:`api_pins` for more information (this is an advanced feature
         which most users can ignore).
     """
+    _read_pin_state = True
+
     def __init__(self, pin=None, *, active_high=True, initial_value=False,
                  pin_factory=None):
         super().__init__(pin, pin_factory=pin_factory)
@@ -185,6 +183,13 @@ class DigitalOutputDevice(OutputDevice):
         See :doc:`api_pins` for more information (this is an advanced feature
         which most users can ignore).
     """
+    _read_pin_state = True
+    # Declares that writing a value to this class (via value, on, or off)
+    # stops any blink and sets pin.state to _value_to_state(value), so
+    # composite devices may write it via Factory.write_many. Descendents that
+    # override any of those must declare it again (see _writes_pin_state)
+    _write_pin_state = True
+
     def __init__(self, pin=None, *, active_high=True, initial_value=False,
                  pin_factory=None):
         self._blink_thread = None
@@ -232,11 +237,24 @@ class DigitalOutputDevice(OutputDevice):
             continue blinking and return immediately. If :data:`False`, only
             return when the blink is finished (warning: the default value of
             *n* will result in this method never returning).
+
+        .. note::
+
+            Where the pin supports it (e.g. with
+            :class:`~gpiozero.pins.lgpio.LGPIOFactory`), the blink is timed
+            by the pin's driver via :meth:`Pin.output_sequence
+            <gpiozero.Pin.output_sequence>` rather than a background thread.
         """
         self._stop_blink()
-        self._blink_thread = GPIOThread(
-            self._blink_device, (on_time, off_time, n))
-        self._blink_thread.start()
+        self._check_open()
+        self._blink_thread = self.pin.output_sequence([
+            (self._value_to_state(True), on_time),
+            (self._value_to_state(False), off_time),
+        ], n)
+        if self._blink_thread is None:
+            self._blink_thread = GPIOThread(
+                self._blink_device, (on_time, off_time, n))
+            self._blink_thread.start()
         if not background:
             self._blink_thread.join()
             self._blink_thread = None
@@ -500,13 +518,27 @@ class PWMOutputDevice(OutputDevice):
             continue blinking and return immediately. If :data:`False`, only
             return when the blink is finished (warning: the default value of
             *n* will result in this method never returning).
+
+        .. note::
+
+            Where the pin supports it (e.g. with
+            :class:`~gpiozero.pins.pigpio.PiGPIOFactory`), the blink is
+            played by the pin's hardware via :meth:`Pin.output_sequence
+            <gpiozero.Pin.output_sequence>` rather than a background thread.
         """
         self._stop_blink()
-        self._blink_thread = GPIOThread(
-            self._blink_device,
-            (on_time, off_time, fade_in_time, fade_out_time, n)
-        )
-        self._blink_thread.start()
+        self._check_open()
+        self._blink_thread = self.pin.output_sequence([
+            (self._value_to_state(value), delay)
+            for value, delay in self._blink_sequence(
+                on_time, off_time, fade_in_time, fade_out_time)
+        ], n)
+        if self._blink_thread is None:
+            self._blink_thread = GPIOThread(
+                self._blink_device,
+                (on_time, off_time, fade_in_time, fade_out_time, n)
+            )
+            self._blink_thread.start()
         if not background:
             self._blink_thread.join()
             self._blink_thread = None
@@ -544,8 +576,8 @@ class PWMOutputDevice(OutputDevice):
             self._blink_thread.stop()
             self._blink_thread = None
 
-    def _blink_device(
-            self, on_time, off_time, fade_in_time, fade_out_time, n, fps=25):
+    def _blink_sequence(
+            self, on_time, off_time, fade_in_time, fade_out_time, fps=25):
         sequence = []
         if fade_in_time > 0:
             sequence += [
@@ -559,6 +591,12 @@ class PWMOutputDevice(OutputDevice):
                 for i in range(int(fps * fade_out_time))
                 ]
         sequence.append((0, off_time))
+        return sequence
+
+    def _blink_device(
+            self, on_time, off_time, fade_in_time, fade_out_time, n, fps=25):
+        sequence = self._blink_sequence(
+            on_time, off_time, fade_in_time, fade_out_time, fps)
         sequence = (
                 cycle(sequence) if n is None else
                 chain.from_iterable(repeat(sequence, n))
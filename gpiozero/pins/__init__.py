@@ -16,10 +16,12 @@ from weakref import ref
 from threading import Lock
 from textwrap import dedent
 from itertools import cycle
+from functools import cached_property
 from collections import defaultdict, namedtuple
 
 from .style import Style
 from ..devices import Device
+from ..compat import frozendict
 from ..exc import (
     PinInvalidPin,
     PinSetInput,
@@ -57,10 +59,21 @@ class Factory:
     * :meth:`release_all`
     * :meth:`pin`
     * :meth:`spi`
+    * :meth:`read_many`
+    * :meth:`write_many`
+
+    .. attribute:: event_executor
+
+        The :class:`~gpiozero.EventExecutor` used to run the event handlers of
+        devices constructed with this factory (unless overridden by the
+        device's :attr:`~gpiozero.EventsMixin.event_executor`). Defaults to
+        :data:`None`, in which case handlers run immediately on the thread
+        which detected the event.
     """
     def __init__(self):
         self._reservations = defaultdict(list)
         self._res_lock = Lock()
+        self.event_executor = None
 
     def __enter__(self):
         return self
@@ -157,6 +170,31 @@ class Factory:
         raise PinSPIUnsupported(  # pragma: no cover
             'SPI not supported by this pin factory')
 
+    def read_many(self, pins):
+        """
+        Returns a tuple of the :attr:`~Pin.state` of each of the specified
+        *pins* (a sequence of :class:`Pin` instances constructed by this
+        factory), in the order given.
+
+        The default implementation simply queries the state of each pin in
+        turn. Descendents may override this to sample all the pins with as few
+        operations as possible (ideally at the same instant).
+        """
+        return tuple(pin.state for pin in pins)
+
+    def write_many(self, states):
+        """
+        Sets the :attr:`~Pin.state` of several pins at once. *states* is a
+        mapping of :class:`Pin` instances (constructed by this factory) to the
+        state that each should be set to.
+
+        The default implementation simply sets the state of each pin in turn.
+        Descendents may override this to change all the pins with as few
+        operations as possible (ideally at the same instant).
+        """
+        for pin, state in states.items():
+            pin.state = state
+
     def ticks(self):
         """
         Return the current ticks, according to the factory. The reference point
@@ -217,6 +255,7 @@ class Pin:
 
     * :meth:`close`
     * :meth:`output_with_state`
+    * :meth:`output_sequence`
     * :meth:`input_with_pull`
     * :meth:`_set_state`
     * :meth:`_get_frequency`
@@ -264,6 +303,24 @@ class Pin:
         self.function = 'output'
         self.state = state
 
+    def output_sequence(self, sequence, n=None):
+        """
+        Plays *sequence*, a list of (state, duration) tuples, on the pin *n*
+        times (or forever if *n* is :data:`None`) without the involvement of
+        a Python thread, returning an object with ``stop()`` and ``join()``
+        methods (like :class:`~gpiozero.threads.GPIOThread`) that controls the
+        playback, or :data:`None` if the pin cannot play *sequence* itself.
+
+        By default this always returns :data:`None`, and callers (such as
+        :meth:`~gpiozero.PWMOutputDevice.blink`) fall back to setting
+        :attr:`state` from a background thread. Descendents may override this
+        to offload the sequence to hardware (e.g. DMA timed waveforms). While
+        the sequence is playing, :attr:`state` should report the state
+        currently being output, and setting :attr:`state` or
+        :attr:`frequency` should stop playback.
+        """
+        return None
+
     def input_with_pull(self, pull):
         """
         Sets the pin's function to "input" and specifies an initial pull-up
@@ -504,6 +561,8 @@ class SPI(Device):
 
     * :meth:`read`
     * :meth:`write`
+    * :meth:`transfer_many`
+    * :meth:`transfer_into`
     * :meth:`_set_clock_mode`
     * :meth:`_get_lsb_first`
     * :meth:`_set_lsb_first`
@@ -556,6 +615,33 @@ class SPI(Device):
         """
         raise NotImplementedError
 
+    def transfer_many(self, messages):
+        """
+        Perform a :meth:`transfer` of each sequence of words in *messages*,
+        deasserting the select pin between each, and returning a list of the
+        sequences of words read. Implementations may override this to perform
+        all the transfers in a single operation (for instance, a single
+        ``ioctl`` for a hardware SPI interface), which is considerably quicker
+        than calling :meth:`transfer` repeatedly.
+        """
+        return [self.transfer(data) for data in messages]
+
+    def transfer_into(self, tx, rx):
+        """
+        Write the :term:`bytes-like object` *tx* to the SPI interface, reading
+        the same number of bytes into the writable buffer *rx* (which must be
+        at least as long as *tx*), and return the number of bytes transferred.
+
+        Each byte is a single word, so this is only applicable when
+        :attr:`bits_per_word` is 8 or less. Implementations should override
+        this to pass the buffers directly to the underlying interface,
+        avoiding the conversion to and from lists of ints performed by
+        :meth:`transfer`.
+        """
+        result = self.transfer(list(tx))
+        rx[:len(result)] = bytes(result)
+        return len(result)
+
     @property
     def clock_polarity(self):
         """
@@ -1248,7 +1334,22 @@ class BoardInfo(namedtuple('BoardInfo', (
 
     .. _system on a chip: https://en.wikipedia.org/wiki/System_on_a_chip
     """
-    __slots__ = () # workaround python issue #24931
+    # NOTE: No __slots__ here; instances need a __dict__ in which to cache
+    # _pins_by_name
+
+    @cached_property
+    def _pins_by_name(self):
+        # Maps every name (in all its alias spellings) of every pin to the
+        # tuple of (header, pin) pairs bearing that name, in header order.
+        # Built once per instance so that find_pin is a single lookup
+        index = defaultdict(list)
+        for header in self.headers.values():
+            for pin in header.pins.values():
+                for name in pin.names:
+                    index[name].append((header, pin))
+        return frozendict({
+            name: tuple(pins) for name, pins in index.items()
+        })
 
     def find_pin(self, name):
         """
@@ -1256,10 +1357,7 @@ class BoardInfo(namedtuple('BoardInfo', (
         :class:`HeaderInfo` and :class:`PinInfo` instances for which *name*
         equals :attr:`PinInfo.name`.
         """
-        for header in self.headers.values():
-            for pin in header.pins.values():
-                if name in pin.names:
-                    yield header, pin
+        yield from self._pins_by_name.get(name, ())
 
     def physical_pins(self, function):
         """
@@ -1340,12 +1438,14 @@ class BoardInfo(namedtuple('BoardInfo', (
         * 'GPIOn' where n is the GPIO number
         * 'h:n' where h is the header name and n is the physical pin number
         """
-        for header, pin in self.find_pin(name):
-            if 'gpio' in pin.interfaces:
-                return pin.name
-            else:
-                raise PinInvalidPin(f'{name} is not a GPIO pin')
-        raise PinInvalidPin(f'{name} is not a valid pin name')
+        try:
+            header, pin = self._pins_by_name[name][0]
+        except KeyError:
+            raise PinInvalidPin(f'{name} is not a valid pin name')
+        if 'gpio' in pin.interfaces:
+            return pin.name
+        else:
+            raise PinInvalidPin(f'{name} is not a GPIO pin')
 
     def __repr__(self):
         fields=', '.join(
@@ -0,0 +1,745 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: A simple interface to GPIO devices with Raspberry Pi
+#
+# Copyright (c) 2026 Ben Nuttall <ben@bennuttall.com>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import socket
+import asyncio
+from queue import Queue
+from struct import Struct
+from threading import Thread
+from collections import deque
+
+from .pi import PiPin, PiFactory
+from .spi import SPISoftware
+from ..mixins import SharedMixin
+from ..exc import (
+    PinInvalidFunction,
+    PinSetInput,
+    PinFixedPull,
+    PinInvalidPull,
+    PinInvalidBounce,
+    PinInvalidEdges,
+    PinInvalidState,
+    PinPWMFixedValue,
+)
+
+
+# The subset of the pigpiod socket commands used by this module; see the
+# pigpio documentation for the full list
+CMD_MODES = 0
+CMD_MODEG = 1
+CMD_PUD = 2
+CMD_READ = 3
+CMD_WRITE = 4
+CMD_PWM = 5
+CMD_PRS = 6
+CMD_PFS = 7
+CMD_BR1 = 10
+CMD_BC1 = 12
+CMD_BS1 = 14
+CMD_TICK = 16
+CMD_HWVER = 17
+CMD_NB = 19
+CMD_NC = 21
+CMD_PFG = 23
+CMD_GDC = 83
+CMD_FG = 97
+CMD_NOIB = 99
+
+# Commands whose results are unsigned 32-bit quantities, rather than a
+# (negative) error code or a signed result
+UNSIGNED_COMMANDS = {CMD_BR1, CMD_TICK, CMD_HWVER}
+
+
+class AsyncPiGPIOConnection:
+    """
+    An asyncio implementation of the pigpiod socket protocol. Commands are
+    written to the socket as soon as :meth:`command` is called, without
+    waiting for the responses to earlier commands, so that many commands may
+    be outstanding (pipelined) on the connection at once. The daemon answers
+    commands in the order they were sent, so responses are matched to their
+    commands in order.
+
+    Construct instances with :meth:`open`. All methods must be called from
+    the event loop that opened the connection.
+    """
+    COMMAND = Struct('=IIII')
+    RESPONSE = Struct('=IIII')
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending = deque()
+        self._receiver = asyncio.get_running_loop().create_task(
+            self._receive())
+
+    @classmethod
+    async def open(cls, host, port):
+        """
+        Open a connection to the pigpio daemon listening on *host* and
+        *port*.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        sock = writer.get_extra_info('socket')
+        if sock is not None and sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(reader, writer)
+
+    @property
+    def pending(self):
+        """
+        The number of commands sent which have not yet been answered.
+        """
+        return len(self._pending)
+
+    def command(self, cmd, p1=0, p2=0, ext=b''):
+        """
+        Send *cmd* with the parameters *p1* and *p2* (and the optional bytes
+        extension *ext*) to the daemon immediately, returning a future which
+        will be completed with the command's result. If the daemon reports an
+        error, the future raises :exc:`IOError`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self._receiver.done():
+            future.set_exception(ConnectionError('connection is closed'))
+        else:
+            self._writer.write(self.COMMAND.pack(cmd, p1, p2, len(ext)) + ext)
+            self._pending.append((cmd, future))
+        return future
+
+    async def close(self):
+        """
+        Close the connection; any unanswered commands raise
+        :exc:`ConnectionError`.
+        """
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def _receive(self):
+        try:
+            while True:
+                response = await self._reader.readexactly(self.RESPONSE.size)
+                cmd, p1, p2, result = self.RESPONSE.unpack(response)
+                expected, future = self._pending.popleft()
+                if future.cancelled():
+                    continue
+                if cmd != expected:
+                    future.set_exception(IOError(
+                        f'pigpiod answered command {cmd} when {expected} '
+                        f'was expected'))
+                elif cmd in UNSIGNED_COMMANDS:
+                    future.set_result(result)
+                elif result & 0x80000000:
+                    future.set_exception(IOError(
+                        f'pigpiod command {cmd} failed with error '
+                        f'{result - 0x100000000}'))
+                else:
+                    future.set_result(result)
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            while self._pending:
+                cmd, future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError('connection to pigpiod was closed'))
+
+
+class AsyncPiGPIONotifier:
+    """
+    Receives the level reports of watched pins from a pigpio notification
+    stream on a separate connection to the daemon, and queues their
+    edges for dispatch to :attr:`~gpiozero.Pin.when_changed` handlers.
+    Handlers are called from a separate thread, not the event loop, as they
+    commonly use the synchronous interface of other pins.
+    """
+    REPORT = Struct('=HHII')
+
+    def __init__(self, factory, connection, handle, level):
+        self._factory = factory
+        self._connection = connection
+        self._handle = handle
+        self._pins = {}
+        self._bits = 0
+        self._level = level
+        self._queue = Queue()
+        self._dispatcher = Thread(
+            target=self._dispatch, name='asyncpigpio-events', daemon=True)
+        self._dispatcher.start()
+        self._receiver = asyncio.get_running_loop().create_task(
+            self._receive())
+
+    @classmethod
+    async def open(cls, factory):
+        """
+        Open a notification stream to the daemon *factory* is connected to.
+        """
+        # Opening the stream converts the connection it's requested on into
+        # a stream of reports, so this is never used for normal commands
+        reader, writer = await asyncio.open_connection(
+            factory.host, factory.port)
+        writer.write(AsyncPiGPIOConnection.COMMAND.pack(CMD_NOIB, 0, 0, 0))
+        response = await reader.readexactly(AsyncPiGPIOConnection.RESPONSE.size)
+        handle = AsyncPiGPIOConnection.RESPONSE.unpack(response)[3]
+        if handle & 0x80000000:
+            writer.close()
+            raise IOError(
+                f'failed to open notification stream: error '
+                f'{handle - 0x100000000}')
+        level = await factory._connection.command(CMD_BR1)
+        return cls(factory, (reader, writer), handle, level)
+
+    async def watch(self, pin):
+        bit = 1 << pin._number
+        self._pins[bit] = pin
+        self._bits |= bit
+        level = await self._factory._connection.command(CMD_BR1)
+        self._level = (self._level & ~bit) | (level & bit)
+        await self._factory._connection.command(
+            CMD_NB, self._handle, self._bits)
+
+    async def unwatch(self, pin):
+        bit = 1 << pin._number
+        if self._pins.pop(bit, None) is not None:
+            self._bits &= ~bit
+            await self._factory._connection.command(
+                CMD_NB, self._handle, self._bits)
+
+    async def close(self):
+        try:
+            await self._factory._connection.command(CMD_NC, self._handle)
+        except (IOError, ConnectionError):
+            pass
+        reader, writer = self._connection
+        writer.close()
+        await asyncio.gather(self._receiver, return_exceptions=True)
+        self._queue.put(None)
+        # A handler being dispatched may be waiting on this loop, so the
+        # dispatcher must be joined from elsewhere
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._dispatcher.join)
+
+    async def _receive(self):
+        reader, writer = self._connection
+        size = self.REPORT.size
+        buf = b''
+        try:
+            while True:
+                data = await reader.read(size * 1024)
+                if not data:
+                    break
+                buf += data
+                whole = len(buf) - len(buf) % size
+                self._decode(buf[:whole])
+                buf = buf[whole:]
+        except OSError:
+            pass
+
+    def _decode(self, data):
+        pins = self._pins
+        bits = self._bits
+        last = self._level
+        for seq, flags, tick, level in self.REPORT.iter_unpack(data):
+            if flags:
+                # Watchdog and keep-alive reports carry no level change
+                continue
+            changed = (level ^ last) & bits
+            last = level
+            while changed:
+                bit = changed & -changed
+                changed ^= bit
+                pin = pins[bit]
+                state = bool(level & bit)
+                if pin._edges == 'both' or (pin._edges == 'rising') == state:
+                    self._queue.put((pin, tick, state))
+        self._level = (self._level & ~bits) | (last & bits)
+
+    def _dispatch(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            pin, ticks, state = item
+            if pin._when_changed is not None:
+                pin._call_when_changed(ticks, state)
+
+
+class AsyncPiGPIOFactory(PiFactory):
+    """
+    Extends :class:`~gpiozero.pins.pi.PiFactory`. Communicates with the
+    pigpio daemon (:command:`pigpiod`) like
+    :class:`~gpiozero.pins.pigpio.PiGPIOFactory`, but speaks the daemon's
+    socket protocol itself using :mod:`asyncio`, without the `pigpio`_
+    library.
+
+    The factory runs its own event loop in a background thread. The usual
+    synchronous :class:`~gpiozero.Pin` interface submits commands to that
+    loop and waits for the result, while the ``*_async`` methods of
+    :class:`AsyncPiGPIOPin` (and :meth:`read_many_async` and
+    :meth:`write_many_async`) return awaitables which may be awaited from
+    *any* event loop. Commands are pipelined; for example::
+
+        import asyncio
+        from gpiozero.pins.asyncpigpio import AsyncPiGPIOFactory
+
+        factory = AsyncPiGPIOFactory(host='192.168.0.2')
+        pins = [factory.pin(n) for n in (17, 18, 27, 22)]
+
+        async def main():
+            for pin in pins:
+                await pin.set_function_async('output')
+            # All four commands are sent before any response is awaited
+            await asyncio.gather(*(pin.set_state_async(1) for pin in pins))
+
+        asyncio.run(main())
+
+    The host and port default to the values of the ``PIGPIO_ADDR`` and
+    ``PIGPIO_PORT`` environment variables, or "localhost" and 8888.
+
+    .. warning::
+
+        The synchronous interface must not be used from within the factory's
+        own event loop (:attr:`loop`); doing so raises :exc:`RuntimeError`
+        rather than deadlocking. Hardware SPI and DMA waveforms are not
+        supported; SPI is always bit-banged.
+
+    .. _pigpio: http://abyz.me.uk/rpi/pigpio/
+    """
+    def __init__(self, host=None, port=None):
+        super().__init__()
+        if host is None:
+            host = os.environ.get('PIGPIO_ADDR', 'localhost')
+        if port is None:
+            port = int(os.environ.get('PIGPIO_PORT', 8888))
+        self.pin_class = AsyncPiGPIOPin
+        self._host = host
+        self._port = port
+        self._connection = None
+        self._notifier = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = Thread(
+            target=self._loop.run_forever, name='asyncpigpio', daemon=True)
+        self._thread.start()
+        try:
+            self._connection = self._run(
+                AsyncPiGPIOConnection.open(host, port))
+        except OSError as e:
+            self._stop_loop()
+            raise IOError(f'failed to connect to {host}:{port}: {e}')
+
+    def close(self):
+        super().close()
+        if self._loop.is_running():
+            if self._notifier is not None:
+                self._run(self._notifier.close())
+                self._notifier = None
+            if self._connection is not None:
+                self._run(self._connection.close())
+                self._connection = None
+            self._stop_loop()
+
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    @property
+    def host(self):
+        return self._host
+
+    @property
+    def port(self):
+        return self._port
+
+    @property
+    def loop(self):
+        """
+        The :mod:`asyncio` event loop (running in a background thread) on
+        which the factory's commands are executed.
+        """
+        return self._loop
+
+    @property
+    def connection(self):
+        """
+        The :class:`AsyncPiGPIOConnection` to the daemon.
+        """
+        return self._connection
+
+    def _run(self, coro):
+        # Run coro on the factory's loop, blocking until it completes
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            coro.close()
+            raise RuntimeError(
+                "cannot use the synchronous interface from the factory's "
+                "event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _await(self, coro):
+        # Run coro on the factory's loop, returning an awaitable for the
+        # caller's loop
+        return asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def _command(self, cmd, p1=0, p2=0):
+        return await self._connection.command(cmd, p1, p2)
+
+    async def _notifier_watch(self, pin):
+        if self._notifier is None:
+            self._notifier = await AsyncPiGPIONotifier.open(self)
+        await self._notifier.watch(pin)
+
+    async def _notifier_unwatch(self, pin):
+        if self._notifier is not None:
+            await self._notifier.unwatch(pin)
+
+    def _get_revision(self):
+        return self._run(self._command(CMD_HWVER))
+
+    def _get_spi_class(self, shared, hardware):
+        return {
+            False: AsyncPiGPIOSoftwareSPI,
+            True:  AsyncPiGPIOSoftwareSPIShared,
+            }[shared]
+
+    async def _read_many(self, pins):
+        # Every command (the bank read, and the duty cycle of any PWM pins) is
+        # sent before any response is awaited
+        futures = []
+        bank = None
+        for pin in pins:
+            if (
+                    not isinstance(pin, AsyncPiGPIOPin) or
+                    pin.factory is not self or pin._number > 31
+            ):
+                futures.append(None)
+            elif pin._pwm:
+                futures.append(self._connection.command(CMD_GDC, pin._number))
+            else:
+                if bank is None:
+                    bank = self._connection.command(CMD_BR1)
+                futures.append(bank)
+        result = []
+        for pin, future in zip(pins, futures):
+            if future is None:
+                # Foreign pins are read (synchronously) by the caller
+                result.append(None)
+            elif pin._pwm:
+                result.append((await future) / pin._range)
+            else:
+                result.append(bool((await future) & (1 << pin._number)))
+        return result
+
+    def read_many(self, pins):
+        """
+        Overridden to read the levels of all *pins* with a single ``BR1``
+        command, and any PWM pins' duty cycles with commands pipelined
+        alongside it.
+        """
+        pins = list(pins)
+        result = self._run(self._read_many(pins))
+        return tuple(
+            pin.state if state is None else state
+            for pin, state in zip(pins, result))
+
+    async def read_many_async(self, pins):
+        """
+        The awaitable equivalent of :meth:`read_many`.
+        """
+        pins = list(pins)
+        result = await self._await(self._read_many(pins))
+        for i, pin in enumerate(pins):
+            if result[i] is None:
+                result[i] = pin.state
+        return tuple(result)
+
+    async def _write_many(self, states):
+        set_bits = clear_bits = 0
+        futures = []
+        others = {}
+        for pin, state in states.items():
+            if (
+                    not isinstance(pin, AsyncPiGPIOPin) or
+                    pin.factory is not self or pin._number > 31
+            ):
+                others[pin] = state
+            elif pin._pwm:
+                futures.append(pin._set_state_command(state))
+            elif pin._function == 'input':
+                raise PinSetInput(f'cannot set state of pin {pin!r}')
+            elif state:
+                set_bits |= 1 << pin._number
+            else:
+                clear_bits |= 1 << pin._number
+        if set_bits:
+            futures.append(self._connection.command(CMD_BS1, set_bits))
+        if clear_bits:
+            futures.append(self._connection.command(CMD_BC1, clear_bits))
+        await asyncio.gather(*futures)
+        return others
+
+    def write_many(self, states):
+        """
+        Overridden to set all pins with one ``BS1`` and one ``BC1`` command,
+        and any PWM pins' duty cycles with commands pipelined alongside them.
+        """
+        for pin, state in self._run(self._write_many(states)).items():
+            pin.state = state
+
+    async def write_many_async(self, states):
+        """
+        The awaitable equivalent of :meth:`write_many`.
+        """
+        others = await self._await(self._write_many(states))
+        for pin, state in others.items():
+            pin.state = state
+
+    def ticks(self):
+        return self._run(self._command(CMD_TICK))
+
+    @staticmethod
+    def ticks_diff(later, earlier):
+        # NOTE: pigpio ticks are unsigned 32-bit quantities that wrap every
+        # 71.6 minutes
+        return ((later - earlier) % 0x100000000) / 1000000
+
+
+class AsyncPiGPIOPin(PiPin):
+    """
+    Extends :class:`~gpiozero.pins.pi.PiPin`. Pin implementation for
+    :class:`AsyncPiGPIOFactory`.
+
+    In addition to the synchronous :class:`~gpiozero.Pin` interface, the
+    ``*_async`` methods return awaitables performing the same operations,
+    which may be awaited from any event loop.
+    """
+    GPIO_FUNCTIONS = {
+        'input':  0,
+        'output': 1,
+        'alt0':   4,
+        'alt1':   5,
+        'alt2':   6,
+        'alt3':   7,
+        'alt4':   3,
+        'alt5':   2,
+        }
+
+    GPIO_PULL_UPS = {
+        'up':       2,
+        'down':     1,
+        'floating': 0,
+        }
+
+    GPIO_FUNCTION_NAMES = {v: k for (k, v) in GPIO_FUNCTIONS.items()}
+
+    PWM_RANGE = 10000
+
+    def __init__(self, factory, info):
+        super().__init__(factory, info)
+        self._pull = info.pull or 'floating'
+        self._function = 'input'
+        self._pwm = False
+        self._range = self.PWM_RANGE
+        self._frequency = None
+        self._bounce = None
+        self._edges = 'both'
+        try:
+            self.factory._run(self._init())
+        except IOError as e:
+            raise ValueError(e)
+
+    async def _init(self):
+        conn = self.factory._connection
+        await asyncio.gather(
+            conn.command(CMD_MODES, self._number, self.GPIO_FUNCTIONS['input']),
+            conn.command(CMD_PUD, self._number, self.GPIO_PULL_UPS[self._pull]),
+            conn.command(CMD_FG, self._number, 0),
+        )
+
+    def close(self):
+        if self.factory._connection is not None:
+            self.frequency = None
+            self.when_changed = None
+            self.function = 'input'
+            self.pull = self.info.pull or 'floating'
+
+    async def _read_function(self):
+        mode = await self.factory._connection.command(CMD_MODEG, self._number)
+        return self.GPIO_FUNCTION_NAMES[mode]
+
+    async def _write_function(self, value):
+        try:
+            mode = self.GPIO_FUNCTIONS[value]
+        except KeyError:
+            raise PinInvalidFunction(
+                f'invalid function "{value}" for pin {self!r}')
+        if value != 'input':
+            self._pull = 'floating'
+        await self.factory._connection.command(CMD_MODES, self._number, mode)
+        self._function = value
+
+    def _get_function(self):
+        return self.factory._run(self._read_function())
+
+    def _set_function(self, value):
+        self.factory._run(self._write_function(value))
+
+    def get_function_async(self):
+        """
+        Returns an awaitable for the pin's :attr:`function`.
+        """
+        return self.factory._await(self._read_function())
+
+    def set_function_async(self, value):
+        """
+        Returns an awaitable which sets the pin's :attr:`function`.
+        """
+        return self.factory._await(self._write_function(value))
+
+    async def _read_state(self):
+        conn = self.factory._connection
+        if self._pwm:
+            return (await conn.command(CMD_GDC, self._number)) / self._range
+        return bool(await conn.command(CMD_READ, self._number))
+
+    def _set_state_command(self, value):
+        # Send the command setting the pin's state (on the factory's loop),
+        # returning its future
+        conn = self.factory._connection
+        if self._pwm:
+            if not 0 <= value <= 1:
+                raise PinInvalidState(
+                    f'invalid state "{value}" for pin {self!r}')
+            return conn.command(CMD_PWM, self._number, int(value * self._range))
+        elif self._function == 'input':
+            raise PinSetInput(f'cannot set state of pin {self!r}')
+        else:
+            return conn.command(CMD_WRITE, self._number, bool(value))
+
+    async def _write_state(self, value):
+        await self._set_state_command(value)
+
+    def _get_state(self):
+        return self.factory._run(self._read_state())
+
+    def _set_state(self, value):
+        self.factory._run(self._write_state(value))
+
+    def get_state_async(self):
+        """
+        Returns an awaitable for the pin's :attr:`state`.
+        """
+        return self.factory._await(self._read_state())
+
+    def set_state_async(self, value):
+        """
+        Returns an awaitable which sets the pin's :attr:`state`.
+        """
+        return self.factory._await(self._write_state(value))
+
+    def _get_pull(self):
+        return self._pull
+
+    async def _write_pull(self, value):
+        if self._function != 'input':
+            raise PinFixedPull(f'cannot set pull on non-input pin {self!r}')
+        if self.info.pull and value != self.info.pull:
+            raise PinFixedPull(f'{self!r} has a fixed pull resistor')
+        try:
+            pull = self.GPIO_PULL_UPS[value]
+        except KeyError:
+            raise PinInvalidPull(f'invalid pull "{value}" for pin {self!r}')
+        await self.factory._connection.command(CMD_PUD, self._number, pull)
+        self._pull = value
+
+    def _set_pull(self, value):
+        self.factory._run(self._write_pull(value))
+
+    def set_pull_async(self, value):
+        """
+        Returns an awaitable which sets the pin's :attr:`pull`.
+        """
+        return self.factory._await(self._write_pull(value))
+
+    def _get_frequency(self):
+        return self._frequency
+
+    async def _write_frequency(self, value):
+        conn = self.factory._connection
+        if value is not None:
+            if not self._pwm and self._function != 'output':
+                raise PinPWMFixedValue(f'cannot start PWM on pin {self!r}')
+            if value != self._frequency:
+                # The pin must be low before PWM starts; see PiGPIOPin
+                write = None if self._pwm else conn.command(
+                    CMD_WRITE, self._number, 0)
+                frequency = conn.command(CMD_PFS, self._number, int(value))
+                rng = conn.command(CMD_PRS, self._number, self._range)
+                duty = None if self._pwm else conn.command(
+                    CMD_PWM, self._number, 0)
+                self._frequency, *rest = await asyncio.gather(
+                    frequency, rng, *(f for f in (write, duty) if f))
+                self._pwm = True
+        elif self._pwm:
+            await conn.command(CMD_WRITE, self._number, 0)
+            self._frequency = None
+            self._pwm = False
+
+    def _set_frequency(self, value):
+        self.factory._run(self._write_frequency(value))
+
+    def set_frequency_async(self, value):
+        """
+        Returns an awaitable which sets the pin's :attr:`frequency`.
+        """
+        return self.factory._await(self._write_frequency(value))
+
+    def _get_bounce(self):
+        return None if not self._bounce else self._bounce / 1000000
+
+    def _set_bounce(self, value):
+        if value is None:
+            value = 0
+        elif not 0 <= value <= 0.3:
+            raise PinInvalidBounce('bounce must be between 0 and 0.3')
+        self.factory._run(self.factory._command(
+            CMD_FG, self._number, int(value * 1000000)))
+        self._bounce = int(value * 1000000)
+
+    def _get_edges(self):
+        return self._edges
+
+    def _set_edges(self, value):
+        if value not in ('both', 'rising', 'falling'):
+            raise PinInvalidEdges(f'invalid edge specification "{value}"')
+        self._edges = value
+
+    def _enable_event_detect(self):
+        self.factory._run(self.factory._notifier_watch(self))
+
+    def _disable_event_detect(self):
+        self.factory._run(self.factory._notifier_unwatch(self))
+
+
+class AsyncPiGPIOSoftwareSPI(SPISoftware):
+    pass
+
+
+class AsyncPiGPIOSoftwareSPIShared(SharedMixin, AsyncPiGPIOSoftwareSPI):
+    @classmethod
+    def _shared_key(cls, clock_pin, mosi_pin, miso_pin, select_pin,
+                    pin_factory):
+        return (pin_factory.host, clock_pin, select_pin)
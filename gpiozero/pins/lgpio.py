@@ -8,6 +8,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import os
+from time import monotonic, sleep
 
 import lgpio
 
@@ -24,7 +25,8 @@ from ..exc import (
     PinInvalidState,
     SPIInvalidClockMode,
     PinPWMFixedValue,
-    DeviceClosed
+    DeviceClosed,
+    ZombieThread,
 )
 
 try:
@@ -69,6 +71,9 @@ class LGPIOFactory(LocalPiFactory):
             chip = 4 if (self._get_revision() & 0xff0) >> 4 == 0x17 and os.path.exists('/dev/gpiochip4') else 0
         self._handle = lgpio.gpiochip_open(chip)
         self._chip = chip
+        # Maps the GPIO number of each group leader to the list of pins in
+        # that group (in the order given to group_claim_output)
+        self._groups = {}
         self.pin_class = LGPIOPin
 
     def close(self):
@@ -81,6 +86,101 @@ class LGPIOFactory(LocalPiFactory):
     def chip(self):
         return self._chip
 
+    def read_many(self, pins):
+        """
+        Overridden to read all *pins* belonging to an output group (see
+        :meth:`write_many`) with a single ``group_read`` call per group, so
+        that they are sampled at the same instant. Other pins are read
+        individually; lgpio can only read lines together once they have been
+        claimed as a group, and input lines are not grouped as that would
+        prevent changing their pulls or watching their edges.
+        """
+        groups = {}
+        result = []
+        for pin in pins:
+            if (
+                    not isinstance(pin, LGPIOPin) or pin.factory is not self or
+                    pin._group is None
+            ):
+                result.append(pin.state)
+                continue
+            try:
+                bits = groups[pin._group]
+            except KeyError:
+                size, bits = lgpio.group_read(self._handle, pin._group)
+                groups[pin._group] = bits
+            bit = 1 << self._groups[pin._group].index(pin)
+            result.append(bool(bits & bit))
+        return tuple(result)
+
+    def write_many(self, states):
+        """
+        Overridden to claim the output pins in *states* as an lgpio group
+        (the first time they are written together) so that all of them are
+        changed by a single atomic ``group_write`` call. If the group cannot
+        be formed (for instance because some of the pins are not outputs, are
+        using PWM, or already belong to a different group), the pins are
+        written individually.
+        """
+        pins = [
+            pin for pin in states
+            if isinstance(pin, LGPIOPin) and pin.factory is self
+        ]
+        group = self._group_for(pins)
+        if group is None:
+            for pin, state in states.items():
+                pin.state = state
+            return
+        bits = mask = 0
+        for pin, state in states.items():
+            if pin in group:
+                bit = 1 << group.index(pin)
+                mask |= bit
+                if state:
+                    bits |= bit
+            else:
+                pin.state = state
+        lgpio.group_write(self._handle, group[0]._number, bits, mask)
+
+    def _group_for(self, pins):
+        # Return the group containing all of pins, claiming a new one if none
+        # of them are grouped yet, or None if that's not possible
+        if len(pins) < 2:
+            return None
+        leaders = {pin._group for pin in pins}
+        if len(leaders) == 1 and None not in leaders:
+            return self._groups[leaders.pop()]
+        elif leaders != {None}:
+            return None
+        for pin in pins:
+            if pin._pwm or pin._callback is not None or pin.function != 'output':
+                return None
+        gpios = [pin._number for pin in pins]
+        levels = [int(lgpio.gpio_read(self._handle, gpio)) for gpio in gpios]
+        for gpio in gpios:
+            lgpio.gpio_free(self._handle, gpio)
+        try:
+            lgpio.group_claim_output(self._handle, gpios, levels)
+        except lgpio.error:
+            for gpio, level in zip(gpios, levels):
+                lgpio.gpio_claim_output(self._handle, gpio, level)
+            return None
+        self._groups[gpios[0]] = pins
+        for pin in pins:
+            pin._group = gpios[0]
+        return pins
+
+    def _ungroup(self, leader):
+        # Free the group led by leader, re-claiming each of its pins as an
+        # individual output at its current level
+        pins = self._groups.pop(leader)
+        levels = [
+            int(lgpio.gpio_read(self._handle, pin._number)) for pin in pins]
+        lgpio.group_free(self._handle, leader)
+        for pin, level in zip(pins, levels):
+            pin._group = None
+            lgpio.gpio_claim_output(self._handle, pin._number, level)
+
     def _get_spi_class(self, shared, hardware):
         # support via lgpio instead of spidev
         if hardware:
@@ -125,22 +225,36 @@ class LGPIOPin(LocalPiPin):
         self._pwm = None
         self._bounce = None
         self._callback = None
+        # The GPIO number of the leader of the output group this pin belongs
+        # to (see LGPIOFactory.write_many), if any
+        self._group = None
+        # The LGPIOPulse currently blinking the pin (see output_sequence), if
+        # any
+        self._pulse = None
         self._edges = lgpio.BOTH_EDGES
         lgpio.gpio_claim_input(
             self.factory._handle, self._number, lgpio.SET_PULL_NONE)
 
     def close(self):
         if self.factory._handle is not None:
+            self._ungroup()
             # Closing is really just "resetting" the function of the pin;
             # we let the factory close deal with actually freeing stuff
             lgpio.gpio_claim_input(
                 self.factory._handle, self._number, lgpio.SET_PULL_NONE)
 
+    def _ungroup(self):
+        if self._group is not None:
+            self.factory._ungroup(self._group)
+
     def _get_function(self):
+        if self._group is not None:
+            return 'output'
         mode = lgpio.gpio_get_mode(self.factory._handle, self._number)
         return ['input', 'output'][bool(mode & self.GPIO_IS_OUT)]
 
     def _set_function(self, value):
+        self._ungroup()
         if self._callback is not None:
             self._callback.cancel()
             self._callback = None
@@ -153,6 +267,26 @@ class LGPIOPin(LocalPiPin):
             raise PinInvalidFunction(
                 f'invalid function "{value}" for pin {self!r}')
 
+    def output_sequence(self, sequence, n=None):
+        """
+        Overridden to play simple on/off blinks (a sequence of a high state
+        followed by a low state, as produced by
+        :meth:`~gpiozero.DigitalOutputDevice.blink`) with lgpio's
+        ``tx_pulse``, which is timed by lgpio's own thread rather than
+        Python. Any other sequence, or a pin using PWM, returns :data:`None`.
+        Setting :attr:`state` or :attr:`frequency` cancels the pulses.
+        """
+        if self._pwm or n == 0 or len(sequence) != 2:
+            return None
+        (on_state, on_time), (off_state, off_time) = sequence
+        if not (on_state and not off_state) or on_time <= 0 or off_time <= 0:
+            return None
+        self._ungroup()
+        if self.function != 'output':
+            return None
+        self._pulse = LGPIOPulse(self, on_time, off_time, n)
+        return self._pulse
+
     def _get_state(self):
         if self._pwm:
             return self._pwm[1] / 100
@@ -160,6 +294,8 @@ class LGPIOPin(LocalPiPin):
             return bool(lgpio.gpio_read(self.factory._handle, self._number))
 
     def _set_state(self, value):
+        if self._pulse is not None:
+            self._pulse.stop()
         if self._pwm:
             freq, duty = self._pwm
             self._pwm = (freq, int(value * 100))
@@ -168,6 +304,10 @@ class LGPIOPin(LocalPiPin):
             except lgpio.error:
                 raise PinInvalidState(
                     f'invalid state "{value}" for pin {self!r}')
+        elif self._group is not None:
+            bit = 1 << self.factory._groups[self._group].index(self)
+            lgpio.group_write(
+                self.factory._handle, self._group, bit if value else 0, bit)
         elif self.function == 'input':
             raise PinSetInput(f'cannot set state of pin {self!r}')
         else:
@@ -210,7 +350,10 @@ class LGPIOPin(LocalPiPin):
             return None
 
     def _set_frequency(self, value):
+        if self._pulse is not None:
+            self._pulse.stop()
         if not self._pwm and value is not None and value > 0:
+            self._ungroup()
             if self.function != 'output':
                 raise PinPWMFixedValue(f'cannot start PWM on pin {self!r}')
             lgpio.tx_pwm(self.factory._handle, self._number, value, 0)
@@ -251,6 +394,7 @@ class LGPIOPin(LocalPiPin):
         super()._call_when_changed(ticks / 1000000000, level)
 
     def _enable_event_detect(self):
+        self._ungroup()
         lgpio.gpio_claim_alert(
             self.factory._handle, self._number, self._edges,
             lgpio.gpio_get_mode(self.factory._handle, self._number) &
@@ -269,6 +413,64 @@ class LGPIOPin(LocalPiPin):
             self.GPIO_LINE_FLAGS_MASK)
 
 
+class LGPIOPulse:
+    """
+    Blinks an :class:`LGPIOPin` with lgpio's ``tx_pulse``. This is returned
+    by :meth:`LGPIOPin.output_sequence` and provides the ``stop()`` and
+    ``join()`` methods of :class:`~gpiozero.threads.GPIOThread` so that it
+    can stand in for a blink thread.
+    """
+    def __init__(self, pin, on_time, off_time, n):
+        self.pin = pin
+        self._n = n
+        self._period = on_time + off_time
+        lgpio.tx_pulse(
+            pin.factory._handle, pin._number,
+            int(on_time * 1000000), int(off_time * 1000000), 0,
+            0 if n is None else n)
+        self._start = monotonic()
+
+    @property
+    def busy(self):
+        """
+        Returns :data:`True` while the pulses are still being transmitted.
+        """
+        handle = self.pin.factory._handle
+        return handle is not None and bool(
+            lgpio.tx_busy(handle, self.pin._number, lgpio.TX_PWM))
+
+    def stop(self, timeout=None):
+        """
+        Cancels the pulses, leaving the pin at its current level. Does
+        nothing if the pulses have already been cancelled or superseded.
+        """
+        if self.pin._pulse is not self:
+            return
+        self.pin._pulse = None
+        if self.pin.factory._handle is not None:
+            lgpio.tx_pulse(self.pin.factory._handle, self.pin._number, 0, 0)
+
+    def join(self, timeout=None):
+        """
+        Waits for the pulses to finish (or *timeout* seconds to elapse, in
+        which case :exc:`~gpiozero.ZombieThread` is raised).
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        if self._n is not None:
+            # Sleep until the pulses should have finished, then poll for the
+            # remaining moments of timing slop
+            remaining = self._start + self._n * self._period - monotonic()
+            if deadline is not None:
+                remaining = min(remaining, deadline - monotonic())
+            if remaining > 0:
+                sleep(remaining)
+        while self.busy:
+            if deadline is not None and monotonic() > deadline:
+                raise ZombieThread(
+                    f"Pulses failed to finish within {timeout} seconds")
+            sleep(0.01)
+
+
 class LGPIOHardwareSPI(SPI):
     """
     Hardware SPI implementation for the `lgpio`_ library. Uses the ``spi_*``
@@ -361,6 +563,14 @@ class LGPIOHardwareSPI(SPI):
             raise IOError(f'SPI transfer error {count}')
         return [int(b) for b in data]
 
+    def transfer_into(self, tx, rx):
+        self._check_open()
+        count, data = lgpio.spi_xfer(self._handle, bytes(tx))
+        if count < 0:
+            raise IOError(f'SPI transfer error {count}')
+        rx[:count] = data
+        return count
+
 
 class LGPIOHardwareSPIShared(SharedMixin, LGPIOHardwareSPI):
     @classmethod
@@ -12,7 +12,9 @@
 
 import io
 import errno
+import fcntl
 import struct
+import ctypes
 from collections import defaultdict
 from threading import Lock
 from time import monotonic
@@ -29,6 +31,20 @@ from ..mixins import SharedMixin
 from ..exc import DeviceClosed, PinUnknownPi
 
 
+# struct spi_ioc_transfer from <linux/spi/spidev.h>: tx_buf, rx_buf, len,
+# speed_hz, delay_usecs, bits_per_word, cs_change, tx_nbits, rx_nbits,
+# word_delay_usecs, pad
+SPI_IOC_TRANSFER = struct.Struct('=QQIIHBBBBBB')
+# The size field of an ioctl request is 14 bits wide
+SPI_IOC_MAX_TRANSFERS = ((1 << 14) - 1) // SPI_IOC_TRANSFER.size
+
+
+def spi_ioc_message(n):
+    # Equivalent to the SPI_IOC_MESSAGE(n) macro, i.e.
+    # _IOW('k', 0, char[n * sizeof(struct spi_ioc_transfer)])
+    return 1 << 30 | (n * SPI_IOC_TRANSFER.size) << 16 | ord('k') << 8
+
+
 def get_pi_revision():
     revision = None
     try:
@@ -165,6 +181,80 @@ class LocalPiHardwareSPI(SPI):
         """
         return self._bus.xfer2(data)
 
+    def transfer_many(self, messages):
+        """
+        Performs the transfer of each of *messages* (a sequence of lists of
+        integer words) in a single ``SPI_IOC_MESSAGE`` ioctl, with the select
+        pin deasserted between each message, and returns a list of the lists
+        of words read.
+        """
+        messages = list(messages)
+        if len(messages) < 2 or self._bus.bits_per_word != 8:
+            # Words wider than 8 bits occupy several bytes each in the
+            # driver's buffers; leave such transfers to xfer2
+            return super().transfer_many(messages)
+        messages = [bytes(data) for data in messages]
+        result = []
+        for start in range(0, len(messages), SPI_IOC_MAX_TRANSFERS):
+            result.extend(self._transfer_batch(
+                messages[start:start + SPI_IOC_MAX_TRANSFERS]))
+        return result
+
+    def transfer_into(self, tx, rx):
+        """
+        Writes the bytes of *tx* to the SPI interface, reading the same number
+        of bytes directly into the writable buffer *rx*, with a single
+        ``SPI_IOC_MESSAGE`` ioctl.
+        """
+        if self._bus.bits_per_word != 8:
+            return super().transfer_into(tx, rx)
+        count = memoryview(tx).nbytes
+        if count:
+            tx_buf = (ctypes.c_char * count).from_buffer_copy(tx)
+            rx_buf = (ctypes.c_char * count).from_buffer(rx)
+            try:
+                self._ioctl(
+                    ctypes.addressof(tx_buf), ctypes.addressof(rx_buf),
+                    [count])
+            finally:
+                del rx_buf
+        return count
+
+    def _ioctl(self, tx_addr, rx_addr, lengths):
+        # Perform a transfer of each of *lengths* bytes from consecutive
+        # regions of the buffers at *tx_addr* and *rx_addr*
+        transfers = bytearray()
+        offset = 0
+        last = len(lengths) - 1
+        for index, length in enumerate(lengths):
+            # speed_hz and bits_per_word of 0 select the device's configured
+            # values; cs_change deasserts select after each transfer but the
+            # last
+            transfers += SPI_IOC_TRANSFER.pack(
+                tx_addr + offset, rx_addr + offset, length,
+                0, 0, 0, index < last, 0, 0, 0, 0)
+            offset += length
+        fcntl.ioctl(
+            self._bus.fileno(), spi_ioc_message(len(lengths)), transfers)
+
+    def _transfer_batch(self, messages):
+        tx = bytearray(b''.join(messages))
+        rx = bytearray(len(tx))
+        tx_buf = (ctypes.c_char * len(tx)).from_buffer(tx)
+        rx_buf = (ctypes.c_char * len(rx)).from_buffer(rx)
+        try:
+            self._ioctl(
+                ctypes.addressof(tx_buf), ctypes.addressof(rx_buf),
+                [len(data) for data in messages])
+        finally:
+            del tx_buf, rx_buf
+        result = []
+        offset = 0
+        for data in messages:
+            result.append(list(rx[offset:offset + len(data)]))
+            offset += len(data)
+        return result
+
     def _get_clock_mode(self):
         return self._bus.mode
 
@@ -9,25 +9,30 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import io
 import os
 import sys
 import mmap
-import errno
+import fcntl
 import struct
 import select
 from time import sleep
 from threading import Thread, Event, RLock
-from queue import Queue, Empty
+from queue import Queue
 from pathlib import Path
+from collections import defaultdict
 
 from .local import LocalPiPin, LocalPiFactory
 from ..exc import (
     PinInvalidPull,
     PinInvalidEdges,
+    PinInvalidBounce,
     PinInvalidFunction,
     PinFixedPull,
     PinSetInput,
+    PinInvalidState,
+    PinPWMError,
+    PinPWMUnsupported,
+    PinPWMFixedValue,
 )
 
 
@@ -177,8 +182,14 @@ class GPIOMemory:
             }[4]
         except KeyError:
             raise RuntimeError('unable to find native unsigned 32-bit type')
+        # An array view of the registers; indexing this is a single native
+        # word access with none of the overhead of struct, so the hot paths
+        # (NativePin's state, and write_many / read_many) use it directly
+        self.regs = memoryview(self.mem).cast(self.reg_fmt[1:])
 
     def close(self):
+        # The view must be released before the mmap it exports can be closed
+        self.regs.release()
         self.mem.close()
         os.close(self.fd)
 
@@ -193,115 +204,292 @@ class GPIOMemory:
         raise IOError('unable to determine gpio base')
 
     def __getitem__(self, index):
-        return struct.unpack_from(self.reg_fmt, self.mem, index * 4)[0]
+        return self.regs[index]
 
     def __setitem__(self, index, value):
-        struct.pack_into(self.reg_fmt, self.mem, index * 4, value)
-
-
-class GPIOFS:
-    GPIO_PATH = '/sys/class/gpio'
+        self.regs[index] = value
+
+
+class GPIOChip:
+    GPIO_CHIP_PATH = Path('/dev')
+    GPIO_CHIP_LABELS = {'pinctrl-bcm2835', 'pinctrl-bcm2711'}
+    GPIO_CONSUMER = b'gpiozero'
+
+    # From linux/gpio.h (the v2 GPIO character device uAPI, Linux 5.10+)
+    GPIO_GET_CHIPINFO_IOCTL       = 0x8044b401
+    GPIO_V2_GET_LINE_IOCTL        = 0xc250b407
+    GPIO_V2_LINE_SET_CONFIG_IOCTL = 0xc110b40d
+
+    GPIO_V2_LINES_MAX            = 64
+    GPIO_V2_LINE_NUM_ATTRS_MAX   = 10
+    GPIO_V2_LINE_FLAG_INPUT        = 1 << 2
+    GPIO_V2_LINE_FLAG_EDGE_RISING  = 1 << 4
+    GPIO_V2_LINE_FLAG_EDGE_FALLING = 1 << 5
+    GPIO_V2_LINE_EVENT_RISING_EDGE  = 1
+    GPIO_V2_LINE_EVENT_FALLING_EDGE = 2
+    GPIO_V2_LINE_ATTR_ID_DEBOUNCE   = 3
+
+    # struct gpiochip_info
+    chip_info = struct.Struct('=32s32sL')
+    # struct gpio_v2_line_attribute (padded to its gpio_v2_line_config_attribute
+    # slot by the trailing mask)
+    line_attr = struct.Struct('=LLQQ')
+    # struct gpio_v2_line_request, with the embedded gpio_v2_line_config
+    # flattened into it; the attribute array is packed separately with
+    # line_attr above
+    line_request = struct.Struct(
+        f'=64L32sQL20x{GPIO_V2_LINE_NUM_ATTRS_MAX * line_attr.size}sLL20xl')
+    # struct gpio_v2_line_config
+    line_config = struct.Struct(
+        f'=QL20x{GPIO_V2_LINE_NUM_ATTRS_MAX * line_attr.size}s')
+    # struct gpio_v2_line_event
+    line_event = struct.Struct('=QLLLL24x')
 
     def __init__(self, factory, queue):
         self._lock = RLock()
-        self._exports = {}
+        self._fd = None
+        self._lines = {}
         self._thread = NativeWatchThread(factory, queue)
 
     def close(self):
-        # We *could* track the stuff we've exported and unexport it here, but
-        # exports are a system global resource. We can't guarantee that some
-        # other process isn't relying on something we've exported. In other
-        # words, once exported it's *never* safe to unexport something. The
-        # unexport method below is largely provided for debugging and testing.
         if self._thread is not None:
             self._thread.close()
             self._thread = None
+        with self._lock:
+            while self._lines:
+                pin, fd = self._lines.popitem()
+                os.close(fd)
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    @property
+    def idle_wakeups(self):
+        try:
+            return self._thread.idle_wakeups
+        except AttributeError:
+            return 0
+
+    def _open(self):
+        # The chip is opened lazily on the first line request so that the
+        # factory can still be constructed (and used for output) on systems
+        # where the gpiochip devices are inaccessible
+        if self._fd is None:
+            for path in sorted(self.GPIO_CHIP_PATH.glob('gpiochip*')):
+                try:
+                    fd = os.open(path, os.O_RDWR | os.O_CLOEXEC)
+                except OSError:
+                    continue
+                try:
+                    buf = bytearray(self.chip_info.size)
+                    fcntl.ioctl(fd, self.GPIO_GET_CHIPINFO_IOCTL, buf, True)
+                    name, label, lines = self.chip_info.unpack(buf)
+                except OSError:
+                    label = b''
+                if label.rstrip(b'\0').decode('ascii', 'replace') in (
+                        self.GPIO_CHIP_LABELS):
+                    self._fd = fd
+                    break
+                os.close(fd)
+            else:
+                raise IOError(
+                    'unable to open the GPIO chip under /dev/gpiochip*; '
+                    'upgrade your kernel or check permissions')
+        return self._fd
+
+    @classmethod
+    def _attrs(cls, debounce):
+        # Returns the number of attributes and the packed attribute array for
+        # a line config, given a debounce period in seconds (or None)
+        if not debounce:
+            return 0, b''
+        return 1, cls.line_attr.pack(
+            cls.GPIO_V2_LINE_ATTR_ID_DEBOUNCE, 0,
+            int(debounce * 1000000), 1)
+
+    def request(self, pin, flags, debounce=None):
+        with self._lock:
+            self.release(pin)
+            buf = bytearray(self.line_request.pack(
+                pin, *(0,) * (self.GPIO_V2_LINES_MAX - 1),
+                self.GPIO_CONSUMER, flags, *self._attrs(debounce), 1, 0, 0))
+            fcntl.ioctl(self._open(), self.GPIO_V2_GET_LINE_IOCTL, buf, True)
+            result = self.line_request.unpack(buf)[-1]
+            self._lines[pin] = result
+            return result
 
-    def path(self, name):
-        return os.path.join(self.GPIO_PATH, name)
-
-    def path_value(self, pin):
-        return self.path(f'gpio{pin:d}/value')
-
-    def path_dir(self, pin):
-        return self.path(f'gpio{pin:d}/direction')
-
-    def path_edge(self, pin):
-        return self.path(f'gpio{pin:d}/edge')
+    def release(self, pin):
+        with self._lock:
+            try:
+                os.close(self._lines.pop(pin))
+            except KeyError:
+                # release should be idempotent
+                pass
 
-    def exported(self, pin):
-        return pin in self._exports
+    def watch(self, pin):
+        # The pin's bounce period is programmed into the kernel's debounce
+        # filter (which suppresses bounce edges before they are even reported
+        # to us). If the kernel rejects that, the watch thread filters the
+        # edges itself instead
+        flags = self.GPIO_V2_LINE_FLAG_INPUT | pin.GPIO_EDGES[pin._edges]
+        with self._lock:
+            try:
+                fd = self.request(pin._number, flags, pin._bounce)
+            except OSError:
+                if not pin._bounce:
+                    raise
+                fd = self.request(pin._number, flags)
+                self._thread.watch(fd, pin.info, pin._bounce)
+            else:
+                self._thread.watch(fd, pin.info)
 
-    def export(self, pin):
+    def debounce(self, pin):
+        # Re-program the debounce period of a watched line in place, without
+        # releasing it (which could lose edges)
+        flags = self.GPIO_V2_LINE_FLAG_INPUT | pin.GPIO_EDGES[pin._edges]
         with self._lock:
             try:
-                result = self._exports[pin]
+                fd = self._lines[pin._number]
             except KeyError:
-                result = None
-                # Dirty hack to wait for udev to set permissions on
-                # gpioN/value; there's no other way around this as there's no
-                # synchronous mechanism for setting permissions on sysfs
-                for i in range(10):
-                    try:
-                        # Must be O_NONBLOCK for use with epoll in edge
-                        # triggered mode
-                        result = os.open(self.path_value(pin),
-                                         os.O_RDONLY | os.O_NONBLOCK)
-                    except IOError as e:
-                        if e.errno == errno.ENOENT:
-                            with io.open(self.path('export'), 'wb') as f:
-                                f.write(str(pin).encode('ascii'))
-                        elif e.errno == errno.EACCES:
-                            sleep(i / 100)
-                        else:
-                            raise
-                    else:
-                        self._exports[pin] = result
-                        break
-                # Same for gpioN/edge. It must exist by this point but the
-                # chmod -R may not have reached it yet...
-                for i in range(10):
-                    try:
-                        with io.open(self.path_edge(pin), 'w+b'):
-                            pass
-                    except IOError as e:
-                        if e.errno == errno.EACCES:
-                            sleep(i / 100)
-                        else:
-                            raise
-                if result is None:
-                    raise RuntimeError(f'failed to export pin {pin:d}')
-            return result
+                return
+            try:
+                fcntl.ioctl(fd, self.GPIO_V2_LINE_SET_CONFIG_IOCTL, bytearray(
+                    self.line_config.pack(flags, *self._attrs(pin._bounce))))
+            except OSError:
+                if not pin._bounce:
+                    raise
+                fcntl.ioctl(fd, self.GPIO_V2_LINE_SET_CONFIG_IOCTL, bytearray(
+                    self.line_config.pack(flags, *self._attrs(None))))
+                self._thread.watch(fd, pin.info, pin._bounce)
+            else:
+                self._thread.watch(fd, pin.info)
 
-    def unexport(self, pin):
+    def unwatch(self, pin):
         with self._lock:
             try:
-                os.close(self._exports.pop(pin))
+                self._thread.unwatch(self._lines[pin._number])
             except KeyError:
-                # unexport should be idempotent
                 pass
             else:
-                try:
-                    with io.open(self.path('unexport'), 'wb') as f:
-                        f.write(str(pin).encode('ascii'))
-                except IOError as e:
-                    if e.errno == errno.EINVAL:
-                        # Someone already unexported it; ignore the error
-                        pass
+                self.release(pin._number)
 
-    def watch(self, pin):
-        with self._lock:
-            self._thread.watch(self.export(pin), pin)
 
-    def unwatch(self, pin):
+class GPIOPWM:
+    """
+    Manages the channels of the Pi's hardware PWM controllers through the
+    kernel's :file:`/sys/class/pwm` interface. The controllers must be enabled
+    in the device-tree (e.g. with ``dtoverlay=pwm-2chan`` in
+    :file:`config.txt`).
+    """
+    PWM_CHIP_PATH = Path('/sys/class/pwm')
+    # Suffixes of the device-tree node names of each PWM controller; the
+    # prefix varies with the SoC's peripheral base address
+    PWM_CHIP_DEVICES = {0: '20c000.pwm', 1: '20c800.pwm'}
+
+    def __init__(self):
+        self._lock = RLock()
+        self._channels = {}
+
+    def close(self):
+        with self._lock:
+            while self._channels:
+                (chip, channel), (pin, path) = self._channels.popitem()
+                self._unexport(chip, channel, path)
+
+    def _chip(self, controller):
+        for chip in sorted(self.PWM_CHIP_PATH.glob('pwmchip*')):
+            if (chip / 'device').resolve().name.endswith(
+                    self.PWM_CHIP_DEVICES[controller]):
+                return chip
+        raise PinPWMError(
+            f'PWM controller {controller} is not enabled; add '
+            f'dtoverlay=pwm-2chan to config.txt')
+
+    @staticmethod
+    def _write(path, value):
+        with path.open('w') as f:
+            f.write(str(value))
+
+    def export(self, pin, controller, channel):
+        """
+        Export *channel* of PWM *controller* for use by *pin*, returning the
+        path of the channel's sysfs directory. Raises :exc:`PinPWMError` if the
+        controller is not enabled, or the channel is already in use by
+        another pin.
+        """
         with self._lock:
+            chip = self._chip(controller)
             try:
-                self._thread.unwatch(self._exports[pin])
+                owner, path = self._channels[chip, channel]
             except KeyError:
                 pass
+            else:
+                raise PinPWMError(
+                    f'PWM channel {channel} of controller {controller} is '
+                    f'already in use by {owner!r}')
+            path = chip / f'pwm{channel}'
+            if not path.exists():
+                try:
+                    self._write(chip / 'export', channel)
+                except OSError as e:
+                    raise PinPWMError(
+                        f'unable to export PWM channel {channel} of '
+                        f'controller {controller}: {e}')
+                # udev may take a moment to grant access to the new channel
+                for i in range(100):
+                    if os.access(path / 'enable', os.W_OK):
+                        break
+                    sleep(0.01)
+            self._channels[chip, channel] = (pin, path)
+            return path
+
+    def unexport(self, path):
+        with self._lock:
+            for key, (pin, channel_path) in list(self._channels.items()):
+                if channel_path == path:
+                    del self._channels[key]
+                    self._unexport(*key, path)
+
+    def _unexport(self, chip, channel, path):
+        try:
+            self._write(path / 'enable', 0)
+            self._write(chip / 'unexport', channel)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _period(frequency):
+        # The period (in ns) written for *frequency*; duty cycles are always
+        # derived from this so that the same duty gives the same value
+        # whether it is written by configure or set_duty
+        return round(1000000000 / frequency)
+
+    def configure(self, path, frequency, duty):
+        """
+        Set the channel at *path* to the given *frequency* (in Hz) and *duty*
+        cycle (0.0 to 1.0), enabling it if necessary.
+        """
+        period = self._period(frequency)
+        # The kernel rejects a duty cycle longer than the period, so clear it
+        # before changing the period
+        self._write(path / 'duty_cycle', 0)
+        self._write(path / 'period', period)
+        self._write(path / 'duty_cycle', round(period * duty))
+        self._write(path / 'enable', 1)
+
+    def set_duty(self, path, frequency, duty):
+        """
+        Set the *duty* cycle (0.0 to 1.0) of the channel at *path*, which is
+        running at *frequency*.
+        """
+        self._write(
+            path / 'duty_cycle', round(self._period(frequency) * duty))
 
 
 class NativeWatchThread(Thread):
+    # The maximum number of line events read from a line in one system call
+    EVENT_BATCH = 16
+
     def __init__(self, factory, queue):
         super().__init__(
             target=self._run, args=(factory, queue))
@@ -310,33 +498,84 @@ class NativeWatchThread(Thread):
         # XXX Make this compatible with BSDs with poll() option?
         self._epoll = select.epoll()
         self._watches = {}
+        self._last = {}
+        # The thread blocks in epoll indefinitely; close() writes to this
+        # descriptor to wake it for shutdown
+        try:
+            self._wake_r = self._wake_w = os.eventfd(
+                0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
+        except AttributeError:
+            # Python < 3.10 lacks eventfd; fall back to a pipe
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+        self._epoll.register(self._wake_r, select.EPOLLIN)
+        self.idle_wakeups = 0
         self.start()
 
     def close(self):
         self._stop_evt.set()
+        os.write(self._wake_w, (1).to_bytes(8, sys.byteorder))
         self.join()
         self._epoll.close()
-
-    def watch(self, fd, pin):
-        self._watches[fd] = pin
-        flags = select.EPOLLIN | select.EPOLLPRI | select.EPOLLET
-        self._epoll.register(fd, flags)
+        os.close(self._wake_r)
+        if self._wake_w != self._wake_r:
+            os.close(self._wake_w)
+
+    def watch(self, fd, key, bounce=None):
+        # If bounce is specified (in seconds), edges within that period of the
+        # last reported edge are discarded before reaching the queue. Calling
+        # this again for a watched fd simply updates the key and bounce
+        registered = fd in self._watches
+        self._watches[fd] = (
+            key, None if not bounce else int(bounce * 1000000000))
+        self._last.pop(fd, None)
+        if not registered:
+            self._epoll.register(fd, select.EPOLLIN)
 
     def unwatch(self, fd):
         self._epoll.unregister(fd)
-        fd = self._watches.pop(fd, None)
+        self._watches.pop(fd, None)
+        self._last.pop(fd, None)
 
     def _run(self, factory, queue):
-        ticks = factory.ticks
-        while not self._stop_evt.wait(0):
-            for fd, event in self._epoll.poll(0.01):
-                when = ticks()
-                state = os.read(fd, 1) == b'1'
-                os.lseek(fd, 0, 0)
+        # Each read returns as many whole gpio_v2_line_event records as are
+        # pending (up to the buffer size). Every record carries the kernel's
+        # CLOCK_MONOTONIC timestamp of the edge (the same clock that
+        # LocalPiFactory.ticks reads) and the edge direction, so no further
+        # system calls are required to obtain the state
+        read_size = GPIOChip.line_event.size * self.EVENT_BATCH
+        decode = GPIOChip.line_event.iter_unpack
+        rising = GPIOChip.GPIO_V2_LINE_EVENT_RISING_EDGE
+        while True:
+            ready = self._epoll.poll()
+            if self._stop_evt.is_set():
+                break
+            idle = True
+            for fd, event in ready:
                 try:
-                    queue.put((self._watches[fd], when, state))
-                except KeyError:
-                    pass
+                    key, bounce = self._watches[fd]
+                    buf = os.read(fd, read_size)
+                except (KeyError, OSError):
+                    # The line was unwatched (and possibly closed) since the
+                    # poll returned, or this is the wakeup descriptor
+                    continue
+                idle = False
+                if bounce is None:
+                    for timestamp, edge, *rest in decode(buf):
+                        queue.put(
+                            (key, timestamp / 1000000000, edge == rising))
+                else:
+                    # Fallback for kernels that cannot debounce the line;
+                    # drop bounce edges here so they never reach the queue
+                    last = self._last.get(fd)
+                    for timestamp, edge, *rest in decode(buf):
+                        if last is None or timestamp - last > bounce:
+                            last = timestamp
+                            queue.put(
+                                (key, timestamp / 1000000000, edge == rising))
+                    self._last[fd] = last
+            if idle:
+                self.idle_wakeups += 1
 
 
 class NativeDispatchThread(Thread):
@@ -344,31 +583,30 @@ class NativeDispatchThread(Thread):
         super().__init__(
             target=self._run, args=(factory, queue))
         self.daemon = True
-        self._stop_evt = Event()
+        self._queue = queue
         self.start()
 
     def close(self):
-        self._stop_evt.set()
+        # None is the shutdown sentinel; the thread otherwise blocks on the
+        # queue indefinitely
+        self._queue.put(None)
         self.join()
 
     def _run(self, factory, queue):
         pins = factory.pins
-        while not self._stop_evt.wait(0):
-            try:
-                num, ticks, state = queue.get(timeout=0.1)
-            except Empty:
-                continue
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            num, ticks, state = item
             try:
                 pin = pins[num]
             except KeyError:
                 pass
             else:
-                if (
-                        pin._bounce is None or pin._last_call is None or
-                        factory.ticks_diff(ticks, pin._last_call) > pin._bounce
-                ):
-                    pin._call_when_changed(ticks, state)
-                    pin._last_call = ticks
+                # Bounce edges have already been filtered by the kernel or
+                # the watch thread
+                pin._call_when_changed(ticks, state)
 
 
 class NativeFactory(LocalPiFactory):
@@ -379,8 +617,20 @@ class NativeFactory(LocalPiFactory):
 
     .. warning::
 
-        This implementation does *not* currently support PWM. Attempting to
-        use any class which requests PWM will raise an exception.
+        This implementation supports only *hardware* PWM, through the kernel's
+        :file:`/sys/class/pwm` interface. This requires the PWM controller to
+        be enabled in the device-tree (e.g. with ``dtoverlay=pwm-2chan`` in
+        :file:`config.txt`) and is only available on the pins wired to it
+        (GPIO12, 13, 18, and 19 on the header, with GPIO12 and 18 sharing a
+        channel, as do GPIO13 and 19). Attempting to use PWM on any other pin
+        will raise an exception.
+
+    Pin states and functions are manipulated directly through the GPIO
+    registers, while edge detection uses the kernel's GPIO character device
+    (:file:`/dev/gpiochip*`, requiring Linux 5.10 or later). Edges are reported
+    with the kernel's own timestamps, so the ticks passed to
+    :attr:`~gpiozero.Pin.when_changed` reflect when the edge occurred rather
+    than when it was noticed.
 
     You can construct native pin instances manually like so::
 
@@ -394,21 +644,92 @@ class NativeFactory(LocalPiFactory):
         super().__init__()
         queue = Queue()
         self.mem = GPIOMemory(self.board_info.soc)
-        self.fs = GPIOFS(self, queue)
+        self.chip = GPIOChip(self, queue)
         self.dispatch = NativeDispatchThread(self, queue)
+        self.pwm = GPIOPWM()
         if self.board_info.soc == 'BCM2711':
             self.pin_class = Native2711Pin
         else:
             self.pin_class = Native2835Pin
 
+    @property
+    def idle_wakeups(self):
+        """
+        The number of times the edge detection thread has woken without any
+        edge events to read. This should remain at (or very near) zero; the
+        thread blocks until the kernel reports an edge, so a climbing count
+        indicates spurious wakeups.
+        """
+        return self.chip.idle_wakeups
+
+    def read_many(self, pins):
+        """
+        Overridden to read the GPLEV register once for each bank of pins
+        involved, so that all native *pins* are sampled at the same instant.
+        """
+        regs = self.mem.regs
+        levels = {}
+        result = []
+        for pin in pins:
+            if (
+                    not isinstance(pin, NativePin) or pin.factory is not self or
+                    pin._pwm
+            ):
+                result.append(pin.state)
+                continue
+            try:
+                level = levels[pin._level_offset]
+            except KeyError:
+                level = levels[pin._level_offset] = regs[pin._level_offset]
+            result.append(bool(level & pin._level_mask))
+        return tuple(result)
+
+    def write_many(self, states):
+        """
+        Overridden to gather the *states* of all native pins into one write of
+        the GPSET register, and one of the GPCLR register, for each bank of
+        pins. Pins within a bank that are being set therefore change at the
+        same instant, as do those being cleared, but the two are separate
+        register writes so pins moving in opposite directions do not change
+        together.
+        """
+        regs = self.mem.regs
+        functions = {}
+        set_words = defaultdict(int)
+        clear_words = defaultdict(int)
+        for pin, state in states.items():
+            if (
+                    not isinstance(pin, NativePin) or pin.factory is not self or
+                    pin._pwm
+            ):
+                pin.state = state
+                continue
+            try:
+                function = functions[pin._func_offset]
+            except KeyError:
+                function = functions[pin._func_offset] = regs[pin._func_offset]
+            if not function & pin._func_mask:
+                raise PinSetInput(f'cannot set state of pin {pin!r}')
+            if state:
+                set_words[pin._set_offset] |= pin._set_mask
+            else:
+                clear_words[pin._clear_offset] |= pin._clear_mask
+        for offset, word in set_words.items():
+            regs[offset] = word
+        for offset, word in clear_words.items():
+            regs[offset] = word
+
     def close(self):
         if self.dispatch is not None:
             self.dispatch.close()
             self.dispatch = None
         super().close()
-        if self.fs is not None:
-            self.fs.close()
-            self.fs = None
+        if self.pwm is not None:
+            self.pwm.close()
+            self.pwm = None
+        if self.chip is not None:
+            self.chip.close()
+            self.chip = None
         if self.mem is not None:
             self.mem.close()
             self.mem = None
@@ -432,27 +753,57 @@ class NativePin(LocalPiPin):
 
     GPIO_FUNCTION_NAMES = {v: k for (k, v) in GPIO_FUNCTIONS.items()}
 
+    GPIO_EDGES = {
+        'none':    0,
+        'rising':  GPIOChip.GPIO_V2_LINE_FLAG_EDGE_RISING,
+        'falling': GPIOChip.GPIO_V2_LINE_FLAG_EDGE_FALLING,
+        'both':    GPIOChip.GPIO_V2_LINE_FLAG_EDGE_RISING |
+                   GPIOChip.GPIO_V2_LINE_FLAG_EDGE_FALLING,
+        }
+
+    # Maps GPIO numbers to the (controller, channel, function) of the hardware
+    # PWM output they can be switched to
+    GPIO_PWM = {
+        12: (0, 0, 'alt0'),
+        13: (0, 1, 'alt0'),
+        18: (0, 0, 'alt5'),
+        19: (0, 1, 'alt5'),
+        40: (0, 0, 'alt0'),
+        41: (0, 1, 'alt0'),
+        45: (0, 1, 'alt0'),
+        }
+
     def __init__(self, factory, info):
         super().__init__(factory, info)
         self._reg_init(factory, self._number)
-        self._last_call = None
+        self._pwm = None
+        self._frequency = None
+        self._duty = 0.0
         self._when_changed = None
-        self._change_thread = None
-        self._change_event = Event()
+        self._edges = 'none'
         self.function = 'input'
         self.pull = info.pull or 'floating'
         self.bounce = None
         self.edges = 'none'
 
     def _reg_init(self, factory, number):
+        # The register indexes and bit masks for this pin are computed once
+        # here so that state reads and writes are a single indexed access of
+        # the register view
+        self._regs = self.factory.mem.regs
         self._func_offset = self.factory.mem.GPFSEL_OFFSET + (number // 10)
         self._func_shift = (number % 10) * 3
+        # All functions other than input (0b000) have a bit set in this mask
+        self._func_mask = 7 << self._func_shift
         self._set_offset = self.factory.mem.GPSET_OFFSET + (number // 32)
         self._set_shift = number % 32
+        self._set_mask = 1 << self._set_shift
         self._clear_offset = self.factory.mem.GPCLR_OFFSET + (number // 32)
         self._clear_shift = number % 32
+        self._clear_mask = 1 << self._clear_shift
         self._level_offset = self.factory.mem.GPLEV_OFFSET + (number // 32)
         self._level_shift = number % 32
+        self._level_mask = 1 << self._level_shift
         self._edge_offset = self.factory.mem.GPEDS_OFFSET + (number // 32)
         self._edge_shift = number % 32
         self._rising_offset = self.factory.mem.GPREN_OFFSET + (number // 32)
@@ -483,15 +834,23 @@ class NativePin(LocalPiPin):
         )
 
     def _get_state(self):
-        return bool(self.factory.mem[self._level_offset] & (1 << self._level_shift))
+        if self._pwm:
+            return self._duty
+        return bool(self._regs[self._level_offset] & self._level_mask)
 
     def _set_state(self, value):
-        if self.function == 'input':
+        if self._pwm:
+            if not 0 <= value <= 1:
+                raise PinInvalidState(
+                    f'invalid state "{value}" for pin {self!r}')
+            self.factory.pwm.set_duty(self._pwm, self._frequency, value)
+            self._duty = float(value)
+        elif not self._regs[self._func_offset] & self._func_mask:
             raise PinSetInput(f'cannot set state of pin {self!r}')
-        if value:
-            self.factory.mem[self._set_offset] = 1 << self._set_shift
+        elif value:
+            self._regs[self._set_offset] = self._set_mask
         else:
-            self.factory.mem[self._clear_offset] = 1 << self._clear_shift
+            self._regs[self._clear_offset] = self._clear_mask
 
     def _get_pull(self):
         raise NotImplementedError
@@ -499,43 +858,68 @@ class NativePin(LocalPiPin):
     def _set_pull(self, value):
         raise NotImplementedError
 
+    def _get_frequency(self):
+        return self._frequency
+
+    def _set_frequency(self, value):
+        if value is not None and value > 0:
+            if not self._pwm:
+                if self.function != 'output':
+                    raise PinPWMFixedValue(
+                        f'cannot start PWM on pin {self!r}')
+                try:
+                    if 'pwm' not in self.info.interfaces:
+                        raise KeyError(self._number)
+                    controller, channel, function = self.GPIO_PWM[
+                        self._number]
+                except KeyError:
+                    raise PinPWMUnsupported(
+                        f'hardware PWM is not available on pin {self!r}')
+                self._pwm = self.factory.pwm.export(self, controller, channel)
+                self._duty = 0.0
+                self.factory.pwm.configure(self._pwm, value, self._duty)
+                self.function = function
+            else:
+                self.factory.pwm.configure(self._pwm, value, self._duty)
+            self._frequency = float(value)
+        elif self._pwm:
+            self.function = 'output'
+            self.factory.pwm.unexport(self._pwm)
+            self._pwm = None
+            self._frequency = None
+            self._duty = 0.0
+
     def _get_bounce(self):
         return self._bounce
 
     def _set_bounce(self, value):
+        if value is not None and value < 0:
+            raise PinInvalidBounce('bounce must be 0 or greater')
         self._bounce = None if value is None else float(value)
+        if self._when_changed is not None:
+            self.factory.chip.debounce(self)
 
     def _get_edges(self):
-        try:
-            with io.open(self.factory.fs.path_edge(self._number), 'r') as f:
-                return f.read().strip()
-        except IOError as e:
-            if e.errno == errno.ENOENT:
-                return 'none'
-            else:
-                raise
+        return self._edges
 
     def _set_edges(self, value):
-        if value != 'none':
-            self.factory.fs.export(self._number)
+        if value not in self.GPIO_EDGES:
+            raise PinInvalidEdges(
+                f'invalid edge specification "{value}" for pin {self!r}')
+        # The edges are part of the line request; if we're currently
+        # watching, cycle when_changed to re-request the line
+        f = self.when_changed
+        self.when_changed = None
         try:
-            with io.open(self.factory.fs.path_edge(self._number), 'w') as f:
-                f.write(value)
-        except IOError as e:
-            if e.errno == errno.ENOENT and value == 'none':
-                pass
-            elif e.errno == errno.EINVAL:
-                raise PinInvalidEdges(
-                    f'invalid edge specification "{value}" for pin {self!r}')
-            else:
-                raise
+            self._edges = value
+        finally:
+            self.when_changed = f
 
     def _enable_event_detect(self):
-        self.factory.fs.watch(self._number)
-        self._last_call = None
+        self.factory.chip.watch(self)
 
     def _disable_event_detect(self):
-        self.factory.fs.unwatch(self._number)
+        self.factory.chip.unwatch(self)
 
 
 class Native2835Pin(NativePin):
@@ -593,6 +977,12 @@ class Native2711Pin(NativePin):
 
     GPIO_PULL_UP_NAMES = {v: k for (k, v) in GPIO_PULL_UPS.items()}
 
+    GPIO_PWM = {
+        **NativePin.GPIO_PWM,
+        40: (1, 0, 'alt0'),
+        41: (1, 1, 'alt0'),
+        }
+
     def _reg_init(self, factory, number):
         super()._reg_init(factory, number)
         self._pull_offset = self.factory.mem.GPPUPPDN_OFFSET + (number // 16)
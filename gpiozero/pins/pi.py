@@ -11,6 +11,7 @@
 
 from threading import RLock
 from types import MethodType
+from functools import lru_cache
 from weakref import ref, WeakMethod
 import warnings
 
@@ -51,10 +52,34 @@ def spi_port_device(clock_pin, mosi_pin, miso_pin, select_pin):
     raise SPIBadArgs('invalid pin selection for hardware SPI')
 
 
-class PiBoardInfo(BoardInfo):
-    __slots__ = () # workaround python issue #24931
+class LazyHeaders(frozendict):
+    """
+    A :class:`~gpiozero.compat.frozendict` mapping header names to
+    :class:`~gpiozero.pins.HeaderInfo` instances which are only constructed
+    (by calling *make_header* with the name and raw data of the header) the
+    first time they are accessed. Most uses of a board's information never
+    touch most of its headers.
+    """
+    def __init__(self, make_header, headers):
+        super().__init__(headers)
+        self._make_header = make_header
+        self._headers = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._headers[key]
+        except KeyError:
+            header = self._headers[key] = self._make_header(
+                key, self._dict[key])
+            return header
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {dict(self)!r}>'
+
 
+class PiBoardInfo(BoardInfo):
     @classmethod
+    @lru_cache(maxsize=32)
     def from_revision(cls, revision):
         """
         Construct a :class:`PiBoardInfo` instance from the specified Raspberry
@@ -77,6 +102,11 @@ class PiBoardInfo(BoardInfo):
             released='2021Q4', soc='BCM2837', manufacturer='Sony', memory=512,
             storage='MicroSD', usb=1, usb3=0, ethernet=0, eth_speed=0,
             wifi=True, bluetooth=True, csi=1, dsi=0, headers=..., board=...)
+
+        Results are cached, so repeated calls for the same *revision* return
+        the same shared instance (which must not be modified), and the
+        :class:`~gpiozero.PinInfo` of each header is only constructed when
+        that header is first accessed.
         """
         if revision & 0x800000:
             # New-style revision, parse information from bit-pattern:
@@ -341,18 +371,7 @@ class PiBoardInfo(BoardInfo):
                 eth_speed = ethernet * 100
             except KeyError:
                 raise PinUnknownPi(f'unknown old-style revision "{revision:x}"')
-        headers = frozendict({
-            header: HeaderInfo(
-                name=header, rows=rows, columns=columns,
-                pins=frozendict({
-                    number: cls._make_pin(
-                        header, number, row + 1, col + 1, functions)
-                    for number, functions in header_data.items()
-                    for row, col in (divmod(number - 1, 2),)
-                })
-            )
-            for header, (rows, columns, header_data) in headers.items()
-        })
+        headers = LazyHeaders(cls._make_header, headers)
         return cls(
             f'{revision:04x}',
             model,
@@ -374,6 +393,19 @@ class PiBoardInfo(BoardInfo):
             board,
             )
 
+    @classmethod
+    def _make_header(cls, header, header_data):
+        rows, columns, pins = header_data
+        return HeaderInfo(
+            name=header, rows=rows, columns=columns,
+            pins=frozendict({
+                number: cls._make_pin(
+                    header, number, row + 1, col + 1, functions)
+                for number, functions in pins.items()
+                for row, col in (divmod(number - 1, 2),)
+            })
+        )
+
     @staticmethod
     def _make_pin(header, number, row, col, interfaces):
         pull = 'up' if number in (3, 5) and header in ('P1', 'J8') else ''
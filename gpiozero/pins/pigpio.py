@@ -13,12 +13,21 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import os
+import socket
+import warnings
+from time import monotonic, sleep
+from struct import Struct, error as struct_error
+from threading import Lock, RLock, Timer
+from collections import defaultdict
+from bisect import bisect
+from itertools import accumulate
 
 import pigpio
 
 from . import SPI
 from .pi import PiPin, PiFactory, spi_port_device
 from ..mixins import SharedMixin
+from ..threads import GPIOThread
 from ..exc import (
     PinInvalidFunction,
     PinSetInput,
@@ -28,10 +37,264 @@ from ..exc import (
     PinInvalidState,
     SPIInvalidClockMode,
     PinPWMFixedValue,
-    DeviceClosed
+    DeviceClosed,
+    ZombieThread,
+    PinWarning,
 )
 
 
+class PiGPIOConnection:
+    """
+    A connection to the pigpio daemon at *host* and *port*, shared by all
+    :class:`PiGPIOFactory` instances talking to that daemon (see
+    :meth:`open`), which transparently re-establishes itself if the daemon
+    restarts or the network drops.
+
+    Attribute access is forwarded to the underlying :class:`pigpio.pi`
+    instance. If a command fails because the connection has been lost, the
+    connection is re-established (retrying with exponential backoff, starting
+    at :attr:`BACKOFF` seconds and doubling up to :attr:`MAX_BACKOFF`, for up
+    to :attr:`RETRIES` attempts), and each factory sharing it re-applies the
+    modes, pulls, PWM settings and edge callbacks of its pins, and re-opens
+    its SPI interfaces. If the command is one of :attr:`RETRY` it is then
+    retried; any other command (such as those creating waves, SPI handles or
+    callbacks, whose daemon-side state is lost with the old daemon) re-raises
+    the original error. A background thread also checks the connection every
+    :attr:`HEALTH_INTERVAL` seconds so that input-only devices (which never
+    send commands) also recover their callbacks.
+
+    So that a command doesn't stall its caller for the whole of a daemon
+    outage, it only makes up to :attr:`COMMAND_RETRIES` attempts to reconnect,
+    and fails immediately if another thread is already reconnecting. Each
+    attempt first probes the daemon's port with a plain socket (waiting up to
+    :attr:`PROBE_TIMEOUT` seconds), as :class:`pigpio.pi` prints a lengthy
+    warning every time it fails to connect.
+
+    The :attr:`reconnects` and :attr:`retried` counters record the number of
+    times the connection has been re-established, and the number of commands
+    that had to be retried as a result.
+    """
+    RETRIES = 10
+    BACKOFF = 0.1
+    MAX_BACKOFF = 5
+    HEALTH_INTERVAL = 1
+    COMMAND_RETRIES = 3
+    PROBE_TIMEOUT = 1
+    # The commands which set or query absolute state, and may therefore be
+    # safely repeated on a re-established connection
+    RETRY = frozenset({
+        'get_current_tick', 'get_hardware_revision', 'get_mode', 'set_mode',
+        'set_pull_up_down', 'set_glitch_filter', 'read', 'write',
+        'read_bank_1', 'read_bank_2', 'set_bank_1', 'set_bank_2',
+        'clear_bank_1', 'clear_bank_2', 'get_PWM_frequency', 'get_PWM_range',
+        'get_PWM_dutycycle', 'set_PWM_frequency', 'set_PWM_range',
+        'set_PWM_dutycycle', 'wave_get_max_pulses', 'wave_tx_busy',
+        'wave_tx_stop',
+    })
+
+    _connections = {}
+    _connections_lock = Lock()
+
+    @classmethod
+    def open(cls, factory, host, port):
+        """
+        Return the connection to *host* and *port*, opening it if no other
+        factory currently shares it, and register *factory* to have its pins
+        restored on reconnection.
+        """
+        with cls._connections_lock:
+            try:
+                conn = cls._connections[host, port]
+            except KeyError:
+                conn = cls._connections[host, port] = cls(host, port)
+            conn._factories.append(factory)
+            return conn
+
+    def __init__(self, host, port):
+        self._host = host
+        self._port = port
+        self._lock = RLock()
+        self._factories = []
+        self._reconnecting = False
+        self.reconnects = 0
+        self.retried = 0
+        self._pi = pigpio.pi(host, port)
+        # Annoyingly, pigpio doesn't raise an exception when it fails to make
+        # a connection; it returns a valid (but disconnected) pi object
+        if not self:
+            raise IOError(f'failed to connect to {host}:{port}')
+        self._monitor = GPIOThread(self._health, name='pigpio-health')
+        self._monitor.start()
+
+    def __repr__(self):
+        return f'<PiGPIOConnection {self._host}:{self._port}>'
+
+    def __bool__(self):
+        # The connection's "connected" property is rather buggy -
+        # disconnecting doesn't set it to False! So we're naughty and check an
+        # internal variable instead...
+        try:
+            return self._pi.sl.s is not None
+        except AttributeError:
+            return False
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._pi, name)
+        if not callable(attr):
+            return attr
+        # A closed socket surfaces as an OSError on send, or a short (empty)
+        # response which fails to unpack; after a failed attempt to reconnect
+        # the stopped pigpio.pi has no socket at all, hence AttributeError
+        if name in self.RETRY:
+            def command(*args, **kwargs):
+                pi = self._pi
+                try:
+                    return getattr(pi, name)(*args, **kwargs)
+                except (OSError, struct_error, AttributeError):
+                    if self._reconnecting:
+                        raise
+                    self.reconnect(
+                        pi, retries=self.COMMAND_RETRIES, blocking=False)
+                    self.retried += 1
+                    return getattr(self._pi, name)(*args, **kwargs)
+        else:
+            def command(*args, **kwargs):
+                pi = self._pi
+                try:
+                    return getattr(pi, name)(*args, **kwargs)
+                except (OSError, struct_error, AttributeError):
+                    if not self._reconnecting:
+                        try:
+                            self.reconnect(
+                                pi, retries=self.COMMAND_RETRIES,
+                                blocking=False)
+                        except IOError:
+                            pass
+                    raise
+        # Bind the wrapper to the instance so subsequent look-ups of the
+        # command find it directly instead of coming back here
+        self.__dict__[name] = command
+        return command
+
+    def close(self, factory):
+        """
+        Unregister *factory*, closing the connection if no other factory is
+        sharing it.
+        """
+        with self._connections_lock:
+            self._factories.remove(factory)
+            if self._factories:
+                return
+            if self._connections.get((self._host, self._port)) is self:
+                del self._connections[self._host, self._port]
+        self._monitor.stop()
+        if self:
+            self._pi.stop()
+
+    def check(self):
+        """
+        Check the daemon is responding, re-establishing the connection if it
+        isn't. Returns :data:`True` if the connection was healthy.
+        """
+        pi = self._pi
+        try:
+            pi.get_current_tick()
+        except (OSError, struct_error, AttributeError):
+            self.reconnect(pi)
+            return False
+        else:
+            return True
+
+    def reconnect(self, failed=None, *, retries=None, blocking=True):
+        """
+        Re-establish the connection to the daemon, and restore the state of
+        the pins of all factories sharing it. If *failed* is given, and the
+        connection has already been replaced since that :class:`pigpio.pi`
+        failed (by another thread), nothing is done. Raises :exc:`IOError` if
+        the daemon cannot be reached within *retries* attempts (which defaults
+        to :attr:`RETRIES`), if *blocking* is :data:`False` and another
+        thread is already reconnecting, or if restoring the pins fails (in
+        which case the new connection is dropped again, so the next attempt
+        restores them afresh).
+        """
+        if retries is None:
+            retries = self.RETRIES
+        if not self._lock.acquire(blocking):
+            raise IOError(
+                f'already reconnecting to {self._host}:{self._port}')
+        try:
+            if failed is not None and failed is not self._pi:
+                return
+            try:
+                self._pi.stop()
+            except (OSError, struct_error, AttributeError):
+                pass
+            delay = self.BACKOFF
+            for attempt in range(retries):
+                if self._probe():
+                    self._pi = pigpio.pi(self._host, self._port)
+                    if self:
+                        break
+                if (
+                        attempt == retries - 1 or
+                        self._monitor.stopping.wait(delay)
+                ):
+                    raise IOError(
+                        f'failed to reconnect to {self._host}:{self._port}')
+                delay = min(delay * 2, self.MAX_BACKOFF)
+            self._reconnecting = True
+            try:
+                for factory in self._factories:
+                    factory._restore()
+            except Exception as e:
+                # The daemon may have dropped again, or rejected a restored
+                # setting; either way the pins are in an unknown state
+                warnings.warn(PinWarning(
+                    f'failed to restore pins after reconnecting to '
+                    f'{self._host}:{self._port}: {e!r}'))
+                try:
+                    self._pi.stop()
+                except (OSError, struct_error, AttributeError):
+                    pass
+                raise IOError(
+                    f'failed to restore pins on {self._host}:{self._port}'
+                ) from e
+            finally:
+                self._reconnecting = False
+            self.reconnects += 1
+        finally:
+            self._lock.release()
+
+    def _probe(self):
+        # Check something is listening on the daemon's port before handing
+        # over to pigpio.pi, which prints a multi-line warning to stdout each
+        # time it fails to connect
+        try:
+            socket.create_connection(
+                (self._host, self._port), timeout=self.PROBE_TIMEOUT).close()
+        except OSError:
+            return False
+        else:
+            return True
+
+    def _health(self):
+        while not self._monitor.stopping.wait(self.HEALTH_INTERVAL):
+            try:
+                self.check()
+            except IOError:
+                # The daemon's still unreachable (or the pins couldn't be
+                # restored); try again next interval
+                pass
+            except Exception as e:
+                # Don't let anything unexpected end the thread, or automatic
+                # reconnection would silently stop for good
+                warnings.warn(PinWarning(
+                    f'health check of {self._host}:{self._port} failed: '
+                    f'{e!r}'))
+
+
 class PiGPIOFactory(PiFactory):
     """
     Extends :class:`~gpiozero.pins.pi.PiFactory`. Uses the `pigpio`_ library to
@@ -75,9 +338,20 @@ class PiGPIOFactory(PiFactory):
         bug in our pin implementation). A workaround for now is simply to
         restart the :command:`pigpiod` daemon.
 
+    Factories with the same *host* and *port* share a single
+    :class:`PiGPIOConnection` to the daemon, which automatically reconnects
+    (restoring the state of the factories' pins) if the daemon restarts.
+
+    By default, edge detection registers a separate pigpio callback for each
+    pin. If *bulk_events* is :data:`True`, the factory instead opens a single
+    notification stream covering every watched pin (in the first bank, GPIO0
+    to GPIO31), decodes its reports in bulk, and dispatches them to the pins
+    directly (see :class:`PiGPIONotifier`). This is considerably cheaper when
+    many pins (or fast changing pins, like rotary encoders) are watched.
+
     .. _pigpio: http://abyz.me.uk/rpi/pigpio/
     """
-    def __init__(self, host=None, port=None):
+    def __init__(self, host=None, port=None, *, bulk_events=False):
         super().__init__()
         if host is None:
             host = os.environ.get('PIGPIO_ADDR', 'localhost')
@@ -85,14 +359,16 @@ class PiGPIOFactory(PiFactory):
             # XXX Use getservbyname
             port = int(os.environ.get('PIGPIO_PORT', 8888))
         self.pin_class = PiGPIOPin
-        self._connection = pigpio.pi(host, port)
-        # Annoyingly, pigpio doesn't raise an exception when it fails to make a
-        # connection; it returns a valid (but disconnected) pi object
-        if self.connection is None:
-            raise IOError(f'failed to connect to {host}:{port}')
+        self._connection = PiGPIOConnection.open(self, host, port)
         self._host = host
         self._port = port
         self._spis = []
+        # The daemon can only transmit one wave at a time; this is the
+        # PiGPIOWave which currently owns it (if any)
+        self._wave = None
+        self._notifier = None
+        if bulk_events:
+            self._notifier = PiGPIONotifier(self)
 
     def close(self):
         super().close()
@@ -102,20 +378,43 @@ class PiGPIOFactory(PiFactory):
         if self.connection:
             while self._spis:
                 self._spis[0].close()
-            self.connection.stop()
+            if self._notifier is not None:
+                self._notifier.close()
+                self._notifier = None
+        if self._connection is not None:
+            self._connection.close(self)
             self._connection = None
 
+    def _restore(self):
+        # Called by PiGPIOConnection after it has re-established itself; the
+        # notification stream (if any) died with the old connection so it's
+        # replaced before the pins re-register their callbacks. Its handle
+        # belonged to the old daemon, so it mustn't be closed on the new one
+        if self._notifier is not None:
+            self._notifier._discard()
+            self._notifier = PiGPIONotifier(self)
+        for pin in self.pins.values():
+            pin._restore()
+        for intf in self._spis:
+            intf._restore()
+
     @property
     def connection(self):
-        # If we're shutting down, the connection may have disconnected itself
-        # already. Unfortunately, the connection's "connected" property is
-        # rather buggy - disconnecting doesn't set it to False! So we're
-        # naughty and check an internal variable instead...
-        try:
-            if self._connection.sl.s is not None:
-                return self._connection
-        except AttributeError:
-            pass
+        """
+        The :class:`PiGPIOConnection` used to communicate with the daemon,
+        or :data:`None` if the factory has been closed, or the connection has
+        disconnected itself (e.g. during shutdown).
+        """
+        if self._connection:
+            return self._connection
+
+    @property
+    def notifier(self):
+        """
+        The :class:`PiGPIONotifier` dispatching edge events to pins when the
+        factory was constructed with *bulk_events*, or :data:`None` otherwise.
+        """
+        return self._notifier
 
     @property
     def host(self):
@@ -141,6 +440,69 @@ class PiGPIOFactory(PiFactory):
         self._spis.append(intf)
         return intf
 
+    def read_many(self, pins):
+        """
+        Overridden to read the levels of all *pins* in each bank with a single
+        ``read_bank_1`` (or ``read_bank_2``) command, instead of a round trip
+        to the daemon per pin. Pins currently in PWM mode are still queried
+        individually as their state is their duty cycle.
+        """
+        banks = {}
+        result = []
+        for pin in pins:
+            if (
+                    not isinstance(pin, PiGPIOPin) or pin.factory is not self or
+                    pin._pwm
+            ):
+                result.append(pin.state)
+                continue
+            bank, shift = divmod(pin._number, 32)
+            try:
+                level = banks[bank]
+            except KeyError:
+                level = banks[bank] = (
+                    self.connection.read_bank_1,
+                    self.connection.read_bank_2,
+                )[bank]()
+            result.append(bool(level & (1 << shift)))
+        return tuple(result)
+
+    def write_many(self, states):
+        """
+        Overridden to gather the *states* of all pins into one
+        ``set_bank_1`` and one ``clear_bank_1`` command (or their
+        ``_bank_2`` equivalents) for each bank of pins, instead of a round
+        trip to the daemon per pin. Pins within a bank therefore change at
+        the same instant. Pins currently in PWM mode are still set
+        individually.
+        """
+        set_banks = defaultdict(int)
+        clear_banks = defaultdict(int)
+        for pin, state in states.items():
+            if (
+                    not isinstance(pin, PiGPIOPin) or pin.factory is not self or
+                    pin._pwm
+            ):
+                pin.state = state
+                continue
+            if pin._function == 'input':
+                raise PinSetInput(f'cannot set state of pin {pin!r}')
+            bank, shift = divmod(pin._number, 32)
+            if state:
+                set_banks[bank] |= 1 << shift
+            else:
+                clear_banks[bank] |= 1 << shift
+        for bank, bits in set_banks.items():
+            (
+                self.connection.set_bank_1,
+                self.connection.set_bank_2,
+            )[bank](bits)
+        for bank, bits in clear_banks.items():
+            (
+                self.connection.clear_bank_1,
+                self.connection.clear_bank_2,
+            )[bank](bits)
+
     def ticks(self):
         return self._connection.get_current_tick()
 
@@ -191,7 +553,14 @@ class PiGPIOPin(PiPin):
     def __init__(self, factory, info):
         super().__init__(factory, info)
         self._pull = info.pull or 'floating'
+        # Local shadow of the pin's function, so that PiGPIOFactory.write_many
+        # can refuse to set input pins without querying the daemon for each
+        self._function = 'input'
         self._pwm = False
+        # Local shadow of the (frequency, range, duty-cycle) of the pin's PWM;
+        # None when unknown, in which case it's re-read from the daemon
+        self._pwm_state = None
+        self._wave = None
         self._bounce = None
         self._callback = None
         self._edges = pigpio.EITHER_EDGE
@@ -220,25 +589,105 @@ class PiGPIOPin(PiPin):
         try:
             self.factory.connection.set_mode(
                 self._number, self.GPIO_FUNCTIONS[value])
+            self._function = value
         except KeyError:
             raise PinInvalidFunction(
                 f'invalid function "{value}" for pin {self!r}')
 
+    def _get_pwm_state(self):
+        # All PWM parameters are set by this class, so the shadow is
+        # authoritative (even across reconnections, when the daemon's settings
+        # are restored from it); it only needs fetching from the daemon if it
+        # is unknown
+        if self._pwm_state is None:
+            self._pwm_state = (
+                self.factory.connection.get_PWM_frequency(self._number),
+                self.factory.connection.get_PWM_range(self._number),
+                self.factory.connection.get_PWM_dutycycle(self._number),
+            )
+        return self._pwm_state
+
+    def output_sequence(self, sequence, n=None):
+        """
+        Overridden to compile *sequence* into a pigpio wave, which the daemon
+        plays (*n* times, or forever) with DMA timing, avoiding a round trip
+        to the daemon for every step of the sequence. Intermediate states are
+        produced by software PWM within the wave at the pin's current
+        :attr:`frequency`.
+
+        As the daemon can only transmit one wave at a time, this returns
+        :data:`None` (so the caller falls back to a thread) if another wave is
+        still playing, if the pin is not currently using PWM, or if the
+        sequence is too long to fit in a wave.
+        """
+        if not self._pwm or n == 0 or (
+                n is not None and n > PiGPIOWave.MAX_LOOPS):
+            return None
+        current = self.factory._wave
+        if current is not None:
+            if current.busy:
+                return None
+            current._finish()
+        if self.factory.connection.wave_tx_busy():
+            # Some other client of the daemon is transmitting a wave
+            return None
+        try:
+            return PiGPIOWave(self, sequence, n)
+        except ValueError:
+            return None
+
+    def _restore(self):
+        # Re-apply the pin's configuration to a newly (re-)established
+        # connection, from the local shadows of its state
+        conn = self.factory.connection
+        conn.set_mode(self._number, self.GPIO_FUNCTIONS[self._function])
+        if self._function == 'input':
+            conn.set_pull_up_down(
+                self._number, self.GPIO_PULL_UPS[self._pull])
+        conn.set_glitch_filter(self._number, self._bounce or 0)
+        if self._wave is not None:
+            # The wave was lost with the daemon; leave the pin at the state
+            # it was outputting
+            wave, self._wave = self._wave, None
+            wave._wid = None
+            if wave._reaper is not None:
+                wave._reaper.cancel()
+            if self.factory._wave is wave:
+                self.factory._wave = None
+            frequency, range_, duty = self._pwm_state
+            self._pwm_state = (frequency, range_, int(wave.state * range_))
+        if self._pwm:
+            # The new daemon's PWM settings are its defaults, so they are
+            # restored from the shadow rather than read back
+            frequency, range_, duty = self._pwm_state
+            conn.set_PWM_frequency(self._number, frequency)
+            conn.set_PWM_range(self._number, range_)
+            conn.set_PWM_dutycycle(self._number, duty)
+        # The old callback died with the old connection
+        self._callback = None
+        if self._when_changed is not None:
+            self._enable_event_detect()
+
     def _get_state(self):
+        if self._wave is not None:
+            return self._wave.state
         if self._pwm:
-            return (
-                self.factory.connection.get_PWM_dutycycle(self._number) /
-                self.factory.connection.get_PWM_range(self._number)
-                )
+            frequency, range_, duty = self._get_pwm_state()
+            return duty / range_
         else:
             return bool(self.factory.connection.read(self._number))
 
     def _set_state(self, value):
+        if self._wave is not None:
+            self._wave.stop()
         if self._pwm:
+            frequency, range_, duty = self._get_pwm_state()
             try:
-                value = int(value * self.factory.connection.get_PWM_range(self._number))
-                if value != self.factory.connection.get_PWM_dutycycle(self._number):
-                    self.factory.connection.set_PWM_dutycycle(self._number, value)
+                value = int(value * range_)
+                if value != duty:
+                    self.factory.connection.set_PWM_dutycycle(
+                        self._number, value)
+                    self._pwm_state = (frequency, range_, value)
             except pigpio.error:
                 raise PinInvalidState(
                     f'invalid state "{value}" for pin {self!r}')
@@ -265,10 +714,12 @@ class PiGPIOPin(PiPin):
 
     def _get_frequency(self):
         if self._pwm:
-            return self.factory.connection.get_PWM_frequency(self._number)
+            return self._get_pwm_state()[0]
         return None
 
     def _set_frequency(self, value):
+        if self._wave is not None:
+            self._wave.stop()
         if not self._pwm and value is not None:
             if self.function != 'output':
                 raise PinPWMFixedValue(f'cannot start PWM on pin {self!r}')
@@ -276,16 +727,24 @@ class PiGPIOPin(PiPin):
             # high, starting PWM and setting a 0 duty-cycle *doesn't* bring
             # the pin low; it stays high!
             self.factory.connection.write(self._number, 0)
-            self.factory.connection.set_PWM_frequency(self._number, int(value))
+            # set_PWM_frequency returns the closest frequency the daemon
+            # could actually achieve, which is what we shadow
+            frequency = self.factory.connection.set_PWM_frequency(
+                self._number, int(value))
             self.factory.connection.set_PWM_range(self._number, 10000)
             self.factory.connection.set_PWM_dutycycle(self._number, 0)
+            self._pwm_state = (frequency, 10000, 0)
             self._pwm = True
         elif self._pwm and value is not None:
-            if value != self.factory.connection.get_PWM_frequency(self._number):
-                self.factory.connection.set_PWM_frequency(self._number, int(value))
+            old_frequency, range_, duty = self._get_pwm_state()
+            if value != old_frequency:
+                frequency = self.factory.connection.set_PWM_frequency(
+                    self._number, int(value))
                 self.factory.connection.set_PWM_range(self._number, 10000)
+                self._pwm_state = (frequency, 10000, duty)
         elif self._pwm and value is None:
             self.factory.connection.write(self._number, 0)
+            self._pwm_state = None
             self._pwm = False
 
     def _get_bounce(self):
@@ -298,6 +757,7 @@ class PiGPIOPin(PiPin):
             raise PinInvalidBounce('bounce must be between 0 and 0.3')
         self.factory.connection.set_glitch_filter(
             self._number, int(value * 1000000))
+        self._bounce = int(value * 1000000)
 
     def _get_edges(self):
         return self.GPIO_EDGES_NAMES[self._edges]
@@ -314,13 +774,389 @@ class PiGPIOPin(PiPin):
         super()._call_when_changed(ticks, level)
 
     def _enable_event_detect(self):
-        self._callback = self.factory.connection.callback(
-                self._number, self._edges, self._call_when_changed)
+        notifier = self.factory._notifier
+        if notifier is not None and self._number < 32:
+            notifier.watch(self)
+        else:
+            self._callback = self.factory.connection.callback(
+                    self._number, self._edges, self._call_when_changed)
 
     def _disable_event_detect(self):
         if self._callback is not None:
             self._callback.cancel()
             self._callback = None
+        elif self.factory._notifier is not None:
+            self.factory._notifier.unwatch(self)
+
+
+class PiGPIONotifier:
+    """
+    Receives the level reports of all watched pins from a single pigpio
+    notification stream, and dispatches them to the
+    :attr:`~gpiozero.Pin.when_changed` handlers of the relevant
+    :class:`PiGPIOPin` instances. This is constructed by
+    :class:`PiGPIOFactory` when *bulk_events* is :data:`True`.
+
+    The pigpio library's own callbacks share a notification stream too, but
+    decode each report separately and test it against every registered
+    callback in turn. This class instead decodes whole buffers of reports at
+    once, and only visits the pins whose level actually changed.
+
+    The :attr:`reports` and :attr:`edges` counters (together with
+    :attr:`started`) can be used to measure the throughput achieved.
+    """
+    # The pigpio socket command which opens an in-band notification stream
+    # on the socket it is sent over, and the layout of commands and reports
+    CMD_NOIB = 99
+    COMMAND = Struct('=IIII')
+    RESPONSE = Struct('=12xi')
+    REPORT = Struct('=HHII')
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._lock = Lock()
+        self._pins = {}
+        self._bits = 0
+        self._level = 0
+        self.reports = 0
+        self.edges = 0
+        self._sock = socket.create_connection((factory.host, factory.port))
+        try:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock.sendall(self.COMMAND.pack(self.CMD_NOIB, 0, 0, 0))
+            response = b''
+            while len(response) < self.RESPONSE.size:
+                data = self._sock.recv(self.RESPONSE.size - len(response))
+                if not data:
+                    raise IOError('pigpio daemon closed notification socket')
+                response += data
+            self._handle, = self.RESPONSE.unpack(response)
+            if self._handle < 0:
+                raise IOError(
+                    f'failed to open notification stream: '
+                    f'{pigpio.error_text(self._handle)}')
+        except:
+            self._sock.close()
+            raise
+        self.started = monotonic()
+        self._thread = GPIOThread(self._run, name='pigpio-notifier')
+        self._thread.start()
+
+    def close(self):
+        """
+        Closes the notification stream, and stops the dispatch thread.
+        """
+        if self._thread is not None:
+            self._thread.stopping.set()
+            conn = self._factory.connection
+            if conn:
+                conn.notify_close(self._handle)
+            self._discard()
+
+    def _discard(self):
+        # Stops the dispatch thread and closes the socket *without* closing
+        # the handle on the daemon. This is used when the stream died with a
+        # previous daemon; its handle number may since have been re-used by
+        # another stream on the new one
+        if self._thread is not None:
+            self._thread.stopping.set()
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._thread.stop()
+            self._thread = None
+            self._sock.close()
+
+    def watch(self, pin):
+        """
+        Start dispatching the edges of *pin* to its
+        :meth:`~PiGPIOPin._call_when_changed` method.
+        """
+        bit = 1 << pin._number
+        with self._lock:
+            self._pins[bit] = pin
+            self._bits |= bit
+            # Seed the pin's last known level so its first report isn't
+            # mistaken for an edge
+            level = self._factory.connection.read_bank_1()
+            self._level = (self._level & ~bit) | (level & bit)
+            self._factory.connection.notify_begin(self._handle, self._bits)
+
+    def unwatch(self, pin):
+        """
+        Stop dispatching the edges of *pin*.
+        """
+        bit = 1 << pin._number
+        with self._lock:
+            if self._pins.pop(bit, None) is not None:
+                self._bits &= ~bit
+                conn = self._factory.connection
+                if conn:
+                    conn.notify_begin(self._handle, self._bits)
+
+    @property
+    def edges_per_second(self):
+        """
+        The average number of edges dispatched per second since the stream
+        was opened.
+        """
+        return self.edges / (monotonic() - self.started)
+
+    def _run(self):
+        size = self.REPORT.size
+        buf = b''
+        while not self._thread.stopping.is_set():
+            try:
+                data = self._sock.recv(size * 1024)
+            except OSError:
+                break
+            if not data:
+                break
+            buf += data
+            whole = len(buf) - len(buf) % size
+            if whole:
+                self._dispatch(buf[:whole])
+                buf = buf[whole:]
+
+    def _dispatch(self, data):
+        calls = []
+        with self._lock:
+            pins = self._pins
+            bits = self._bits
+            last = self._level
+            count = 0
+            for seq, flags, tick, level in self.REPORT.iter_unpack(data):
+                count += 1
+                if flags:
+                    # Watchdog and keep-alive reports carry no level change
+                    continue
+                changed = (level ^ last) & bits
+                last = level
+                while changed:
+                    bit = changed & -changed
+                    changed ^= bit
+                    pin = pins[bit]
+                    state = bool(level & bit)
+                    if (
+                            pin._edges == pigpio.EITHER_EDGE or
+                            (pin._edges == pigpio.RISING_EDGE) == state
+                    ):
+                        calls.append((pin, state, tick))
+            self._level = (self._level & ~bits) | (last & bits)
+            self.reports += count
+            self.edges += len(calls)
+        # Handlers are called outside the lock so they may safely (un)watch
+        # pins themselves
+        for pin, state, tick in calls:
+            pin._call_when_changed(pin._number, state, tick)
+
+
+class PiGPIOWave:
+    """
+    Plays a sequence of (state, duration) steps on a :class:`PiGPIOPin` as a
+    pigpio wave chain. This is returned by :meth:`PiGPIOPin.output_sequence`
+    and provides the ``stop()`` and ``join()`` methods of
+    :class:`~gpiozero.threads.GPIOThread` so that it can stand in for a blink
+    thread.
+
+    The daemon has room for few waves, so a finite sequence frees its wave
+    (from a timer) as soon as it finishes, rather than waiting for the wave's
+    state to be queried, or the wave to be stopped or joined.
+    """
+    # The largest loop count a wave chain can express
+    MAX_LOOPS = 65535
+    # The longest delay a single pulse can express, in microseconds
+    MAX_DELAY = 0xFFFFFFFF
+
+    def __init__(self, pin, sequence, n):
+        self.pin = pin
+        self._n = n
+        self._wid = None
+        self._lock = RLock()
+        self._reaper = None
+        # The cumulative end time (in seconds) of each step, used to calculate
+        # the state being output at any given moment
+        self._states = [state for state, delay in sequence]
+        self._ends = list(accumulate(max(0, delay) for state, delay in sequence))
+        self._length = self._ends[-1] if self._ends else 0
+        if not self._length:
+            raise ValueError('empty sequence')
+        conn = pin.factory.connection
+        pulses = self._pulses(sequence, pin.frequency)
+        if len(pulses) > conn.wave_get_max_pulses():
+            raise ValueError('sequence is too long')
+        # Hardware (and DMA) PWM must be disabled on the pin while the wave
+        # drives it, otherwise the two will fight over the pin's level
+        conn.set_PWM_dutycycle(pin._number, 0)
+        conn.wave_add_new()
+        # wave_add_generic merges pulses into the existing wave from its start
+        # so each batch after the first must begin with a delay covering the
+        # pulses already added (split, like any other delay, into pulses no
+        # longer than MAX_DELAY)
+        offset = 0
+        for i in range(0, len(pulses), 1000):
+            batch = pulses[i:i + 1000]
+            lead = offset
+            while lead > self.MAX_DELAY:
+                batch.insert(0, pigpio.pulse(0, 0, self.MAX_DELAY))
+                lead -= self.MAX_DELAY
+            if lead:
+                batch.insert(0, pigpio.pulse(0, 0, lead))
+            conn.wave_add_generic(batch)
+            offset += sum(p.delay for p in pulses[i:i + 1000])
+        self._wid = conn.wave_create()
+        if n is None:
+            conn.wave_chain([255, 0, self._wid, 255, 3])
+        elif n == 1:
+            conn.wave_chain([self._wid])
+        else:
+            conn.wave_chain([255, 0, self._wid, 255, 1, n & 0xFF, n >> 8])
+        self._start = monotonic()
+        pin._wave = self
+        pin.factory._wave = self
+        if n is not None:
+            self._reaper = Timer(n * self._length, self._reap)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _pulses(self, sequence, frequency):
+        mask = 1 << self.pin._number
+        levels = []
+        for state, delay in sequence:
+            us = int(delay * 1000000)
+            if us <= 0:
+                continue
+            elif state <= 0:
+                levels.append((False, us))
+            elif state >= 1:
+                levels.append((True, us))
+            else:
+                # Software PWM at the pin's frequency for the step's duration;
+                # there's always at least one cycle so short steps aren't lost
+                cycles = max(1, round(us * frequency / 1000000))
+                period = us // cycles
+                on = round(state * period)
+                for cycle in range(cycles):
+                    if cycle == cycles - 1:
+                        period = us - (cycles - 1) * period
+                    levels.append((True, on))
+                    levels.append((False, period - on))
+        pulses = []
+        level = None
+        for value, us in levels:
+            if not us:
+                continue
+            if value == level:
+                us += pulses.pop().delay
+            level = value
+            while us > self.MAX_DELAY:
+                pulses.append(pigpio.pulse(
+                    *((mask, 0) if value else (0, mask)), self.MAX_DELAY))
+                us -= self.MAX_DELAY
+            pulses.append(pigpio.pulse(
+                *((mask, 0) if value else (0, mask)), us))
+        return pulses
+
+    @property
+    def busy(self):
+        """
+        Returns :data:`True` while the wave is still being transmitted.
+        """
+        if self._wid is None:
+            return False
+        conn = self.pin.factory.connection
+        return bool(conn and conn.wave_tx_busy())
+
+    @property
+    def state(self):
+        """
+        The state being output by the wave at this moment, calculated from
+        the time elapsed since it started (the daemon is not queried, except
+        to detect the end of a finite sequence).
+        """
+        elapsed = monotonic() - self._start
+        if self._n is not None and elapsed >= self._n * self._length:
+            state = self._states[-1]
+            if not self.busy:
+                self._finish(state)
+            return state
+        index = bisect(self._ends, elapsed % self._length)
+        return self._states[min(index, len(self._states) - 1)]
+
+    def stop(self, timeout=None):
+        """
+        Stops transmission of the wave, leaving the pin in the state it was
+        outputting at that moment.
+        """
+        with self._lock:
+            if self._wid is not None:
+                state = self.state
+                if self._wid is not None:
+                    self.pin.factory.connection.wave_tx_stop()
+                    self._finish(state)
+
+    def join(self, timeout=None):
+        """
+        Waits for transmission of the wave to finish (or *timeout* seconds to
+        elapse, in which case :exc:`~gpiozero.ZombieThread` is raised).
+        """
+        if self._wid is None:
+            return
+        deadline = None if timeout is None else monotonic() + timeout
+        if self._n is not None:
+            # Sleep until the wave should have finished, then poll the daemon
+            # for the remaining moments of DMA timing slop
+            remaining = self._start + self._n * self._length - monotonic()
+            if deadline is not None:
+                remaining = min(remaining, deadline - monotonic())
+            if remaining > 0:
+                sleep(remaining)
+        while self.busy:
+            if deadline is not None and monotonic() > deadline:
+                raise ZombieThread(
+                    f"Wave failed to finish within {timeout} seconds")
+            sleep(0.01)
+        self._finish(self._states[-1])
+
+    def _reap(self):
+        # Run by the timer once a finite sequence should have finished; polls
+        # the daemon for the remaining moments of DMA timing slop, then frees
+        # the wave
+        while self._wid is not None:
+            try:
+                with self._lock:
+                    if self._wid is None or not self.busy:
+                        self._finish()
+                        return
+            except (OSError, struct_error, pigpio.error):
+                # The connection's gone; the wave went with the daemon or
+                # will be freed by whoever next uses the pin
+                return
+            sleep(0.01)
+
+    def _finish(self, state=None):
+        # Release the wave, and return the pin to PWM at the final state of
+        # the sequence (or the state it was stopped at)
+        with self._lock:
+            if self._wid is None:
+                return
+            if self._reaper is not None:
+                self._reaper.cancel()
+            if state is None:
+                state = self._states[-1]
+            pin = self.pin
+            conn = pin.factory.connection
+            wid, self._wid = self._wid, None
+            pin._wave = None
+            if pin.factory._wave is self:
+                pin.factory._wave = None
+            if conn:
+                conn.wave_delete(wid)
+                frequency, range_, duty = pin._get_pwm_state()
+                duty = int(state * range_)
+                conn.set_PWM_dutycycle(pin._number, duty)
+                pin._pwm_state = (frequency, range_, duty)
 
 
 class PiGPIOHardwareSPI(SPI):
@@ -372,6 +1208,13 @@ class PiGPIOHardwareSPI(SPI):
     def closed(self):
         return self._handle is None or self.pin_factory.connection is None
 
+    def _restore(self):
+        # The handle died with the old daemon; open a new one with the same
+        # settings on the re-established connection
+        if self._handle is not None:
+            self._handle = self.pin_factory.connection.spi_open(
+                self._device, self._baud, self._spi_flags)
+
     def __repr__(self):
         try:
             self._check_open()
@@ -449,6 +1292,15 @@ class PiGPIOHardwareSPI(SPI):
         # ... padded to 16/32-bits?
         return [int(b) for b in data]
 
+    def transfer_into(self, tx, rx):
+        self._check_open()
+        count, data = self.pin_factory.connection.spi_xfer(
+            self._handle, bytes(tx))
+        if count < 0:
+            raise IOError(f'SPI transfer error {count}')
+        rx[:count] = data
+        return count
+
 
 class PiGPIOSoftwareSPI(SPI):
     """
@@ -508,6 +1360,14 @@ class PiGPIOSoftwareSPI(SPI):
     def closed(self):
         return self._closed
 
+    def _restore(self):
+        # The bit-banged interface died with the old daemon; re-open it with
+        # the same settings on the re-established connection
+        if not self._closed:
+            self.pin_factory.connection.bb_spi_open(
+                self._select_pin, self._miso_pin, self._mosi_pin,
+                self._clock_pin, self._baud, self._spi_flags)
+
     def __repr__(self):
         try:
             self._check_open()
@@ -586,6 +1446,15 @@ class PiGPIOSoftwareSPI(SPI):
         # byte-sized words so no issues here
         return [int(b) for b in data]
 
+    def transfer_into(self, tx, rx):
+        self._check_open()
+        count, data = self.pin_factory.connection.bb_spi_xfer(
+            self._select_pin, bytes(tx))
+        if count < 0:
+            raise IOError(f'SPI transfer error {count}')
+        rx[:count] = data
+        return count
+
 
 class PiGPIOHardwareSPIShared(SharedMixin, PiGPIOHardwareSPI):
     @classmethod
@@ -7,10 +7,9 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-import operator
 from threading import RLock
 
-from . import SPI
+from . import Factory, SPI
 from ..devices import Device, SharedMixin
 from ..input_devices import InputDevice
 from ..output_devices import OutputDevice
@@ -91,6 +90,21 @@ class SPISoftware(SPI):
             finally:
                 self._select.off()
 
+    def transfer_many(self, messages):
+        # Hold the bus for the whole batch so other devices sharing the clock,
+        # mosi and miso pins can't interleave their transfers
+        result = []
+        with self._bus.lock:
+            for data in messages:
+                self._select.on()
+                try:
+                    result.append(self._bus.transfer(
+                        data, self._clock_phase, self._lsb_first,
+                        self._bits_per_word))
+                finally:
+                    self._select.off()
+        return result
+
     def _get_clock_mode(self):
         with self._bus.lock:
             return (not self._bus.clock.active_high) << 1 | self._clock_phase
@@ -192,29 +206,71 @@ class SPISoftwareBus(SharedMixin, Device):
             # (specifically the section "Example of bit-banging the master
             # protocol") for a simpler C implementation of this which ignores
             # clock polarity, phase, variable word-size, and multiple input
-            # words
+            # words.
+            #
+            # The pins are driven directly, rather than through the devices'
+            # properties, which would otherwise check the device is open, stop
+            # any blinking, and convert values to states on every bit
+            clock = self.clock.pin
+            mosi = None if self.mosi is None else self.mosi.pin
+            miso = None if self.miso is None else self.miso.pin
+            on = self.clock.active_high
+            off = not on
             if lsb_first:
-                shift = operator.lshift
-                init_mask = 1
+                masks = [1 << bit for bit in range(bits_per_word)]
             else:
-                shift = operator.rshift
-                init_mask = 1 << (bits_per_word - 1)
-            for write_word in data:
-                mask = init_mask
-                read_word = 0
-                for _ in range(bits_per_word):
-                    if self.mosi is not None:
-                        self.mosi.value = bool(write_word & mask)
-                    # read bit on clock activation
-                    self.clock.on()
-                    if not clock_phase:
-                        if self.miso is not None and self.miso.value:
+                masks = [1 << bit for bit in reversed(range(bits_per_word))]
+            # Where the factory can change several pins in one operation,
+            # MOSI changes with the clock edge preceding the bit (as it would
+            # with a hardware SPI interface) rather than separately
+            write_many = clock.factory.write_many
+            batched = mosi is not None and (
+                type(clock.factory).write_many is not Factory.write_many)
+            if batched and not clock_phase:
+                # Read bit on clock activation; MOSI changes with the
+                # deactivation of the clock for the prior bit
+                for write_word in data:
+                    read_word = 0
+                    for mask in masks:
+                        write_many({mosi: bool(write_word & mask), clock: off})
+                        clock.state = on
+                        if miso is not None and miso.state:
                             read_word |= mask
-                    # read bit on clock deactivation
-                    self.clock.off()
-                    if clock_phase:
-                        if self.miso is not None and self.miso.value:
+                    result.append(read_word)
+                clock.state = off
+            elif batched:
+                # Read bit on clock deactivation; MOSI changes with the
+                # activation of the clock for the bit
+                for write_word in data:
+                    read_word = 0
+                    for mask in masks:
+                        write_many({mosi: bool(write_word & mask), clock: on})
+                        clock.state = off
+                        if miso is not None and miso.state:
+                            read_word |= mask
+                    result.append(read_word)
+            elif not clock_phase:
+                # Read bit on clock activation
+                for write_word in data:
+                    read_word = 0
+                    for mask in masks:
+                        if mosi is not None:
+                            mosi.state = bool(write_word & mask)
+                        clock.state = on
+                        if miso is not None and miso.state:
+                            read_word |= mask
+                        clock.state = off
+                    result.append(read_word)
+            else:
+                # Read bit on clock deactivation
+                for write_word in data:
+                    read_word = 0
+                    for mask in masks:
+                        if mosi is not None:
+                            mosi.state = bool(write_word & mask)
+                        clock.state = on
+                        clock.state = off
+                        if miso is not None and miso.state:
                             read_word |= mask
-                    mask = shift(mask, 1)
-                result.append(read_word)
+                    result.append(read_word)
         return result
@@ -11,11 +11,16 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from math import log, ceil
+from time import monotonic
+from array import array
 from operator import or_
 from functools import reduce
+from threading import Condition
+from collections import namedtuple
 
 from .exc import DeviceClosed, SPIBadChannel, InputDeviceError
 from .devices import Device
+from .threads import GPIOThread
 
 
 class SPIDevice(Device):
@@ -126,8 +131,14 @@ class AnalogInputDevice(SPIDevice):
         if max_voltage <= 0:
             raise InputDeviceError('max_voltage must be positive')
         self._max_voltage = float(max_voltage)
+        self._streams = set()
         super().__init__(shared=True, **spi_args)
 
+    def close(self):
+        for stream in list(getattr(self, '_streams', ())):
+            stream.close()
+        super().close()
+
     @property
     def bits(self):
         """
@@ -138,13 +149,53 @@ class AnalogInputDevice(SPIDevice):
     def _read(self):
         raise NotImplementedError
 
+    def _scale(self, raw):
+        return (2 * (raw - self._min_value) / self._range) - 1
+
+    def _read_samples(self, channels, count):
+        # Return a flat sequence of *count* raw samples of each of *channels*
+        # (interleaved). Descendents that can read several channels, or read
+        # several samples more efficiently, override this
+        if channels is not None:
+            raise InputDeviceError(
+                f'{self.__class__.__name__} cannot read other channels')
+        return [self._read() for i in range(count)]
+
+    def stream(self, rate, channels=None, *, block_size=256, blocks=16):
+        """
+        Start continuously sampling the device at *rate* samples per second
+        in a background thread, returning an :class:`AnalogInputStream` from
+        which the samples can be read in blocks of *block_size*::
+
+            from gpiozero import MCP3008
+
+            adc = MCP3008(0)
+            with adc.stream(10000, channels=[0, 1]) as stream:
+                for timestamps, (ch0, ch1) in stream:
+                    print(max(ch0), max(ch1))
+
+        If *channels* is unspecified, only the device itself is sampled,
+        otherwise each sample reads all the specified channels of the chip
+        (see :meth:`MCP3xxx.read_channels`).
+
+        The stream buffers up to *blocks* blocks of samples which have not
+        yet been read. Where samples are taken faster than they are read,
+        the oldest unread blocks are discarded and counted as
+        :attr:`~AnalogInputStream.overruns`. Closing the device closes any of
+        its streams.
+        """
+        self._check_open()
+        stream = AnalogInputStream(self, rate, channels, block_size, blocks)
+        self._streams.add(stream)
+        return stream
+
     @property
     def value(self):
         """
         The current value read from the device, scaled to a value between 0 and
         1 (or -1 to +1 for certain devices operating in differential mode).
         """
-        return (2 * (self._read() - self._min_value) / self._range) - 1
+        return self._scale(self._read())
 
     @property
     def raw_value(self):
@@ -169,17 +220,224 @@ class AnalogInputDevice(SPIDevice):
         return self.value * self._max_voltage
 
 
+class AnalogInputStream:
+    """
+    A stream of samples taken from an :class:`AnalogInputDevice` at a fixed
+    rate by a background thread. Streams are not constructed directly, but
+    returned by :meth:`AnalogInputDevice.stream`.
+
+    Samples are read from the stream in blocks with :meth:`read`, or by
+    iterating over the stream. Each block is an :class:`AnalogInputBlock`
+    :func:`~collections.namedtuple` of *timestamps* (an :class:`~array.array`
+    of :func:`~time.monotonic` times at which each sample was acquired) and
+    *values* (a tuple with an :class:`~array.array` of the raw values read
+    for each channel).
+
+    Samples are taken in batches when the thread falls behind *rate* (each
+    batch occupying a single SPI transaction where the device supports it),
+    so several consecutive samples may share a timestamp.
+    """
+    def __init__(self, device, rate, channels, block_size, blocks):
+        if rate <= 0:
+            raise InputDeviceError('rate must be positive')
+        if block_size < 1:
+            raise InputDeviceError('block_size must be 1 or greater')
+        if blocks < 2:
+            raise InputDeviceError('blocks must be 2 or greater')
+        if channels is not None:
+            channels = tuple(channels)
+            if not channels:
+                raise InputDeviceError('at least one channel must be specified')
+        # Read one sample up front, so that a device which can't read the
+        # requested channels fails here rather than in the background thread
+        device._read_samples(channels, 1)
+        self._device = device
+        self._rate = float(rate)
+        self._channels = channels
+        self._width = 1 if channels is None else len(channels)
+        self._block_size = block_size
+        self._blocks = blocks
+        # The ring buffer of blocks; signed as some devices (such as the
+        # MCP33xx in differential mode) return negative values
+        self._values = array('i', [0]) * (blocks * block_size * self._width)
+        self._stamps = array('d', [0.0]) * (blocks * block_size)
+        self._cond = Condition()
+        self._head = 0  # the number of blocks written
+        self._tail = 0  # the number of blocks read (or overwritten)
+        self._fill = 0  # the number of samples in the block being written
+        self._taken = 0
+        self._overruns = 0
+        self._error = None
+        self._start = self._last = monotonic()
+        self._thread = GPIOThread(self._sample)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            block = self.read()
+            if block is None:
+                break
+            yield block
+
+    def close(self):
+        """
+        Stop sampling. Blocks already complete may still be read, after which
+        :meth:`read` returns :data:`None`.
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.stop()
+            self._thread = None
+        self._device._streams.discard(self)
+        with self._cond:
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        """
+        Returns :data:`True` once the stream has stopped sampling.
+        """
+        return self._thread is None
+
+    @property
+    def channels(self):
+        """
+        The channels sampled, or :data:`None` if only the device itself is
+        sampled.
+        """
+        return self._channels
+
+    @property
+    def block_size(self):
+        """
+        The number of samples in each block.
+        """
+        return self._block_size
+
+    @property
+    def overruns(self):
+        """
+        The number of samples lost, either because the oldest unread blocks
+        were discarded to make room for new ones, or because the thread fell
+        more than a block behind *rate* and skipped ahead.
+        """
+        return self._overruns
+
+    @property
+    def rate(self):
+        """
+        The sample rate actually achieved (in samples per second) since the
+        stream started.
+        """
+        elapsed = self._last - self._start
+        if elapsed > 0:
+            return self._taken / elapsed
+        return 0.0
+
+    def read(self, timeout=None):
+        """
+        Wait up to *timeout* seconds (indefinitely if this is :data:`None`)
+        for the next complete block of samples and return it. Returns
+        :data:`None` if no block arrived before *timeout*, or if the stream
+        has been closed and all its complete blocks read. If sampling stopped
+        because of an error (for instance, the device was closed), that
+        error is raised instead.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._tail < self._head or self._error is not None or
+                self._thread is None, timeout)
+            if self._tail == self._head:
+                if self._error is not None:
+                    raise self._error
+                return None
+            slot = self._tail % self._blocks
+            self._tail += 1
+            start = slot * self._block_size
+            stop = start + self._block_size
+            width = self._width
+            values = self._values[start * width:stop * width]
+            return AnalogInputBlock(
+                self._stamps[start:stop],
+                tuple(values[channel::width] for channel in range(width)))
+
+    def _sample(self):
+        rate = self._rate
+        size = self._block_size
+        width = self._width
+        scheduled = 0
+        # The thread is held locally as self._thread is cleared if sampling
+        # fails
+        stopping = self._thread.stopping
+        try:
+            while not stopping.is_set():
+                now = monotonic()
+                due = int((now - self._start) * rate) + 1 - scheduled
+                if due < 1:
+                    stopping.wait(
+                        self._start + scheduled / rate - now)
+                    continue
+                if due > size:
+                    # Too far behind to catch up; skip to the latest sample
+                    scheduled += due - 1
+                    with self._cond:
+                        self._overruns += due - 1
+                    due = 1
+                count = min(due, size - self._fill)
+                values = self._device._read_samples(self._channels, count)
+                stamp = monotonic()
+                offset = (self._head % self._blocks) * size + self._fill
+                self._values[offset * width:(offset + count) * width] = array(
+                    'i', values)
+                self._stamps[offset:offset + count] = array('d', [stamp]) * count
+                scheduled += count
+                self._taken += count
+                self._last = stamp
+                self._fill += count
+                if self._fill == size:
+                    self._fill = 0
+                    with self._cond:
+                        self._head += 1
+                        # Keep the slot about to be written free of unread
+                        # samples by discarding the oldest block
+                        if self._head - self._tail >= self._blocks:
+                            self._tail += 1
+                            self._overruns += size
+                        self._cond.notify_all()
+        except Exception as e:
+            # Sampling has stopped for good, so the stream is closed (though
+            # complete blocks may still be read before the error is raised)
+            self._device._streams.discard(self)
+            with self._cond:
+                self._error = e
+                self._thread = None
+                self._cond.notify_all()
+
+
+AnalogInputBlock = namedtuple('AnalogInputBlock', ('timestamps', 'values'))
+
+
 class MCP3xxx(AnalogInputDevice):
     """
     Extends :class:`AnalogInputDevice` to implement an interface for all ADC
     chips with a protocol similar to the Microchip MCP3xxx series of devices.
     """
+    _channel_count = 8
 
     def __init__(self, channel=0, bits=10, differential=False, max_voltage=3.3,
                  **spi_args):
         self._channel = channel
         self._differential = bool(differential)
+        self._frames = {}
+        self._frames_bits = None
         super().__init__(bits, max_voltage, **spi_args)
+        self._decoder = self._decode_table()
 
     @property
     def channel(self):
@@ -205,12 +463,91 @@ class MCP3xxx(AnalogInputDevice):
         """
         return self._differential
 
-    def _read(self):
-        return self._words_to_int(
-            self._spi.transfer(self._send())[-2:], self.bits
-            )
+    def read_channels(self, channels, raw=False):
+        """
+        Read each of *channels* (a sequence of channel numbers) in a single
+        batch of SPI transfers, returning a tuple of the values read in the
+        same order. The chip's select pin is deasserted between each channel,
+        but where the SPI interface supports it (the hardware SPI interface of
+        the local pin factories, or any software SPI interface) the batch is
+        performed as a single operation. This is considerably quicker than
+        reading the :attr:`value` of several devices in turn::
+
+            from gpiozero import MCP3008
+
+            adc = MCP3008()
+            print(adc.read_channels(range(8)))
+
+        Channels are read in the same mode (single-ended or
+        :attr:`differential`) as the device's own channel. If *raw* is
+        :data:`False` (the default), the values are scaled as for
+        :attr:`value`, otherwise they are returned as for :attr:`raw_value`.
+        """
+        channels = tuple(channels)
+        for channel in channels:
+            if not 0 <= channel < self._channel_count:
+                raise SPIBadChannel(
+                    f'channel must be between 0 and {self._channel_count - 1}')
+        self._check_open()
+        result = tuple(
+            self._decode(words)
+            for words in self._spi.transfer_many(
+                [self._frame(channel) for channel in channels]))
+        if raw:
+            return result
+        return tuple(self._scale(value) for value in result)
 
-    def _send(self):
+    def _read(self):
+        tx = self._frame(self._channel)
+        if self._frames_bits == 8:
+            rx = bytearray(len(tx))
+            self._spi.transfer_into(tx, rx)
+            return self._decode_bytes(rx)
+        return self._decode(self._spi.transfer(tx))
+
+    def _frame(self, channel):
+        # Returns the command frame for *channel*; these are fixed for the
+        # device's lifetime, provided the interface's word size doesn't
+        # change, so each is built by _send() only once. Frames of 8-bit
+        # words are stored as bytes for transfer_into
+        bits_per_word = self._spi.bits_per_word
+        if bits_per_word != self._frames_bits:
+            self._frames = {}
+            self._frames_bits = bits_per_word
+        try:
+            return self._frames[channel]
+        except KeyError:
+            frame = self._send(channel)
+            if bits_per_word == 8:
+                frame = bytes(frame)
+            self._frames[channel] = frame
+            return frame
+
+    def _read_samples(self, channels, count):
+        if channels is None:
+            channels = (self.channel,)
+        return self.read_channels(tuple(channels) * count, raw=True)
+
+    def _decode(self, words):
+        if self._spi.bits_per_word == 8:
+            return self._decode_bytes(words)
+        return self._words_to_int(words[-2:], self.bits)
+
+    def _decode_table(self):
+        # Returns the (shift, mask, sign) used to decode the result from the
+        # final two bytes of a reply; the result is the big-endian 16-bit
+        # value of those bytes, shifted right by shift and masked by mask.
+        # If sign is non-zero, it is the sign bit of a two's-complement result
+        return (0, 2 ** self.bits - 1, 0)
+
+    def _decode_bytes(self, data):
+        shift, mask, sign = self._decoder
+        result = (data[-2] << 8 | data[-1]) >> shift & mask
+        if result & sign:
+            result -= sign << 1
+        return result
+
+    def _send(self, channel=None):
         # MCP3004/08 protocol looks like the following:
         #
         #     Byte        0        1        2
@@ -238,13 +575,17 @@ class MCP3xxx(AnalogInputDevice):
         # The 3x01 variant of the chips always operates in differential mode
         # and effectively only has one channel (composed of an IN+ and IN-). As
         # such it requires no input, just output.
+        if channel is None:
+            channel = self.channel
         return self._int_to_words(
-            (0b10000 | (not self.differential) << 3 | self.channel) << (self.bits + 2)
+            (0b10000 | (not self.differential) << 3 | channel) << (self.bits + 2)
             )
 
 
 class MCP3xx2(MCP3xxx):
-    def _send(self):
+    _channel_count = 2
+
+    def _send(self, channel=None):
         # MCP3002 protocol looks like the following:
         #
         #     Byte        0        1
@@ -270,8 +611,10 @@ class MCP3xx2(MCP3xxx):
         #
         # Read-out begins with a null bit (0) followed by the result bits (R).
         # All other bits are don't care (x).
+        if channel is None:
+            channel = self.channel
         return self._int_to_words(
-            (0b1001 | (not self.differential) << 2 | self.channel << 1) << (self.bits + 1)
+            (0b1001 | (not self.differential) << 2 | channel << 1) << (self.bits + 1)
             )
 
 
@@ -306,19 +649,26 @@ class MCP33xx(MCP3xxx):
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         super().__init__(channel, 12, differential, max_voltage, **spi_args)
 
-    def _read(self):
+    def _decode_table(self):
         if self.differential:
-            result = self._words_to_int(
-                self._spi.transfer(self._send())[-2:], self.bits + 1)
+            return (0, 2 ** (self.bits + 1) - 1, 2 ** self.bits)
+        else:
+            return super()._decode_table()
+
+    def _decode(self, words):
+        if self._spi.bits_per_word == 8:
+            return self._decode_bytes(words)
+        elif self.differential:
+            result = self._words_to_int(words[-2:], self.bits + 1)
             # Account for the sign bit
             if result > 4095:
                 return -(8192 - result)
             else:
                 return result
         else:
-            return super()._read()
+            return super()._decode(words)
 
-    def _send(self):
+    def _send(self, channel=None):
         # MCP3302/04 protocol looks like the following:
         #
         #     Byte        0        1        2
@@ -342,8 +692,10 @@ class MCP33xx(MCP3xxx):
         #
         # The MCP3301 variant operates similarly to the other MCP3x01 variants;
         # no input, just output and always differential.
+        if channel is None:
+            channel = self.channel
         return self._int_to_words(
-            (0b10000 | (not self.differential) << 3 | self.channel) << (self.bits + 3)
+            (0b10000 | (not self.differential) << 3 | channel) << (self.bits + 3)
             )
 
     @property
@@ -377,16 +729,26 @@ class MCP3001(MCP30xx):
 
     .. _MCP3001: http://www.farnell.com/datasheets/630400.pdf
     """
+    _channel_count = 1
+
     def __init__(self, max_voltage=3.3, **spi_args):
         super().__init__(0, True, max_voltage, **spi_args)
 
-    def _read(self):
+    def _send(self, channel=None):
+        return [0, 0]
+
+    def _decode_table(self):
         # MCP3001 protocol looks like the following:
         #
         #     Byte        0        1
         #     ==== ======== ========
         #     Rx   xx0RRRRR RRRRRxxx
-        return self._words_to_int(self._spi.read(2), 13) >> 3
+        return (3, 0x3FF, 0)
+
+    def _decode(self, words):
+        if self._spi.bits_per_word == 8:
+            return self._decode_bytes(words)
+        return self._words_to_int(words, 13) >> 3
 
 
 class MCP3002(MCP30xx, MCP3xx2):
@@ -409,6 +771,8 @@ class MCP3004(MCP30xx):
 
     .. _MCP3004: http://www.farnell.com/datasheets/808965.pdf
     """
+    _channel_count = 4
+
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         if not 0 <= channel < 4:
             raise SPIBadChannel('channel must be between 0 and 3')
@@ -436,16 +800,26 @@ class MCP3201(MCP32xx):
 
     .. _MCP3201: http://www.farnell.com/datasheets/1669366.pdf
     """
+    _channel_count = 1
+
     def __init__(self, max_voltage=3.3, **spi_args):
         super().__init__(0, True, max_voltage, **spi_args)
 
-    def _read(self):
+    def _send(self, channel=None):
+        return [0, 0]
+
+    def _decode_table(self):
         # MCP3201 protocol looks like the following:
         #
         #     Byte        0        1
         #     ==== ======== ========
         #     Rx   xx0RRRRR RRRRRRRx
-        return self._words_to_int(self._spi.read(2), 13) >> 1
+        return (1, 0xFFF, 0)
+
+    def _decode(self, words):
+        if self._spi.bits_per_word == 8:
+            return self._decode_bytes(words)
+        return self._words_to_int(words, 13) >> 1
 
 
 class MCP3202(MCP32xx, MCP3xx2):
@@ -468,6 +842,8 @@ class MCP3204(MCP32xx):
 
     .. _MCP3204: http://www.farnell.com/datasheets/808967.pdf
     """
+    _channel_count = 4
+
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         if not 0 <= channel < 4:
             raise SPIBadChannel('channel must be between 0 and 3')
@@ -495,21 +871,21 @@ class MCP3301(MCP33xx):
 
     .. _MCP3301: http://www.farnell.com/datasheets/1669397.pdf
     """
+    _channel_count = 1
+
     def __init__(self, max_voltage=3.3, **spi_args):
         super().__init__(0, True, max_voltage, **spi_args)
 
-    def _read(self):
+    def _send(self, channel=None):
+        return [0, 0]
+
+    def _decode_table(self):
         # MCP3301 protocol looks like the following:
         #
         #     Byte        0        1
         #     ==== ======== ========
         #     Rx   xx0SRRRR RRRRRRRR
-        result = self._words_to_int(self._spi.read(2), 13)
-        # Account for the sign bit
-        if result > 4095:
-            return -(8192 - result)
-        else:
-            return result
+        return (0, 0x1FFF, 0x1000)
 
 
 class MCP3302(MCP33xx):
@@ -522,6 +898,8 @@ class MCP3302(MCP33xx):
 
     .. _MCP3302: http://www.farnell.com/datasheets/1486116.pdf
     """
+    _channel_count = 4
+
     def __init__(self, channel=0, differential=False, max_voltage=3.3, **spi_args):
         if not 0 <= channel < 4:
             raise SPIBadChannel('channel must be between 0 and 4')
@@ -542,3 +920,124 @@ class MCP3304(MCP33xx):
         if not 0 <= channel < 8:
             raise SPIBadChannel('channel must be between 0 and 7')
         super().__init__(channel, differential, max_voltage, **spi_args)
+
+
+class AnalogInputChannels(Device):
+    """
+    Represents several channels of a single :class:`MCP3xxx` analog to digital
+    converter, all of which are read together by
+    :meth:`MCP3xxx.read_channels`. The following code demonstrates reading all
+    eight channels of an MCP3008 chip attached to the Pi's SPI pins::
+
+        from gpiozero import MCP3008, AnalogInputChannels
+
+        adc = AnalogInputChannels(MCP3008)
+        print(adc.value)
+
+    :type adc_class: type
+    :param adc_class:
+        The :class:`MCP3xxx` descendent representing the chip, e.g.
+        :class:`MCP3008`.
+
+    :param channels:
+        The channel numbers to read, in the order their values will appear in
+        :attr:`value`. If unspecified (the default), all channels of the chip
+        are read.
+
+    :param bool differential:
+        If :data:`True`, all channels are read in differential mode. Defaults
+        to :data:`False`.
+
+    :param float max_voltage:
+        The voltage required to set a channel's value to 1. Defaults to 3.3.
+
+    See :ref:`spi_args` for information on the other keyword arguments that
+    can be specified with the constructor.
+    """
+    def __init__(self, adc_class, channels=None, *, differential=False,
+                 max_voltage=3.3, **spi_args):
+        self._adc = None
+        super().__init__(pin_factory=spi_args.get('pin_factory'))
+        if channels is None:
+            channels = range(adc_class._channel_count)
+        self._channels = tuple(channels)
+        if not self._channels:
+            raise InputDeviceError('at least one channel must be specified')
+        for channel in self._channels:
+            if not 0 <= channel < adc_class._channel_count:
+                raise SPIBadChannel(
+                    f'channel must be between 0 and '
+                    f'{adc_class._channel_count - 1}')
+        if adc_class._channel_count == 1:
+            self._adc = adc_class(max_voltage=max_voltage, **spi_args)
+        else:
+            self._adc = adc_class(
+                self._channels[0], differential=differential,
+                max_voltage=max_voltage, **spi_args)
+
+    def close(self):
+        if getattr(self, '_adc', None):
+            self._adc.close()
+            self._adc = None
+        super().close()
+
+    @property
+    def closed(self):
+        return self._adc is None
+
+    def __repr__(self):
+        try:
+            self._check_open()
+            return (
+                f"<gpiozero.{self.__class__.__name__} object reading channels "
+                f"{self._channels!r} of {self._adc!r}>")
+        except DeviceClosed:
+            return f"<gpiozero.{self.__class__.__name__} object closed>"
+
+    @property
+    def adc(self):
+        """
+        The :class:`MCP3xxx` instance used to read the channels.
+        """
+        return self._adc
+
+    @property
+    def channels(self):
+        """
+        The tuple of channel numbers read.
+        """
+        return self._channels
+
+    @property
+    def value(self):
+        """
+        A tuple of the current values of the channels, each scaled as for
+        :attr:`AnalogInputDevice.value`.
+        """
+        self._check_open()
+        return self._adc.read_channels(self._channels)
+
+    @property
+    def raw_value(self):
+        """
+        A tuple of the raw values of the channels as read from the device.
+        """
+        self._check_open()
+        return self._adc.read_channels(self._channels, raw=True)
+
+    @property
+    def is_active(self):
+        """
+        Like composite devices, the channels are considered "active" if any
+        of them reads a non-zero value. The raw values are tested, as the
+        scaled :attr:`value` of a zero reading isn't quite zero.
+        """
+        return any(self.raw_value)
+
+    @property
+    def voltage(self):
+        """
+        A tuple of the current voltages of the channels, each between 0 and
+        the *max_voltage* parameter specified in the constructor.
+        """
+        return tuple(v * self._adc.max_voltage for v in self.value)
@@ -9,7 +9,10 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from threading import Thread, Event
+import sys
+from threading import Thread, Event, Lock
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from .exc import ZombieThread
 
@@ -63,3 +66,133 @@ class GPIOThread(Thread):
                 raise ZombieThread(
                     f"Thread failed to die within {timeout} seconds")
         _THREADS.discard(self)
+
+
+class EventExecutor:
+    """
+    Runs event handlers (such as :attr:`~gpiozero.Button.when_pressed`) on a
+    bounded pool of background threads, rather than on the thread which
+    detected the event (which is usually shared by every pin of a
+    :class:`~gpiozero.Factory`, so a slow handler would otherwise delay the
+    events of every other device).
+
+    An executor can be assigned to :attr:`Factory.event_executor
+    <gpiozero.Factory.event_executor>` to apply to all devices constructed
+    with that factory, or to :attr:`~gpiozero.EventsMixin.event_executor` to
+    apply to an individual device::
+
+        from gpiozero import Button, Device, EventExecutor
+
+        Device.ensure_pin_factory()
+        Device.pin_factory.event_executor = EventExecutor(max_workers=2)
+        btn = Button(4)
+        btn.when_pressed = slow_handler
+
+    Handlers for the same device always run in the order their events
+    occurred, and never concurrently with each other. Handlers for different
+    devices may run concurrently.
+
+    :param int max_workers:
+        The maximum number of threads used to run handlers. Defaults to the
+        default of :class:`~concurrent.futures.ThreadPoolExecutor`.
+
+    :param int max_queue:
+        The maximum number of handlers waiting to run (across all devices).
+        When this is reached, *policy* determines what happens to further
+        events. Defaults to 64.
+
+    :param str policy:
+        What to do with an event when *max_queue* handlers are already
+        waiting. If this is "drop" (the default) the new event's handler is
+        discarded. If this is "coalesce" the *oldest* waiting handler for the
+        same device is discarded instead to make room (so the device's most
+        recent events are the ones run); if no handlers are waiting for that
+        device, the new one is discarded.
+    """
+    def __init__(self, max_workers=None, max_queue=64, policy='drop'):
+        if policy not in ('drop', 'coalesce'):
+            raise ValueError(f'invalid policy {policy!r}')
+        if max_queue < 1:
+            raise ValueError('max_queue must be 1 or greater')
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='gpiozero-events')
+        self._lock = Lock()
+        self._pending = {}
+        self._max_queue = max_queue
+        self._policy = policy
+        self._depth = 0
+        self._dropped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Wait for all queued handlers to complete, then shut down the pool's
+        threads. Further calls to :meth:`submit` will raise
+        :exc:`RuntimeError`.
+        """
+        self._executor.shutdown(wait=True)
+
+    @property
+    def queue_depth(self):
+        """
+        The number of handlers currently waiting to run.
+        """
+        return self._depth
+
+    @property
+    def dropped(self):
+        """
+        The number of handlers that have been discarded because the queue was
+        full.
+        """
+        return self._dropped
+
+    def submit(self, key, handler):
+        """
+        Queue *handler* (a callable accepting no parameters) to run after any
+        handlers previously queued with the same *key* (typically the device
+        which fired the event).
+        """
+        with self._lock:
+            queue = self._pending.get(key)
+            if self._depth >= self._max_queue:
+                self._dropped += 1
+                if self._policy == 'coalesce' and queue:
+                    queue.popleft()
+                    self._depth -= 1
+                else:
+                    return
+            self._depth += 1
+            if queue is None:
+                queue = self._pending[key] = deque((handler,))
+                try:
+                    self._executor.submit(self._run, key, queue)
+                except RuntimeError:
+                    del self._pending[key]
+                    self._depth -= 1
+                    raise
+            else:
+                queue.append(handler)
+
+    def _run(self, key, queue):
+        # Run the handlers queued for key until there are none left; only one
+        # _run is ever active for a given key, guaranteeing the order
+        while True:
+            with self._lock:
+                try:
+                    handler = queue.popleft()
+                except IndexError:
+                    del self._pending[key]
+                    return
+                self._depth -= 1
+            try:
+                handler()
+            except Exception:
+                # Report the failure as an unhandled exception would be, but
+                # keep the worker alive for the remaining handlers
+                sys.excepthook(*sys.exc_info())
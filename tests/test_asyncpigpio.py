@@ -0,0 +1,337 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: A simple interface to GPIO devices with Raspberry Pi
+#
+# Copyright (c) 2026 Ben Nuttall <ben@bennuttall.com>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import struct
+import asyncio
+import pytest
+from time import sleep
+from queue import Queue
+from threading import Thread
+
+from gpiozero import *
+from gpiozero.pins.asyncpigpio import (
+    AsyncPiGPIOFactory,
+    CMD_MODES,
+    CMD_MODEG,
+    CMD_PUD,
+    CMD_READ,
+    CMD_WRITE,
+    CMD_PWM,
+    CMD_PRS,
+    CMD_PFS,
+    CMD_BR1,
+    CMD_BC1,
+    CMD_BS1,
+    CMD_TICK,
+    CMD_HWVER,
+    CMD_NB,
+    CMD_NC,
+    CMD_GDC,
+    CMD_FG,
+    CMD_NOIB,
+)
+
+
+class PiGPIODStandIn:
+    """
+    A minimal stand-in for pigpiod, implementing just enough of its socket
+    protocol (on a local port, in a background thread) to drive
+    AsyncPiGPIOFactory.
+    """
+    def __init__(self, revision=0xa02082):
+        self.revision = revision
+        self.modes = {}
+        self.levels = 0
+        self.pulls = {}
+        self.duty = {}
+        self.frequency = {}
+        self.range = {}
+        self.filters = {}
+        self.commands = []
+        self.notify = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self.serve, '127.0.0.1', 0),
+            self.loop).result()
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def close(self):
+        self.server.close()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    def set_level(self, gpio, level, tick=0):
+        # Simulate an external change of a pin's level
+        def change():
+            if level:
+                self.levels |= 1 << gpio
+            else:
+                self.levels &= ~(1 << gpio)
+            self.report(tick)
+        self.loop.call_soon_threadsafe(change)
+
+    def report(self, tick=0):
+        for handle, (writer, bits) in self.notify.items():
+            if bits:
+                writer.write(struct.pack('=HHII', 0, 0, tick, self.levels))
+
+    async def serve(self, reader, writer):
+        try:
+            while True:
+                cmd, p1, p2, p3 = struct.unpack(
+                    '=IIII', await reader.readexactly(16))
+                if p3:
+                    await reader.readexactly(p3)
+                self.commands.append(cmd)
+                if cmd == CMD_NOIB:
+                    handle = len(self.notify)
+                    self.notify[handle] = (writer, 0)
+                    writer.write(struct.pack('=IIIi', cmd, p1, p2, handle))
+                    # The connection is now a notification stream
+                    await reader.read()
+                    return
+                result = self.execute(cmd, p1, p2)
+                writer.write(struct.pack('=IIII', cmd, p1, p2, result & 0xFFFFFFFF))
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    def execute(self, cmd, p1, p2):
+        if cmd == CMD_HWVER:
+            return self.revision
+        elif cmd == CMD_TICK:
+            return 123456
+        elif cmd == CMD_MODES:
+            self.modes[p1] = p2
+        elif cmd == CMD_MODEG:
+            return self.modes.get(p1, 0)
+        elif cmd == CMD_PUD:
+            self.pulls[p1] = p2
+        elif cmd == CMD_FG:
+            self.filters[p1] = p2
+        elif cmd == CMD_READ:
+            return (self.levels >> p1) & 1
+        elif cmd == CMD_WRITE:
+            if p1 in self.duty:
+                del self.duty[p1]
+            self.modes[p1] = 1
+            self.set_bits(1 << p1, p2)
+        elif cmd == CMD_BR1:
+            return self.levels
+        elif cmd == CMD_BS1:
+            self.set_bits(p1, True)
+        elif cmd == CMD_BC1:
+            self.set_bits(p1, False)
+        elif cmd == CMD_PFS:
+            self.frequency[p1] = p2
+            return p2
+        elif cmd == CMD_PRS:
+            self.range[p1] = p2
+            return p2
+        elif cmd == CMD_PWM:
+            if p2 > self.range.get(p1, 255):
+                return -8  # PI_BAD_DUTYCYCLE
+            self.duty[p1] = p2
+        elif cmd == CMD_GDC:
+            return self.duty.get(p1, 0)
+        elif cmd == CMD_NB:
+            writer, bits = self.notify[p1]
+            self.notify[p1] = (writer, p2)
+        elif cmd == CMD_NC:
+            writer, bits = self.notify.pop(p1)
+            writer.close()
+        else:
+            return -41  # PI_BAD_PARAM
+        return 0
+
+    def set_bits(self, bits, value):
+        if value:
+            self.levels |= bits
+        else:
+            self.levels &= ~bits
+        self.report()
+
+
+@pytest.fixture()
+def daemon():
+    daemon = PiGPIODStandIn()
+    try:
+        yield daemon
+    finally:
+        daemon.close()
+
+
+@pytest.fixture()
+def factory(daemon):
+    save_factory = Device.pin_factory
+    Device.pin_factory = AsyncPiGPIOFactory('127.0.0.1', daemon.port)
+    try:
+        yield Device.pin_factory
+    finally:
+        Device.pin_factory.close()
+        Device.pin_factory = save_factory
+
+
+def test_connect_failure(daemon):
+    port = daemon.port
+    daemon.close()
+    with pytest.raises(IOError):
+        AsyncPiGPIOFactory('127.0.0.1', port)
+
+
+def test_board_info(factory):
+    assert factory.board_info.revision == 'a02082'
+    assert factory.ticks() == 123456
+    assert factory.ticks_diff(5, 0xFFFFFFFF) == 6 / 1000000
+
+
+def test_pin_function_state(factory, daemon):
+    pin = factory.pin(17)
+    assert pin.function == 'input'
+    assert daemon.pulls[17] == 0
+    assert not pin.state
+    daemon.set_level(17, 1)
+    pin.pull = 'up'
+    assert daemon.pulls[17] == 2
+    assert pin.state
+    with pytest.raises(PinSetInput):
+        pin.state = 0
+    with pytest.raises(PinInvalidFunction):
+        pin.function = 'foo'
+    with pytest.raises(PinInvalidPull):
+        pin.pull = 'foo'
+    pin.function = 'output'
+    assert daemon.modes[17] == 1
+    with pytest.raises(PinFixedPull):
+        pin.pull = 'up'
+    pin.state = 0
+    assert not daemon.levels & (1 << 17)
+    pin.bounce = 0.01
+    assert pin.bounce == 0.01
+    assert daemon.filters[17] == 10000
+
+
+def test_pin_pwm(factory, daemon):
+    pin = factory.pin(18)
+    with pytest.raises(PinPWMFixedValue):
+        pin.frequency = 100
+    pin.function = 'output'
+    pin.frequency = 100
+    assert pin.frequency == 100
+    assert daemon.range[18] == 10000
+    pin.state = 0.5
+    assert daemon.duty[18] == 5000
+    assert pin.state == 0.5
+    with pytest.raises(PinInvalidState):
+        pin.state = 2
+    pin.frequency = None
+    assert pin.frequency is None
+    assert not pin.state
+
+
+def test_devices(factory, daemon):
+    with LEDBoard(2, 3, 4, pwm=False) as board:
+        daemon.commands.clear()
+        board.value = (1, 0, 1)
+        assert daemon.commands == [CMD_BS1, CMD_BC1]
+        assert daemon.levels & 0b11100 == 0b10100
+        daemon.commands.clear()
+        assert board.value == (1, 0, 1)
+        assert daemon.commands == [CMD_BR1]
+    with PWMLED(12) as led:
+        led.value = 0.25
+        assert daemon.duty[12] == 2500
+        assert led.value == 0.25
+
+
+def test_when_changed(factory, daemon):
+    pin = factory.pin(4)
+    events = Queue()
+    def changed(ticks, state):
+        events.put((ticks, state))
+    pin.when_changed = changed
+    daemon.set_level(4, 1, tick=100)
+    assert events.get(timeout=1) == (100, True)
+    daemon.set_level(5, 1, tick=200)
+    daemon.set_level(4, 0, tick=300)
+    assert events.get(timeout=1) == (300, False)
+    pin.edges = 'rising'
+    daemon.set_level(4, 1, tick=400)
+    daemon.set_level(4, 0, tick=500)
+    assert events.get(timeout=1) == (400, True)
+    assert events.empty()
+    pin.when_changed = None
+    daemon.set_level(4, 1, tick=600)
+
+
+def test_button_handler_uses_sync_interface(factory, daemon):
+    with Button(4, pull_up=False) as btn, LED(17) as led:
+        btn.when_pressed = led.on
+        daemon.set_level(4, 1)
+        for i in range(100):
+            if led.is_active:
+                break
+            sleep(0.01)
+        assert led.is_active
+        assert daemon.levels & (1 << 17)
+
+
+def test_pipelining(factory):
+    pins = [factory.pin(n) for n in (17, 18, 27, 22)]
+
+    async def issue():
+        conn = factory.connection
+        futures = [conn.command(CMD_READ, pin._number) for pin in pins]
+        pending = conn.pending
+        await asyncio.gather(*futures)
+        return pending
+
+    assert asyncio.run_coroutine_threadsafe(
+        issue(), factory.loop).result() == 4
+
+
+def test_async_interface(factory, daemon):
+    pins = [factory.pin(n) for n in (17, 18, 27, 22)]
+
+    async def main():
+        for pin in pins:
+            await pin.set_function_async('output')
+        await asyncio.gather(*(pin.set_state_async(1) for pin in pins))
+        states = await asyncio.gather(*(pin.get_state_async() for pin in pins))
+        await factory.write_many_async({pins[0]: 0, pins[1]: 0})
+        return (
+            states,
+            await pins[0].get_function_async(),
+            await factory.read_many_async(pins),
+        )
+
+    states, function, many = asyncio.run(main())
+    assert states == [True, True, True, True]
+    assert function == 'output'
+    assert many == (False, False, True, True)
+
+
+def test_sync_interface_in_loop(factory):
+    pin = factory.pin(17)
+
+    async def misuse():
+        return pin.state
+
+    with pytest.raises(RuntimeError):
+        asyncio.run_coroutine_threadsafe(misuse(), factory.loop).result()
+
+
+def test_command_error(factory):
+    async def bad():
+        return await factory.connection.command(255)
+
+    with pytest.raises(IOError):
+        asyncio.run_coroutine_threadsafe(bad(), factory.loop).result()
@@ -99,6 +99,53 @@ def test_button_board_pressed_released(mock_factory):
         assert board.value == (True, False, False)
         assert board.is_active
 
+def test_button_board_read_many(mock_factory):
+    pin1 = mock_factory.pin(4)
+    pin2 = mock_factory.pin(5)
+    pin3 = mock_factory.pin(6)
+    with ButtonBoard(4, 5, foo=6) as board:
+        pin2.drive_low()
+        with mock.patch.object(
+                mock_factory, 'read_many',
+                wraps=mock_factory.read_many) as read_many:
+            assert board.value == (False, True, False)
+            read_many.assert_called_once_with([pin1, pin2, pin3])
+
+def test_composite_device_read_many_mixed(mock_factory, pwm):
+    with CompositeDevice(Button(2), PWMLED(3), LED(4)) as device:
+        device[1].value = 0.5
+        device[2].on()
+        with mock.patch.object(
+                mock_factory, 'read_many',
+                wraps=mock_factory.read_many) as read_many:
+            assert device.value == (False, 0.5, True)
+            read_many.assert_called_once_with(
+                [mock_factory.pin(2), mock_factory.pin(4)])
+
+def test_composite_device_read_many_overridden_value(mock_factory):
+    class InvertedLED(LED):
+        @property
+        def value(self):
+            return 1 - super().value
+
+    class ReDeclaredLED(InvertedLED):
+        _read_pin_state = True
+
+        @property
+        def value(self):
+            return LED.value.fget(self)
+
+    with CompositeDevice(LED(2), InvertedLED(3), ReDeclaredLED(4)) as device:
+        device[0].on()
+        with mock.patch.object(
+                mock_factory, 'read_many',
+                wraps=mock_factory.read_many) as read_many:
+            # Descendents overriding value are read through it, unless they
+            # re-declare that their value is their pin's state
+            assert device.value == (1, 1, 0)
+            read_many.assert_called_once_with(
+                [mock_factory.pin(2), mock_factory.pin(4)])
+
 def test_button_board_when_pressed(mock_factory):
     pin1 = mock_factory.pin(4)
     pin2 = mock_factory.pin(5)
@@ -261,6 +308,63 @@ def test_led_board_value(mock_factory):
         board.value = (1, 0, 1)
         assert board.value == (1, 0, 1)
 
+def test_led_board_write_many(mock_factory):
+    pin1 = mock_factory.pin(2)
+    pin2 = mock_factory.pin(3)
+    pin3 = mock_factory.pin(4)
+    with LEDBoard(2, 3, foo=4, active_high=False) as board:
+        with mock.patch.object(
+                mock_factory, 'write_many',
+                wraps=mock_factory.write_many) as write_many:
+            board.value = (1, 0, 1)
+            write_many.assert_called_once_with(
+                {pin1: False, pin2: True, pin3: False})
+            write_many.reset_mock()
+            board.on()
+            write_many.assert_called_once_with(
+                {pin1: False, pin2: False, pin3: False})
+            assert board.value == (1, 1, 1)
+
+def test_led_board_write_many_closed(mock_factory):
+    with LEDBoard(2, 3, 4) as board:
+        board[1].close()
+        # Closed members aren't silently skipped by the batched write
+        with pytest.raises(DeviceClosed):
+            board.value = (1, 1, 1)
+        with pytest.raises(DeviceClosed):
+            board.on()
+        with pytest.raises(DeviceClosed):
+            board.off()
+
+def test_led_board_write_many_overridden_value(mock_factory):
+    class InvertedLED(LED):
+        def _write(self, value):
+            super()._write(not value)
+
+    class ReDeclaredLED(InvertedLED):
+        _write_pin_state = True
+
+        def _write(self, value):
+            LED._write(self, value)
+
+    with CompositeOutputDevice(
+            LED(2), InvertedLED(3), ReDeclaredLED(4)) as board:
+        with mock.patch.object(
+                mock_factory, 'write_many',
+                wraps=mock_factory.write_many) as write_many:
+            # Descendents overriding how values are written are written
+            # through their own methods, unless they re-declare that writing
+            # a value sets their pin's state
+            board.value = (1, 1, 1)
+            write_many.assert_called_once_with(
+                {mock_factory.pin(2): True, mock_factory.pin(4): True})
+            assert board.value == (1, 0, 1)
+            write_many.reset_mock()
+            board.off()
+            write_many.assert_called_once_with(
+                {mock_factory.pin(2): False, mock_factory.pin(4): False})
+            assert board.value == (0, 1, 0)
+
 def test_led_board_pwm_value(mock_factory, pwm):
     pin1 = mock_factory.pin(2)
     pin2 = mock_factory.pin(3)
@@ -0,0 +1,84 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: A simple interface to GPIO devices with Raspberry Pi
+#
+# Copyright (c) 2026 Ben Nuttall <ben@bennuttall.com>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import sys
+import pytest
+import subprocess
+
+import gpiozero
+
+
+def imported_modules(statement):
+    # Run statement in a fresh interpreter, returning the set of modules it
+    # loaded
+    result = subprocess.run([
+        sys.executable, '-c',
+        f'{statement}; import sys; print(*sys.modules)'
+    ], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def import_times(statement):
+    # Run statement in a fresh interpreter under -X importtime, returning a
+    # dict mapping each module it reported to its cumulative import time (in
+    # microseconds)
+    result = subprocess.run([
+        sys.executable, '-X', 'importtime', '-c', statement
+    ], capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:'):
+            self_us, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_lazy():
+    modules = imported_modules('import gpiozero')
+    assert 'gpiozero.devices' in modules
+    for name in (
+        'gpiozero.input_devices', 'gpiozero.output_devices',
+        'gpiozero.spi_devices', 'gpiozero.boards',
+        'gpiozero.internal_devices', 'gpiozero.fonts', 'gpiozero.tones',
+        'gpiozero.pins.pi', 'gpiozero.pins.data', 'gpiozero.pins.local',
+        'gpiozero.pins.native', 'gpiozero.pins.pigpio', 'gpiozero.pins.lgpio',
+        'gpiozero.pins.rpigpio', 'colorzero', 'pigpio', 'lgpio', 'RPi',
+        'spidev',
+    ):
+        assert name not in modules
+
+
+def test_import_single_device():
+    modules = imported_modules('from gpiozero import OutputDevice')
+    assert 'gpiozero.output_devices' in modules
+    for name in (
+        'gpiozero.input_devices', 'gpiozero.spi_devices', 'gpiozero.boards',
+        'gpiozero.internal_devices', 'gpiozero.fonts', 'gpiozero.pins.data',
+        'gpiozero.pins.pigpio', 'pigpio', 'lgpio', 'RPi', 'spidev',
+    ):
+        assert name not in modules
+
+
+def test_lazy_names():
+    assert gpiozero.LED is gpiozero.output_devices.LED
+    assert gpiozero.pi_info is gpiozero.pins.pi.pi_info
+    assert 'ButtonBoard' in dir(gpiozero)
+    assert set(gpiozero.__all__) >= {'Device', 'LED', 'MCP3008', 'BadEventHandler'}
+    with pytest.raises(AttributeError):
+        gpiozero.NoSuchDevice
+
+
+def test_import_time_single_device():
+    times = import_times('from gpiozero import OutputDevice')
+    assert 'gpiozero.output_devices' in times
+    for name in (
+        'gpiozero.input_devices', 'gpiozero.spi_devices', 'gpiozero.boards',
+        'gpiozero.pins.pigpio', 'pigpio', 'lgpio', 'RPi', 'spidev',
+    ):
+        assert name not in times
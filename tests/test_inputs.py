@@ -10,6 +10,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import sys
+import types
 import pytest
 import warnings
 from time import sleep
@@ -321,6 +322,22 @@ def test_input_distance_sensor_edge_cases(mock_factory):
         else:
             assert False
 
+@pytest.mark.filterwarnings('ignore::gpiozero.exc.PWMSoftwareFallback')
+def test_input_distance_sensor_pigpio_import(mock_factory, monkeypatch):
+    from gpiozero import input_devices
+    mock_factory.pin(5, pin_class=MockTriggerPin, echo_pin=mock_factory.pin(4))
+    monkeypatch.setattr(
+        input_devices, '_PiGPIOFactory', input_devices._NOT_IMPORTED)
+    monkeypatch.setitem(sys.modules, 'gpiozero.pins.pigpio', None)
+    with DistanceSensor(4, 5, queue_len=5):
+        assert input_devices._PiGPIOFactory is None
+    # The failed import isn't attempted again, even if it would now succeed
+    monkeypatch.setitem(
+        sys.modules, 'gpiozero.pins.pigpio',
+        types.SimpleNamespace(PiGPIOFactory=type(mock_factory)))
+    with DistanceSensor(4, 5, queue_len=5):
+        assert input_devices._PiGPIOFactory is None
+
 def rotate_cw(a_pin, b_pin):
     a_pin.drive_low()
     b_pin.drive_low()
@@ -0,0 +1,354 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: A simple interface to GPIO devices with Raspberry Pi
+#
+# Copyright (c) 2026 Ben Nuttall <ben@bennuttall.com>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import sys
+import types
+import pytest
+from importlib import import_module
+
+from gpiozero import *
+
+
+class FakeLGPIO(types.ModuleType):
+    """
+    A minimal stand-in for the lgpio module, recording the calls made to it
+    and tracking just enough gpiochip state (line modes, levels, and groups)
+    to drive LGPIOFactory.
+    """
+    class error(Exception):
+        pass
+
+    SET_PULL_NONE = 0x80
+    SET_PULL_UP = 0x20
+    SET_PULL_DOWN = 0x40
+    BOTH_EDGES = 3
+    RISING_EDGE = 1
+    FALLING_EDGE = 2
+    TX_PWM = 0
+
+    IS_OUT = 1 << 1
+    IS_LG_INPUT = 1 << 8
+    IS_LG_OUTPUT = 1 << 9
+    IS_LG_GROUP = 1 << 11
+
+    def __init__(self):
+        super().__init__('lgpio')
+        self.calls = []
+        self.modes = {}
+        self.levels = {}
+        self.groups = {}
+        self.pulsing = set()
+
+    def _record(self, name, *args):
+        self.calls.append((name,) + args)
+
+    def _claim(self, gpio, mode):
+        for leader, gpios in self.groups.items():
+            if gpio in gpios:
+                raise self.error(f'GPIO {gpio} is in the group of {leader}')
+        self.modes[gpio] = mode
+
+    def gpiochip_open(self, chip):
+        return 1
+
+    def gpiochip_close(self, handle):
+        pass
+
+    def gpio_claim_input(self, handle, gpio, flags=0):
+        self._record('gpio_claim_input', gpio)
+        self._claim(gpio, self.IS_LG_INPUT)
+
+    def gpio_claim_output(self, handle, gpio, level=0, flags=0):
+        self._record('gpio_claim_output', gpio, level)
+        self._claim(gpio, self.IS_OUT | self.IS_LG_OUTPUT)
+        self.levels[gpio] = level
+
+    def gpio_claim_alert(self, handle, gpio, edges, flags=0):
+        self._record('gpio_claim_alert', gpio)
+        self._claim(gpio, self.IS_LG_INPUT)
+
+    def gpio_free(self, handle, gpio):
+        self._record('gpio_free', gpio)
+        self.modes.pop(gpio, None)
+
+    def gpio_get_mode(self, handle, gpio):
+        return self.modes.get(gpio, 0)
+
+    def gpio_read(self, handle, gpio):
+        return self.levels.get(gpio, 0)
+
+    def gpio_write(self, handle, gpio, level):
+        self._record('gpio_write', gpio, int(level))
+        self.levels[gpio] = int(level)
+
+    def group_claim_output(self, handle, gpios, levels=(0,), flags=0):
+        self._record('group_claim_output', list(gpios), list(levels))
+        for gpio in gpios:
+            if gpio in self.modes:
+                raise self.error(f'GPIO {gpio} is busy')
+        self.groups[gpios[0]] = list(gpios)
+        for gpio, level in zip(gpios, levels):
+            self.modes[gpio] = self.IS_OUT | self.IS_LG_OUTPUT | self.IS_LG_GROUP
+            self.levels[gpio] = level
+
+    def group_free(self, handle, gpio):
+        self._record('group_free', gpio)
+        for gpio in self.groups.pop(gpio):
+            del self.modes[gpio]
+
+    def group_write(self, handle, gpio, bits, mask=0xffffffff):
+        self._record('group_write', gpio, bits, mask)
+        for index, member in enumerate(self.groups[gpio]):
+            if mask & (1 << index):
+                self.levels[member] = (bits >> index) & 1
+
+    def group_read(self, handle, gpio):
+        self._record('group_read', gpio)
+        gpios = self.groups[gpio]
+        return len(gpios), sum(
+            self.levels[member] << index for index, member in enumerate(gpios))
+
+    def tx_pulse(self, handle, gpio, on, off, offset=0, cycles=0):
+        self._record('tx_pulse', gpio, on, off, offset, cycles)
+        if on or off:
+            self.pulsing.add(gpio)
+        else:
+            self.pulsing.discard(gpio)
+
+    def tx_busy(self, handle, gpio, kind):
+        return int(gpio in self.pulsing)
+
+    def tx_pwm(self, handle, gpio, frequency, duty, offset=0, cycles=0):
+        self._record('tx_pwm', gpio, frequency, duty)
+
+
+@pytest.fixture()
+def lgpio(monkeypatch):
+    fake = FakeLGPIO()
+    monkeypatch.setitem(sys.modules, 'lgpio', fake)
+    monkeypatch.delitem(sys.modules, 'gpiozero.pins.lgpio', raising=False)
+    yield fake
+    # Don't leave the module built on the fake behind for other tests
+    sys.modules.pop('gpiozero.pins.lgpio', None)
+
+
+@pytest.fixture()
+def lgpio_factory(request, lgpio, monkeypatch):
+    module = import_module('gpiozero.pins.lgpio')
+    monkeypatch.setattr(
+        module.LGPIOFactory, '_get_revision', lambda self: 0xa02082)
+    save_factory = Device.pin_factory
+    Device.pin_factory = module.LGPIOFactory(chip=0)
+    try:
+        yield Device.pin_factory
+    finally:
+        Device.pin_factory.close()
+        Device.pin_factory = save_factory
+
+
+def test_lgpio_output_sequence(lgpio, lgpio_factory):
+    with DigitalOutputDevice(17) as device:
+        device.blink(0.1, 0.2, n=3)
+        assert lgpio.calls[-1] == ('tx_pulse', 17, 100000, 200000, 0, 3)
+        assert device._blink_thread.busy
+        device.off()
+        assert lgpio.calls[-2] == ('tx_pulse', 17, 0, 0, 0, 0)
+        assert device._blink_thread is None
+        # lgpio takes a count of 0 to mean "forever"
+        device.blink(0.5, 0.5)
+        assert lgpio.calls[-1] == ('tx_pulse', 17, 500000, 500000, 0, 0)
+        # A blink of no repeats falls back to the (immediately finished)
+        # thread, which only has to stop the prior pulses
+        device.blink(0.5, 0.5, n=0, background=False)
+        assert lgpio.calls[-1] == ('tx_pulse', 17, 0, 0, 0, 0)
+        assert not lgpio.pulsing
+
+
+def test_lgpio_output_sequence_set_state(lgpio, lgpio_factory):
+    pin = lgpio_factory.pin(17)
+    pin.function = 'output'
+    pulse = pin.output_sequence([(True, 0.1), (False, 0.1)])
+    assert pin._pulse is pulse
+    # Setting the state directly cancels the pulses before writing it
+    pin.state = True
+    assert lgpio.calls[-2:] == [
+        ('tx_pulse', 17, 0, 0, 0, 0), ('gpio_write', 17, 1)]
+    assert not lgpio.pulsing
+    assert pin._pulse is None
+    del lgpio.calls[:]
+    pin.state = False
+    assert lgpio.calls == [('gpio_write', 17, 0)]
+    # As does starting PWM
+    pin.output_sequence([(True, 0.1), (False, 0.1)], 5)
+    pin.frequency = 100
+    assert lgpio.calls[-2:] == [
+        ('tx_pulse', 17, 0, 0, 0, 0), ('tx_pwm', 17, 100, 0)]
+    assert not lgpio.pulsing
+    # Stopping a pulse that has been superseded leaves its successor alone
+    pin.frequency = None
+    first = pin.output_sequence([(True, 0.1), (False, 0.1)])
+    first.stop()
+    second = pin.output_sequence([(True, 0.1), (False, 0.1)])
+    del lgpio.calls[:]
+    first.stop()
+    assert pin._pulse is second
+    assert not lgpio.calls and lgpio.pulsing == {17}
+    second.stop()
+    assert pin._pulse is None
+
+
+def test_lgpio_output_sequence_rejects(lgpio, lgpio_factory):
+    pin = lgpio_factory.pin(17)
+    pin.function = 'output'
+    assert pin.output_sequence([(True, 0.1), (False, 0.1)], 0) is None
+    assert pin.output_sequence([(True, 0.1), (False, 0.1), (True, 0.1)]) is None
+    assert pin.output_sequence([(False, 0.1), (True, 0.1)]) is None
+    assert pin.output_sequence([(True, 0), (False, 0.1)]) is None
+    pin.frequency = 100
+    assert pin.output_sequence([(True, 0.1), (False, 0.1)]) is None
+    pin.frequency = None
+    pin.function = 'input'
+    assert pin.output_sequence([(True, 0.1), (False, 0.1)]) is None
+    assert not lgpio.pulsing
+
+
+def test_lgpio_pulse_join(lgpio, lgpio_factory):
+    pin = lgpio_factory.pin(17)
+    pin.function = 'output'
+    pulse = pin.output_sequence([(True, 0.01), (False, 0.01)], 2)
+    assert pulse.busy
+    with pytest.raises(ZombieThread):
+        pulse.join(0.05)
+    lgpio.pulsing.clear()
+    assert not pulse.busy
+    pulse.join(1)
+
+
+def test_lgpio_write_many_group(lgpio, lgpio_factory):
+    pins = [lgpio_factory.pin(n) for n in (4, 17, 22)]
+    for pin in pins:
+        pin.function = 'output'
+    pins[1].state = True
+    del lgpio.calls[:]
+    # Writing several outputs together claims them as a group, at their
+    # current levels, and writes them with one call
+    lgpio_factory.write_many({pins[0]: True, pins[1]: False, pins[2]: True})
+    assert lgpio.calls == [
+        ('gpio_free', 4), ('gpio_free', 17), ('gpio_free', 22),
+        ('group_claim_output', [4, 17, 22], [0, 1, 0]),
+        ('group_write', 4, 0b101, 0b111),
+    ]
+    assert lgpio_factory._groups == {4: pins}
+    assert [pin._group for pin in pins] == [4, 4, 4]
+    assert [pin.state for pin in pins] == [True, False, True]
+    assert [pin.function for pin in pins] == ['output'] * 3
+    # The group is re-used for later writes of its pins (or some of them),
+    # including writes of individual pins
+    del lgpio.calls[:]
+    lgpio_factory.write_many({pins[2]: False, pins[1]: True})
+    pins[0].state = False
+    lgpio_factory.write_many({pins[0]: True})
+    assert lgpio.calls == [
+        ('group_write', 4, 0b010, 0b110),
+        ('group_write', 4, 0b000, 0b001),
+        ('group_write', 4, 0b001, 0b001),
+    ]
+    assert [pin.state for pin in pins] == [True, True, False]
+
+
+def test_lgpio_write_many_ungroup(lgpio, lgpio_factory):
+    pins = [lgpio_factory.pin(n) for n in (4, 17, 22)]
+    for pin in pins:
+        pin.function = 'output'
+    lgpio_factory.write_many({pins[0]: True, pins[1]: True, pins[2]: False})
+    del lgpio.calls[:]
+    # Re-configuring a pin frees the group, re-claiming its pins as
+    # individual outputs at their current levels
+    pins[2].function = 'input'
+    assert lgpio.calls == [
+        ('group_free', 4),
+        ('gpio_claim_output', 4, 1),
+        ('gpio_claim_output', 17, 1),
+        ('gpio_claim_output', 22, 0),
+        ('gpio_claim_input', 22),
+    ]
+    assert lgpio_factory._groups == {}
+    assert [pin._group for pin in pins] == [None, None, None]
+    assert [pin.state for pin in pins] == [True, True, False]
+    # As does starting PWM on a pin
+    lgpio_factory.write_many({pins[0]: False, pins[1]: True})
+    assert lgpio_factory._groups == {4: pins[:2]}
+    pins[1].frequency = 100
+    assert lgpio_factory._groups == {}
+    assert lgpio.calls[-1] == ('tx_pwm', 17, 100, 0)
+    # Or closing it
+    pins[1].frequency = None
+    lgpio_factory.write_many({pins[0]: False, pins[1]: True})
+    assert lgpio_factory._groups == {4: pins[:2]}
+    pins[0].close()
+    assert lgpio_factory._groups == {}
+    assert ('group_free', 4) in lgpio.calls
+
+
+def test_lgpio_write_many_fallback(lgpio, lgpio_factory, monkeypatch):
+    pins = [lgpio_factory.pin(n) for n in (4, 17, 22)]
+    for pin in pins:
+        pin.function = 'output'
+    # Pins that aren't all outputs can't be grouped
+    pins[2].function = 'input'
+    del lgpio.calls[:]
+    with pytest.raises(PinSetInput):
+        lgpio_factory.write_many({pins[0]: True, pins[2]: True})
+    assert lgpio.calls == [('gpio_write', 4, 1)]
+    # Nor can pins using PWM; they're written individually
+    pins[1].frequency = 100
+    del lgpio.calls[:]
+    lgpio_factory.write_many({pins[0]: False, pins[1]: 0.5})
+    assert lgpio.calls == [('gpio_write', 4, 0), ('tx_pwm', 17, 100, 50)]
+    pins[1].frequency = None
+    # Nor can pins that belong to different groups (or none)
+    lgpio_factory.write_many({pins[0]: True, pins[1]: True})
+    pins[2].function = 'output'
+    del lgpio.calls[:]
+    lgpio_factory.write_many({pins[1]: False, pins[2]: True})
+    assert lgpio.calls == [('group_write', 4, 0, 0b10), ('gpio_write', 22, 1)]
+    assert lgpio_factory._groups == {4: pins[:2]}
+    # If lgpio refuses the group, the pins are re-claimed individually
+    pins[0].function = 'output'
+    def refuse(handle, gpios, levels, flags=0):
+        raise lgpio.error('GPIO busy')
+    monkeypatch.setattr(lgpio, 'group_claim_output', refuse)
+    del lgpio.calls[:]
+    lgpio_factory.write_many({pins[0]: True, pins[2]: False})
+    assert lgpio.calls == [
+        ('gpio_free', 4), ('gpio_free', 22),
+        ('gpio_claim_output', 4, 0), ('gpio_claim_output', 22, 1),
+        ('gpio_write', 4, 1), ('gpio_write', 22, 0),
+    ]
+    assert [pin._group for pin in pins] == [None, None, None]
+
+
+def test_lgpio_read_many(lgpio, lgpio_factory):
+    pins = [lgpio_factory.pin(n) for n in (4, 17, 22, 27)]
+    for pin in pins[:3]:
+        pin.function = 'output'
+    lgpio.levels[27] = 1
+    # Ungrouped pins are read individually
+    assert lgpio_factory.read_many(pins) == (False, False, False, True)
+    assert 'group_read' not in {call[0] for call in lgpio.calls}
+    # Members of a group are read with a single call
+    lgpio_factory.write_many({pins[0]: True, pins[1]: False, pins[2]: True})
+    del lgpio.calls[:]
+    assert lgpio_factory.read_many(pins) == (True, False, True, True)
+    assert lgpio_factory.read_many(pins[2::-1]) == (True, False, True)
+    assert lgpio.calls == [('group_read', 4), ('group_read', 4)]
+    with LEDBoard(4, 17, 22) as leds:
+        leds.value = (1, 0, 1)
+        del lgpio.calls[:]
+        assert leds.value == (1, 0, 1)
+        assert lgpio.calls == [('group_read', 4)]
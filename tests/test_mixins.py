@@ -131,6 +131,41 @@ def test_callback_with_param(mock_factory):
         assert devices == [dev]
 
 
+def test_callback_executor(mock_factory):
+    pin = mock_factory.pin(4)
+    evt = Event()
+    threads = []
+    def cb():
+        threads.append(threading.current_thread())
+        evt.set()
+    with EventExecutor() as executor:
+        mock_factory.event_executor = executor
+        with DigitalInputDevice(4) as dev:
+            assert dev.event_executor is executor
+            dev.when_activated = cb
+            pin.drive_high()
+            assert evt.wait(1)
+            assert threads[0] is not threading.current_thread()
+            assert threads[0].name.startswith('gpiozero-events')
+
+
+def test_device_callback_executor(mock_factory):
+    pin = mock_factory.pin(4)
+    with EventExecutor() as executor:
+        with DigitalInputDevice(4) as dev:
+            assert dev.event_executor is None
+            dev.event_executor = executor
+            assert dev.event_executor is executor
+            with mock.patch.object(executor, 'submit') as submit:
+                def handler():
+                    pass
+                dev.when_activated = handler
+                pin.drive_high()
+                submit.assert_called_once_with(dev, handler)
+            with pytest.raises(BadEventHandler):
+                dev.event_executor = 1
+
+
 def test_bad_callback(mock_factory):
     pin = mock_factory.pin(4)
     with DigitalInputDevice(4) as dev:
@@ -157,3 +192,29 @@ def test_shared_key(mock_factory):
             pass
         with pytest.raises(GPIOPinInUse):
             GPIODevice(4)
+
+
+def test_event_registry(mock_factory):
+    assert set(Button.__events__) == {
+        Button.when_activated, Button.when_deactivated, Button.when_held}
+    # Aliases (and new events) assigned after the creation of a class, or of
+    # its descendents, are reflected in the registry and the attributes of
+    # new instances
+    class MyButton(Button):
+        pass
+    class MySubButton(MyButton):
+        pass
+    MyButton.when_touched = Button.when_activated
+    MyButton.when_stroked = event()
+    assert 'when_touched' in MySubButton.__class_attrs__
+    assert len(MyButton.__events__) == len(MySubButton.__events__) == 4
+    with MySubButton(4) as btn:
+        fired = Event()
+        btn.when_touched = fired.set
+        mock_factory.pin(4).drive_low()
+        assert fired.wait(1)
+        btn.when_touched = None
+        btn.when_stroked = fired.clear
+        assert btn.when_stroked is not None
+    del MyButton.when_stroked
+    assert len(MySubButton.__events__) == 3
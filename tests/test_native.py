@@ -0,0 +1,294 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: A simple interface to GPIO devices with Raspberry Pi
+#
+# Copyright (c) 2026 Ben Nuttall <ben@bennuttall.com>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import struct
+import pytest
+from time import sleep
+from queue import Queue
+from unittest import mock
+
+from gpiozero.exc import (
+    PinPWMError,
+    PinPWMFixedValue,
+    PinPWMUnsupported,
+    PinInvalidState,
+    PinSetInput,
+)
+
+from gpiozero.pins.native import (
+    GPIOMemory,
+    GPIOPWM,
+    GPIOChip,
+    NativeFactory,
+    NativeWatchThread,
+    NativeDispatchThread,
+)
+
+
+def line_event(timestamp, edge, offset, seqno=1):
+    return GPIOChip.line_event.pack(timestamp, edge, offset, seqno, seqno)
+
+
+def test_chip_struct_sizes():
+    # Sizes must match the structures in linux/gpio.h exactly; the ioctl
+    # numbers encode them
+    assert GPIOChip.chip_info.size == 68
+    assert GPIOChip.line_request.size == 592
+    assert GPIOChip.line_event.size == 48
+    assert GPIOChip.line_config.size == 272
+    assert (GPIOChip.GPIO_V2_GET_LINE_IOCTL >> 16) & 0x3fff == 592
+    assert (GPIOChip.GPIO_V2_LINE_SET_CONFIG_IOCTL >> 16) & 0x3fff == 272
+
+
+def test_watch_thread_decodes_batched_events():
+    queue = Queue()
+    thread = NativeWatchThread(None, queue)
+    r, w = os.pipe()
+    try:
+        thread.watch(r, 'GPIO17')
+        os.write(w, b''.join((
+            line_event(1000000000, GPIOChip.GPIO_V2_LINE_EVENT_RISING_EDGE, 17, 1),
+            line_event(1500000000, GPIOChip.GPIO_V2_LINE_EVENT_FALLING_EDGE, 17, 2),
+            line_event(2250000000, GPIOChip.GPIO_V2_LINE_EVENT_RISING_EDGE, 17, 3),
+        )))
+        assert queue.get(timeout=1) == ('GPIO17', 1.0, True)
+        assert queue.get(timeout=1) == ('GPIO17', 1.5, False)
+        assert queue.get(timeout=1) == ('GPIO17', 2.25, True)
+        thread.unwatch(r)
+    finally:
+        thread.close()
+        os.close(r)
+        os.close(w)
+
+
+def test_watch_thread_filters_bounce():
+    queue = Queue()
+    thread = NativeWatchThread(None, queue)
+    r, w = os.pipe()
+    try:
+        thread.watch(r, 'GPIO17', bounce=0.1)
+        os.write(w, b''.join((
+            line_event(1000000000, GPIOChip.GPIO_V2_LINE_EVENT_RISING_EDGE, 17, 1),
+            line_event(1010000000, GPIOChip.GPIO_V2_LINE_EVENT_FALLING_EDGE, 17, 2),
+            line_event(1050000000, GPIOChip.GPIO_V2_LINE_EVENT_RISING_EDGE, 17, 3),
+            line_event(1500000000, GPIOChip.GPIO_V2_LINE_EVENT_FALLING_EDGE, 17, 4),
+        )))
+        assert queue.get(timeout=1) == ('GPIO17', 1.0, True)
+        assert queue.get(timeout=1) == ('GPIO17', 1.5, False)
+        thread.unwatch(r)
+        assert queue.empty()
+    finally:
+        thread.close()
+        os.close(r)
+        os.close(w)
+
+
+def test_chip_debounce_attribute():
+    num_attrs, attrs = GPIOChip._attrs(0.005)
+    assert num_attrs == 1
+    assert GPIOChip.line_attr.unpack(attrs) == (
+        GPIOChip.GPIO_V2_LINE_ATTR_ID_DEBOUNCE, 0, 5000, 1)
+    assert GPIOChip._attrs(None) == (0, b'')
+
+
+def test_watch_thread_blocks_when_idle():
+    thread = NativeWatchThread(None, Queue())
+    try:
+        sleep(0.1)
+        assert thread.is_alive()
+        assert thread.idle_wakeups == 0
+    finally:
+        thread.close()
+    assert not thread.is_alive()
+    assert thread.idle_wakeups == 0
+
+
+def test_dispatch_thread_blocks_when_idle():
+    queue = Queue()
+    pin = mock.Mock()
+    factory = mock.Mock(pins={'GPIO17': pin})
+    thread = NativeDispatchThread(factory, queue)
+    try:
+        queue.put(('GPIO17', 1.0, True))
+        queue.put(('GPIO18', 1.5, True))
+    finally:
+        thread.close()
+    assert not thread.is_alive()
+    pin._call_when_changed.assert_called_once_with(1.0, True)
+
+
+@pytest.fixture()
+def pwm_sysfs(tmp_path):
+    device = tmp_path / 'devices' / 'fe20c000.pwm'
+    device.mkdir(parents=True)
+    chip = tmp_path / 'pwmchip0'
+    chip.mkdir()
+    (chip / 'device').symlink_to(device)
+    for name in ('export', 'unexport'):
+        (chip / name).write_text('')
+    with mock.patch.object(GPIOPWM, 'PWM_CHIP_PATH', tmp_path):
+        yield chip
+
+
+def test_pwm_export_configure(pwm_sysfs):
+    pwm = GPIOPWM()
+    path = pwm.export('GPIO18', 0, 1)
+    assert path == pwm_sysfs / 'pwm1'
+    assert (pwm_sysfs / 'export').read_text() == '1'
+    path.mkdir()
+    pwm.configure(path, 1000, 0.25)
+    assert (path / 'period').read_text() == '1000000'
+    assert (path / 'duty_cycle').read_text() == '250000'
+    assert (path / 'enable').read_text() == '1'
+    pwm.set_duty(path, 1000, 0.5)
+    assert (path / 'duty_cycle').read_text() == '500000'
+    # The same duty gives the same value whichever writes it, even when the
+    # period is rounded
+    pwm.configure(path, 3, 0.5)
+    configured = (path / 'duty_cycle').read_text()
+    pwm.set_duty(path, 3, 0.5)
+    assert (path / 'duty_cycle').read_text() == configured
+    with pytest.raises(PinPWMError):
+        pwm.export('GPIO12', 0, 1)
+    pwm.unexport(path)
+    assert (path / 'enable').read_text() == '0'
+    assert (pwm_sysfs / 'unexport').read_text() == '1'
+    pwm.close()
+
+
+def test_pwm_missing_controller(pwm_sysfs):
+    pwm = GPIOPWM()
+    with pytest.raises(PinPWMError):
+        pwm.export('GPIO40', 1, 0)
+
+
+def test_memory_register_view(tmp_path):
+    regs = tmp_path / 'gpiomem'
+    regs.write_bytes(bytes(4096))
+    fd = os.open(regs, os.O_RDWR)
+    with mock.patch('os.open', return_value=fd):
+        mem = GPIOMemory('BCM2835')
+    try:
+        mem[GPIOMemory.GPSET_OFFSET] = 1 << 17
+        assert struct.unpack_from(
+            mem.reg_fmt, mem.mem, GPIOMemory.GPSET_OFFSET * 4)[0] == 1 << 17
+        struct.pack_into(
+            mem.reg_fmt, mem.mem, GPIOMemory.GPLEV_OFFSET * 4, 0xffffffff)
+        assert mem[GPIOMemory.GPLEV_OFFSET] == 0xffffffff
+        assert mem.regs[GPIOMemory.GPLEV_OFFSET] == 0xffffffff
+    finally:
+        mem.close()
+
+
+@pytest.fixture()
+def native_factory(tmp_path, monkeypatch):
+    # A compute module, for pins in the second bank, with its register block
+    # faked by a file
+    monkeypatch.setattr(NativeFactory, '_get_revision', lambda self: 0xa020a0)
+    regs = tmp_path / 'gpiomem'
+    regs.write_bytes(bytes(4096))
+    fd = os.open(regs, os.O_RDWR)
+    with mock.patch('os.open', return_value=fd):
+        factory = NativeFactory()
+    try:
+        yield factory
+    finally:
+        factory.close()
+
+
+def test_native_write_many(native_factory):
+    regs = native_factory.mem.regs
+    pins = [native_factory.pin(n) for n in (4, 17, 22, 40, 42)]
+    for pin in pins:
+        pin.function = 'output'
+    native_factory.write_many({
+        pins[0]: True, pins[1]: True, pins[2]: False,
+        pins[3]: True, pins[4]: False})
+    # One GPSET and one GPCLR write for each bank
+    assert regs[GPIOMemory.GPSET_OFFSET] == 1 << 4 | 1 << 17
+    assert regs[GPIOMemory.GPSET_OFFSET + 1] == 1 << (40 - 32)
+    assert regs[GPIOMemory.GPCLR_OFFSET] == 1 << 22
+    assert regs[GPIOMemory.GPCLR_OFFSET + 1] == 1 << (42 - 32)
+
+
+def test_native_write_many_input(native_factory):
+    regs = native_factory.mem.regs
+    output = native_factory.pin(4)
+    output.function = 'output'
+    with pytest.raises(PinSetInput):
+        native_factory.write_many({
+            output: True, native_factory.pin(5): True})
+    # Nothing is written if any of the pins is an input
+    assert regs[GPIOMemory.GPSET_OFFSET] == 0
+
+
+def test_native_write_many_pwm(native_factory, pwm_sysfs):
+    regs = native_factory.mem.regs
+    (pwm_sysfs / 'pwm0').mkdir()
+    output = native_factory.pin(4)
+    output.function = 'output'
+    pwm = native_factory.pin(18)
+    pwm.function = 'output'
+    pwm.frequency = 100
+    native_factory.write_many({output: True, pwm: 0.5})
+    # The PWM pin is set individually, through sysfs
+    assert regs[GPIOMemory.GPSET_OFFSET] == 1 << 4
+    assert (pwm_sysfs / 'pwm0' / 'duty_cycle').read_text() == '5000000'
+    assert pwm.state == 0.5
+
+
+def test_native_read_many(native_factory, pwm_sysfs):
+    regs = native_factory.mem.regs
+    (pwm_sysfs / 'pwm0').mkdir()
+    pins = [native_factory.pin(n) for n in (4, 17, 40, 42)]
+    pwm = native_factory.pin(18)
+    pwm.function = 'output'
+    pwm.frequency = 100
+    pwm.state = 0.25
+    regs[GPIOMemory.GPLEV_OFFSET] = 1 << 17 | 1 << 18
+    regs[GPIOMemory.GPLEV_OFFSET + 1] = 1 << (40 - 32)
+    # The PWM pin reports its duty cycle rather than its level
+    assert native_factory.read_many(pins + [pwm]) == (
+        False, True, True, False, 0.25)
+
+
+def test_native_pin_pwm(native_factory, pwm_sysfs):
+    path = pwm_sysfs / 'pwm0'
+    path.mkdir()
+    pin = native_factory.pin(18)
+    with pytest.raises(PinPWMFixedValue):
+        pin.frequency = 100
+    pin.function = 'output'
+    pin.frequency = 100
+    assert pin.frequency == 100
+    assert pin.function == 'alt5'
+    assert (path / 'period').read_text() == '10000000'
+    assert (path / 'enable').read_text() == '1'
+    pin.state = 0.25
+    assert pin.state == 0.25
+    assert (path / 'duty_cycle').read_text() == '2500000'
+    with pytest.raises(PinInvalidState):
+        pin.state = 1.5
+    # Changing the frequency keeps the duty cycle
+    pin.frequency = 1000
+    assert (path / 'period').read_text() == '1000000'
+    assert (path / 'duty_cycle').read_text() == '250000'
+    pin.frequency = None
+    assert pin.frequency is None
+    assert pin.function == 'output'
+    assert (path / 'enable').read_text() == '0'
+    assert (pwm_sysfs / 'unexport').read_text() == '0'
+
+
+def test_native_pin_pwm_unsupported(native_factory, pwm_sysfs):
+    pin = native_factory.pin(4)
+    pin.function = 'output'
+    with pytest.raises(PinPWMUnsupported):
+        pin.frequency = 100
+    assert pin.frequency is None
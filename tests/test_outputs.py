@@ -10,6 +10,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import sys
+from unittest import mock
 from time import sleep, time
 from math import isclose
 
@@ -140,6 +141,24 @@ def test_output_blink_interrupt_off(mock_factory):
         device.off() # should interrupt while off
         pin.assert_states([False, True, False])
 
+def test_output_blink_output_sequence(mock_factory):
+    pin = mock_factory.pin(4)
+    player = mock.Mock()
+    with mock.patch.object(pin, 'output_sequence', return_value=player):
+        with DigitalOutputDevice(4, active_high=False) as device:
+            device.blink(0.1, 0.2, n=2, background=False)
+            pin.output_sequence.assert_called_once_with(
+                [(False, 0.1), (True, 0.2)], 2)
+            player.join.assert_called_once_with()
+            assert device._blink_thread is None
+            device.blink()
+            assert device._blink_thread is player
+            device.on()
+            player.stop.assert_called_once_with()
+            assert device._blink_thread is None
+    with pytest.raises(DeviceClosed):
+        device.blink()
+
 def test_output_pwm_bad_initial_value(mock_factory):
     with pytest.raises(ValueError):
         PWMOutputDevice(2, initial_value=2)
@@ -390,6 +409,31 @@ def test_output_pwm_blink_interrupt(mock_factory, pwm):
         device.off() # should interrupt while on
         pin.assert_states([0, 1, 0])
 
+def test_output_pwm_blink_output_sequence(mock_factory, pwm):
+    pin = mock_factory.pin(4)
+    player = mock.Mock()
+    with mock.patch.object(pin, 'output_sequence', return_value=player):
+        with PWMOutputDevice(4, active_high=False) as device:
+            device.pulse(0.08, 0.04, n=3, background=False)
+            pin.output_sequence.assert_called_once_with([
+                (1.0, 0.04),
+                (0.5, 0.04),
+                (0.0, 0),
+                (0.0, 0.04),
+                (1.0, 0),
+            ], 3)
+            player.join.assert_called_once_with()
+            assert device._blink_thread is None
+            device.blink()
+            assert device._blink_thread is player
+            device.off()
+            player.stop.assert_called_once_with()
+            assert device._blink_thread is None
+    with pytest.raises(DeviceClosed):
+        device.blink()
+    with pytest.raises(DeviceClosed):
+        device.pulse()
+
 def test_rgbled_missing_pins(mock_factory):
     with pytest.raises(GPIOPinMissing):
         RGBLED()
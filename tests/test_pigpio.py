@@ -0,0 +1,964 @@
+# vim: set fileencoding=utf-8:
+#
+# GPIO Zero: A simple interface to GPIO devices with Raspberry Pi
+#
+# Copyright (c) 2026 Ben Nuttall <ben@bennuttall.com>
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import sys
+import types
+import socket
+import struct
+import pytest
+from queue import Queue
+from threading import Thread, Event
+from collections import namedtuple
+from importlib import import_module
+from time import monotonic, sleep
+
+from gpiozero import *
+
+
+class FakeDaemon:
+    """
+    The state of a fake pigpiod; a "restart" of the daemon is simulated by
+    replacing it with a fresh instance, which kills the connections to the
+    old one.
+    """
+    def __init__(self):
+        self.alive = True
+        self.revision = 0xa02082
+        self.calls = []
+        self.modes = {}
+        self.levels = 0
+        self.pulls = {}
+        self.filters = {}
+        self.pwm = {}
+        self.callbacks = []
+        self.max_pulses = 12000
+        self.pending = []
+        self.waves = {}
+        self.chain = None
+        self.busy = False
+        self.spis = {}
+        self.spi_handles = 0
+        self.bb_spis = {}
+
+
+class FakePi:
+    """
+    A stand-in for pigpio.pi, executing commands against the fake module's
+    current :class:`FakeDaemon`.
+    """
+    FREQUENCIES = (
+        8000, 4000, 2000, 1600, 1000, 800, 500, 400, 320, 250, 200, 160, 100,
+        80, 50, 40, 20, 10)
+
+    def __init__(self, module, host, port):
+        self.sl = types.SimpleNamespace(s=None)
+        if module.refuse:
+            module.refuse -= 1
+            self._daemon = None
+        else:
+            self._daemon = module.daemon
+            self.sl.s = object()
+
+    def stop(self):
+        self.sl.s = None
+
+    def _command(self, name, *args):
+        if self.sl.s is None:
+            raise AttributeError("'NoneType' object has no attribute 'send'")
+        if not self._daemon.alive:
+            raise BrokenPipeError(32, 'Broken pipe')
+        self._daemon.calls.append((name,) + args)
+        return self._daemon
+
+    def get_hardware_revision(self):
+        return self._command('get_hardware_revision').revision
+
+    def get_current_tick(self):
+        self._command('get_current_tick')
+        return int(monotonic() * 1000000) & 0xffffffff
+
+    def set_mode(self, gpio, mode):
+        self._command('set_mode', gpio, mode).modes[gpio] = mode
+
+    def get_mode(self, gpio):
+        return self._command('get_mode', gpio).modes.get(gpio, 0)
+
+    def set_pull_up_down(self, gpio, pud):
+        self._command('set_pull_up_down', gpio, pud).pulls[gpio] = pud
+
+    def set_glitch_filter(self, gpio, steady):
+        self._command('set_glitch_filter', gpio, steady).filters[gpio] = steady
+
+    def read(self, gpio):
+        return (self._command('read', gpio).levels >> gpio) & 1
+
+    def write(self, gpio, level):
+        daemon = self._command('write', gpio, level)
+        daemon.modes[gpio] = 1
+        daemon.pwm.pop(gpio, None)
+        if level:
+            daemon.levels |= 1 << gpio
+        else:
+            daemon.levels &= ~(1 << gpio)
+
+    def read_bank_1(self):
+        return self._command('read_bank_1').levels & 0xffffffff
+
+    def read_bank_2(self):
+        return self._command('read_bank_2').levels >> 32
+
+    def set_bank_1(self, bits):
+        self._command('set_bank_1', bits).levels |= bits
+
+    def clear_bank_1(self, bits):
+        self._command('clear_bank_1', bits).levels &= ~bits
+
+    def set_bank_2(self, bits):
+        self._command('set_bank_2', bits).levels |= bits << 32
+
+    def clear_bank_2(self, bits):
+        self._command('clear_bank_2', bits).levels &= ~(bits << 32)
+
+    def _pwm(self, daemon, gpio):
+        return daemon.pwm.setdefault(gpio, [800, 255, 0])
+
+    def set_PWM_frequency(self, gpio, frequency):
+        daemon = self._command('set_PWM_frequency', gpio, frequency)
+        # The daemon picks the closest frequency it can achieve
+        actual = min(self.FREQUENCIES, key=lambda f: abs(f - frequency))
+        self._pwm(daemon, gpio)[0] = actual
+        return actual
+
+    def set_PWM_range(self, gpio, range_):
+        daemon = self._command('set_PWM_range', gpio, range_)
+        self._pwm(daemon, gpio)[1] = range_
+        return range_
+
+    def set_PWM_dutycycle(self, gpio, duty):
+        daemon = self._command('set_PWM_dutycycle', gpio, duty)
+        daemon.modes[gpio] = 1
+        self._pwm(daemon, gpio)[2] = duty
+
+    def get_PWM_frequency(self, gpio):
+        return self._pwm(self._command('get_PWM_frequency', gpio), gpio)[0]
+
+    def get_PWM_range(self, gpio):
+        return self._pwm(self._command('get_PWM_range', gpio), gpio)[1]
+
+    def get_PWM_dutycycle(self, gpio):
+        return self._pwm(self._command('get_PWM_dutycycle', gpio), gpio)[2]
+
+    def callback(self, gpio, edge, func):
+        daemon = self._command('callback', gpio, edge)
+        cb = FakeCallback(gpio, edge, func)
+        daemon.callbacks.append(cb)
+        return cb
+
+    def notify_begin(self, handle, bits):
+        self._command('notify_begin', handle, bits)
+
+    def notify_close(self, handle):
+        self._command('notify_close', handle)
+
+    def wave_get_max_pulses(self):
+        return self._command('wave_get_max_pulses').max_pulses
+
+    def wave_add_new(self):
+        self._command('wave_add_new').pending = []
+
+    def wave_add_generic(self, pulses):
+        daemon = self._command('wave_add_generic', len(pulses))
+        # Like the real thing, delays must fit the 32-bit field of the
+        # command
+        struct.pack(f'={len(pulses) * 3}I', *(
+            value for pulse in pulses for value in pulse))
+        daemon.pending.append(pulses)
+
+    def wave_create(self):
+        daemon = self._command('wave_create')
+        wid = len(daemon.waves)
+        daemon.waves[wid] = daemon.pending
+        daemon.pending = []
+        return wid
+
+    def wave_chain(self, data):
+        daemon = self._command('wave_chain', list(data))
+        daemon.chain = list(data)
+        daemon.busy = True
+
+    def wave_tx_busy(self):
+        return int(self._command('wave_tx_busy').busy)
+
+    def wave_tx_stop(self):
+        self._command('wave_tx_stop').busy = False
+
+    def wave_delete(self, wid):
+        del self._command('wave_delete', wid).waves[wid]
+
+    def spi_open(self, channel, baud, flags):
+        daemon = self._command('spi_open', channel, baud, flags)
+        handle = daemon.spi_handles
+        daemon.spi_handles += 1
+        daemon.spis[handle] = (channel, baud, flags)
+        return handle
+
+    def spi_close(self, handle):
+        del self._command('spi_close', handle).spis[handle]
+
+    def spi_xfer(self, handle, data):
+        daemon = self._command('spi_xfer', handle, bytes(data))
+        if handle not in daemon.spis:
+            raise FakePigpio.error('bad handle')
+        return len(data), bytearray(data)
+
+    def bb_spi_open(self, cs, miso, mosi, sclk, baud, flags):
+        daemon = self._command('bb_spi_open', cs, miso, mosi, sclk, baud, flags)
+        daemon.bb_spis[cs] = (miso, mosi, sclk, baud, flags)
+
+    def bb_spi_close(self, cs):
+        del self._command('bb_spi_close', cs).bb_spis[cs]
+
+    def bb_spi_xfer(self, cs, data):
+        daemon = self._command('bb_spi_xfer', cs, bytes(data))
+        if cs not in daemon.bb_spis:
+            raise FakePigpio.error('bad cs')
+        return len(data), bytearray(data)
+
+
+class FakeCallback:
+    def __init__(self, gpio, edge, func):
+        self.gpio = gpio
+        self.edge = edge
+        self.func = func
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakePigpio(types.ModuleType):
+    """
+    A minimal stand-in for the pigpio module, whose :class:`pigpio.pi`
+    connections execute commands against an in-memory :class:`FakeDaemon`.
+    """
+    class error(Exception):
+        pass
+
+    INPUT = 0
+    OUTPUT = 1
+    ALT0 = 4
+    ALT1 = 5
+    ALT2 = 6
+    ALT3 = 7
+    ALT4 = 3
+    ALT5 = 2
+    PUD_OFF = 0
+    PUD_DOWN = 1
+    PUD_UP = 2
+    RISING_EDGE = 0
+    FALLING_EDGE = 1
+    EITHER_EDGE = 2
+
+    pulse = namedtuple('pulse', ('gpio_on', 'gpio_off', 'delay'))
+
+    def __init__(self):
+        super().__init__('pigpio')
+        self.daemon = FakeDaemon()
+        # The number of connection attempts to refuse, simulating a daemon
+        # that is not (yet) running
+        self.refuse = 0
+
+    def pi(self, host, port):
+        return FakePi(self, host, port)
+
+    def error_text(self, code):
+        return f'error {code}'
+
+    def restart(self):
+        self.daemon.alive = False
+        self.daemon = FakeDaemon()
+
+
+class NotifyStandIn:
+    """
+    Accepts the notification sockets PiGPIONotifier instances open, answers
+    their NOIB commands (with handles numbered in order of connection), and
+    then lets the test send them reports.
+    """
+    def __init__(self):
+        self.server = socket.create_server(('127.0.0.1', 0))
+        self.port = self.server.getsockname()[1]
+        self.commands = []
+        self.conns = Queue()
+        self.thread = Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, addr = self.server.accept()
+            except OSError:
+                break
+            command = b''
+            while len(command) < 16:
+                command += conn.recv(16 - len(command))
+            handle = len(self.commands)
+            self.commands.append(struct.unpack('=IIII', command))
+            conn.sendall(struct.pack('=IIIi', 99, 0, 0, handle))
+            self.conns.put(conn)
+
+    def close(self):
+        # Shutting down the listening socket wakes the pending accept
+        try:
+            self.server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.server.close()
+        self.thread.join(1)
+
+
+def report(tick, level, flags=0, seq=0):
+    return struct.pack('=HHII', seq, flags, tick, level)
+
+
+@pytest.fixture()
+def pigpio(monkeypatch):
+    fake = FakePigpio()
+    monkeypatch.setitem(sys.modules, 'pigpio', fake)
+    monkeypatch.delitem(sys.modules, 'gpiozero.pins.pigpio', raising=False)
+    yield fake
+    # Don't leave the module built on the fake behind for other tests
+    sys.modules.pop('gpiozero.pins.pigpio', None)
+
+
+@pytest.fixture()
+def pigpio_module(pigpio):
+    module = import_module('gpiozero.pins.pigpio')
+    # Keep the health check out of the way of tests which simulate the
+    # daemon restarting
+    module.PiGPIOConnection.HEALTH_INTERVAL = 60
+    # There's nothing listening for the port probe to find; connection
+    # failures are simulated by the fake's refuse count instead
+    module.PiGPIOConnection._probe = lambda self: True
+    return module
+
+
+@pytest.fixture()
+def pigpio_factory(request, pigpio_module):
+    save_factory = Device.pin_factory
+    Device.pin_factory = pigpio_module.PiGPIOFactory('fake', 8888)
+    try:
+        yield Device.pin_factory
+    finally:
+        Device.pin_factory.close()
+        Device.pin_factory = save_factory
+
+
+def pwm_pin(factory, number, frequency=100):
+    pin = factory.pin(number)
+    pin.function = 'output'
+    pin.frequency = frequency
+    return pin
+
+
+def test_pigpio_wave_pulses(pigpio, pigpio_factory):
+    pin = pwm_pin(pigpio_factory, 17)
+    on, off = 1 << 17, 0
+    wave = pin.output_sequence([(1, 0.5), (1, 0.25), (0, 0), (0, 0.5)])
+    # Adjacent steps at the same level are merged, and empty steps dropped
+    assert wave._pulses([(1, 0.5), (1, 0.25), (0, 0), (0, 0.5)], 100) == [
+        pigpio.pulse(on, off, 750000), pigpio.pulse(off, on, 500000)]
+    # Intermediate states are software PWM at the pin's frequency, with the
+    # remainder of the step in the last cycle
+    assert wave._pulses([(0.25, 0.0031)], 1000) == [
+        pigpio.pulse(on, off, 258), pigpio.pulse(off, on, 775),
+        pigpio.pulse(on, off, 258), pigpio.pulse(off, on, 775),
+        pigpio.pulse(on, off, 258), pigpio.pulse(off, on, 776)]
+    # Steps too short for a full cycle still get one
+    assert wave._pulses([(0.5, 0.001)], 100) == [
+        pigpio.pulse(on, off, 500), pigpio.pulse(off, on, 500)]
+    # Delays longer than a single pulse can express are split
+    assert wave._pulses([(1, 5000)], 100) == [
+        pigpio.pulse(on, off, wave.MAX_DELAY),
+        pigpio.pulse(on, off, 5000000000 - wave.MAX_DELAY)]
+
+
+def test_pigpio_wave_chain(pigpio, pigpio_factory, pigpio_module):
+    PiGPIOWave = pigpio_module.PiGPIOWave
+    pin = pwm_pin(pigpio_factory, 17)
+    sequence = [(1, 0.1), (0, 0.1)]
+    wave = pin.output_sequence(sequence, None)
+    assert isinstance(wave, PiGPIOWave)
+    assert pigpio.daemon.chain == [255, 0, wave._wid, 255, 3]
+    assert pin._wave is wave and pigpio_factory._wave is wave
+    # Only one wave can play at a time
+    assert pin.output_sequence(sequence, 1) is None
+    assert pigpio_factory.pin(18).output_sequence(sequence, 1) is None
+    wave.stop()
+    assert not pigpio.daemon.waves
+    wave = pin.output_sequence(sequence, 1)
+    assert pigpio.daemon.chain == [wave._wid]
+    wave.stop()
+    wave = pin.output_sequence(sequence, PiGPIOWave.MAX_LOOPS)
+    assert pigpio.daemon.chain == [255, 0, wave._wid, 255, 1, 0xFF, 0xFF]
+    wave.stop()
+    assert pin.output_sequence(sequence, PiGPIOWave.MAX_LOOPS + 1) is None
+    assert pin.output_sequence(sequence, 0) is None
+    assert pin.output_sequence([(1, 0)], 1) is None
+    # Sequences with more pulses than the daemon can hold don't fit in a wave
+    pigpio.daemon.max_pulses = 1
+    assert pin.output_sequence(sequence, 1) is None
+    assert pigpio_factory._wave is None
+
+
+def test_pigpio_wave_batches(pigpio, pigpio_factory):
+    pin = pwm_pin(pigpio_factory, 17, frequency=8000)
+    wave = pin.output_sequence([(0.5, 0.2)], 1)
+    # Each batch after the first begins with a delay covering the pulses
+    # already added
+    batches = pigpio.daemon.waves[wave._wid]
+    assert [len(batch) for batch in batches] == [1000, 1001, 1001, 201]
+    assert batches[1][0] == pigpio.pulse(0, 0, 62500)
+    assert batches[2][0] == pigpio.pulse(0, 0, 125000)
+    wave.stop()
+
+
+def test_pigpio_wave_batches_long(pigpio, pigpio_factory, pigpio_module):
+    MAX_DELAY = pigpio_module.PiGPIOWave.MAX_DELAY
+    pin = pwm_pin(pigpio_factory, 17)
+    # Each 5000s step is split into two pulses, so the first batch of 1000
+    # pulses covers 500 steps; far more than a single delay can express
+    sequence = [(i % 2, 5000) for i in range(600)]
+    wave = pin.output_sequence(sequence, 1)
+    batches = pigpio.daemon.waves[wave._wid]
+    assert len(batches) == 2
+    lead = [pulse for pulse in batches[1] if not pulse.gpio_on | pulse.gpio_off]
+    assert all(pulse.delay <= MAX_DELAY for pulse in lead)
+    assert sum(pulse.delay for pulse in lead) == 500 * 5000000000
+    assert len(batches[1]) - len(lead) == 200
+    wave.stop()
+
+
+def test_pigpio_wave_state(pigpio, pigpio_factory):
+    pin = pwm_pin(pigpio_factory, 17)
+    wave = pin.output_sequence([(1, 0.1), (0.5, 0.1), (0, 0.1)], 2)
+    assert pigpio.daemon.pwm[17][2] == 0
+    assert wave.busy
+    start = wave._start
+    wave._start = start - 0.05
+    assert wave.state == 1
+    assert pin.state == 1
+    wave._start = start - 0.15
+    assert wave.state == 0.5
+    wave._start = start - 0.35
+    assert wave.state == 1
+    # Once the sequence should have finished, the daemon is asked if it has;
+    # while it's still busy the wave is left alone
+    wave._start = start - 0.65
+    assert wave.state == 0
+    assert pin._wave is wave
+    # When it has, the wave is released and the pin returns to PWM at the
+    # final state
+    pigpio.daemon.busy = False
+    assert wave.state == 0
+    assert pin._wave is None and pigpio_factory._wave is None
+    assert not pigpio.daemon.waves
+    assert not wave.busy
+    assert pigpio.daemon.pwm[17][2] == 0
+
+
+def test_pigpio_wave_stop(pigpio, pigpio_factory):
+    pin = pwm_pin(pigpio_factory, 17)
+    wave = pin.output_sequence([(1, 0.1), (0.5, 0.1)], None)
+    wave._start -= 0.15
+    pin.state = 0.25
+    assert ('wave_tx_stop',) in pigpio.daemon.calls
+    assert not pigpio.daemon.waves
+    assert pin._wave is None
+    assert pin.state == 0.25
+    assert pigpio.daemon.pwm[17] == [100, 10000, 2500]
+    wave.stop()
+    wave.join()
+
+
+def test_pigpio_pwm_blink(pigpio, pigpio_factory):
+    with PWMLED(17) as led:
+        led.pulse(0.1, 0.1)
+        assert isinstance(led._blink_thread, type(led.pin._wave))
+        assert pigpio.daemon.busy
+        led.off()
+        assert not pigpio.daemon.busy
+        assert led._blink_thread is None
+        assert led.value == 0
+    with pytest.raises(DeviceClosed):
+        led.pulse()
+
+
+def test_pigpio_pwm_blink_finite(pigpio, pigpio_factory):
+    with PWMLED(17) as led:
+        for i in range(5):
+            # A fire-and-forget finite blink frees its wave on the daemon as
+            # soon as the chain finishes, without anything querying it
+            led.blink(0.01, 0.01, n=2)
+            wave = led._blink_thread
+            assert isinstance(wave, type(led.pin._wave))
+            assert len(pigpio.daemon.waves) == 1
+            pigpio.daemon.busy = False
+            wave._reaper.join(1)
+            assert not pigpio.daemon.waves
+            assert led.pin._wave is None and pigpio_factory._wave is None
+            assert led.value == 0
+        # The timer waits for the daemon to finish transmitting
+        led.blink(0.01, 0.01, n=1)
+        wave = led._blink_thread
+        sleep(0.1)
+        assert pigpio.daemon.waves
+        pigpio.daemon.busy = False
+        wave._reaper.join(1)
+        assert not pigpio.daemon.waves
+        # Stopping a wave early cancels its timer
+        led.blink(1, 1, n=1)
+        wave = led._blink_thread
+        led.off()
+        wave._reaper.join(1)
+        assert not wave._reaper.is_alive()
+        assert not pigpio.daemon.waves
+
+
+def test_pigpio_pwm_shadow(pigpio, pigpio_factory):
+    pin = pigpio_factory.pin(17)
+    pin.function = 'output'
+    assert pin.frequency is None
+    # The shadow holds the frequency the daemon actually achieved
+    pin.frequency = 150
+    assert pin.frequency == 160
+    assert pin.state == 0
+    pin.state = 0.5
+    assert pin.state == 0.5
+    assert pigpio.daemon.pwm[17] == [160, 10000, 5000]
+    # None of the above needed to query the daemon's PWM settings
+    assert not [
+        call for call in pigpio.daemon.calls if call[0].startswith('get_PWM')]
+    # Re-writing the current state doesn't bother the daemon
+    del pigpio.daemon.calls[:]
+    pin.state = 0.5
+    assert not pigpio.daemon.calls
+    # Changing the frequency keeps the duty-cycle
+    pin.frequency = 1000
+    assert pin.frequency == 1000
+    assert pin.state == 0.5
+    assert pigpio.daemon.pwm[17] == [1000, 10000, 5000]
+    pin.frequency = 1000
+    assert [call[0] for call in pigpio.daemon.calls] == [
+        'set_PWM_frequency', 'set_PWM_range']
+    assert not [
+        call for call in pigpio.daemon.calls if call[0].startswith('get_PWM')]
+    pin.frequency = None
+    assert pin._pwm_state is None
+    assert pin.frequency is None
+    assert pin.state == 0
+    assert 17 not in pigpio.daemon.pwm
+    pin.frequency = 100
+    assert pin.frequency == 100
+    assert pin.state == 0
+    assert pigpio.daemon.pwm[17] == [100, 10000, 0]
+
+
+def test_pigpio_write_many(pigpio, pigpio_factory):
+    # A compute module, for pins in the second bank
+    pigpio.daemon.revision = 0xa020a0
+    pins = [pigpio_factory.pin(n) for n in (4, 17, 22, 40, 42)]
+    for pin in pins:
+        pin.function = 'output'
+    pigpio.daemon.levels = 1 << 22 | 1 << 42
+    del pigpio.daemon.calls[:]
+    pigpio_factory.write_many({
+        pins[0]: True, pins[1]: True, pins[2]: False,
+        pins[3]: True, pins[4]: False})
+    assert sorted(pigpio.daemon.calls) == [
+        ('clear_bank_1', 1 << 22),
+        ('clear_bank_2', 1 << (42 - 32)),
+        ('set_bank_1', 1 << 4 | 1 << 17),
+        ('set_bank_2', 1 << (40 - 32)),
+    ]
+    assert pigpio.daemon.levels == 1 << 4 | 1 << 17 | 1 << 40
+    assert pigpio_factory.read_many(pins) == (True, True, False, True, False)
+    # Banks with nothing to set (or clear) send no command
+    del pigpio.daemon.calls[:]
+    pigpio_factory.write_many({pins[0]: False, pins[1]: False})
+    assert pigpio.daemon.calls == [('clear_bank_1', 1 << 4 | 1 << 17)]
+    # PWM pins are set individually
+    pins[1].frequency = 100
+    del pigpio.daemon.calls[:]
+    pigpio_factory.write_many({pins[0]: True, pins[1]: 0.5})
+    assert pigpio.daemon.calls == [
+        ('set_PWM_dutycycle', 17, 5000), ('set_bank_1', 1 << 4)]
+
+
+def test_pigpio_write_many_input(pigpio, pigpio_factory):
+    output, input_ = pigpio_factory.pin(4), pigpio_factory.pin(17)
+    output.function = 'output'
+    del pigpio.daemon.calls[:]
+    # Input pins are refused from the local shadow of their function, before
+    # any command is sent
+    with pytest.raises(PinSetInput):
+        pigpio_factory.write_many({output: True, input_: True})
+    assert not pigpio.daemon.calls
+    input_.function = 'output'
+    pigpio_factory.write_many({output: True, input_: True})
+    assert pigpio.daemon.calls[-1] == ('set_bank_1', 1 << 4 | 1 << 17)
+    assert 'get_mode' not in {call[0] for call in pigpio.daemon.calls}
+
+
+def test_pigpio_notifier_stream(pigpio, pigpio_module):
+    daemon = NotifyStandIn()
+    factory = pigpio_module.PiGPIOFactory(
+        '127.0.0.1', daemon.port, bulk_events=True)
+    try:
+        conn = daemon.conns.get(timeout=1)
+        assert daemon.commands == [(99, 0, 0, 0)]
+        notifier = factory.notifier
+        assert notifier._handle == 0
+        events = Queue()
+        def changed(ticks, state):
+            events.put((ticks, state))
+        pin = factory.pin(17)
+        pin.when_changed = changed
+        assert pigpio.daemon.calls[-1] == ('notify_begin', 0, 1 << 17)
+        data = b''.join((
+            report(100, 1 << 17),
+            # Keep-alive reports carry no level
+            report(150, 0, flags=1 << 6),
+            # Changes of unwatched pins are ignored
+            report(200, 1 << 17 | 1 << 4),
+            report(300, 1 << 4),
+        ))
+        # Reports split across reads are re-assembled
+        conn.sendall(data[:5])
+        conn.sendall(data[5:20])
+        conn.sendall(data[20:])
+        assert events.get(timeout=1) == (100, True)
+        assert events.get(timeout=1) == (300, False)
+        assert events.empty()
+        pin.when_changed = None
+        assert pigpio.daemon.calls[-1] == ('notify_begin', 0, 0)
+        assert notifier.reports == 4
+        assert notifier.edges == 2
+    finally:
+        factory.close()
+        daemon.close()
+    assert ('notify_close', 0) in pigpio.daemon.calls
+    assert factory.notifier is None
+
+
+def test_pigpio_notifier_dispatch(pigpio, pigpio_module):
+    daemon = NotifyStandIn()
+    factory = pigpio_module.PiGPIOFactory(
+        '127.0.0.1', daemon.port, bulk_events=True)
+    try:
+        notifier = factory.notifier
+        events = []
+        def changed(pin):
+            def handler(ticks, state):
+                events.append((pin, ticks, state))
+            return handler
+        # The initial level of a pin is read when it's watched, so its first
+        # report isn't mistaken for an edge
+        pigpio.daemon.levels = 1 << 22
+        pins = {n: factory.pin(n) for n in (4, 17, 22)}
+        pins[17].edges = 'rising'
+        pins[22].edges = 'falling'
+        handlers = {n: changed(n) for n in pins}
+        for n, pin in pins.items():
+            pin.when_changed = handlers[n]
+        # Several pins changing in one report are all dispatched
+        notifier._dispatch(b''.join((
+            report(100, 1 << 22 | 1 << 17 | 1 << 4),
+            report(200, 0),
+            report(300, 1 << 22 | 1 << 17),
+        )))
+        assert sorted(events) == [
+            (4, 100, True), (4, 200, False), (17, 100, True), (17, 300, True),
+            (22, 200, False)]
+        assert not pigpio.daemon.callbacks
+        assert (notifier.reports, notifier.edges) == (3, 5)
+        # Unwatched pins are no longer dispatched
+        pins[4].when_changed = None
+        events.clear()
+        notifier._dispatch(report(400, 1 << 22 | 1 << 17 | 1 << 4))
+        assert events == []
+    finally:
+        factory.close()
+        daemon.close()
+
+
+def test_pigpio_notifier_reconnect(pigpio, pigpio_module):
+    daemon = NotifyStandIn()
+    factory1 = pigpio_module.PiGPIOFactory(
+        '127.0.0.1', daemon.port, bulk_events=True)
+    factory2 = pigpio_module.PiGPIOFactory(
+        '127.0.0.1', daemon.port, bulk_events=True)
+    try:
+        conn = factory1.connection
+        assert factory2.connection is conn
+        old1, old2 = factory1.notifier, factory2.notifier
+        assert (old1._handle, old2._handle) == (0, 1)
+        factory1.pin(17).when_changed = lambda ticks, state: None
+        factory2.pin(22).when_changed = lambda ticks, state: None
+        pigpio.restart()
+        assert not conn.check()
+        # Each factory opened a new stream, and discarded its old one without
+        # closing the old handle on the new daemon, where that number may
+        # belong to some other stream
+        new1, new2 = factory1.notifier, factory2.notifier
+        assert (new1._handle, new2._handle) == (2, 3)
+        assert old1._thread is None and old2._thread is None
+        assert old1._sock.fileno() == -1 and old2._sock.fileno() == -1
+        assert 'notify_close' not in {call[0] for call in pigpio.daemon.calls}
+        assert ('notify_begin', 2, 1 << 17) in pigpio.daemon.calls
+        assert ('notify_begin', 3, 1 << 22) in pigpio.daemon.calls
+    finally:
+        factory1.close()
+        factory2.close()
+        daemon.close()
+    assert ('notify_close', 2) in pigpio.daemon.calls
+    assert ('notify_close', 3) in pigpio.daemon.calls
+
+
+def test_pigpio_connection_registry(pigpio, pigpio_module):
+    PiGPIOConnection = pigpio_module.PiGPIOConnection
+    factory1 = pigpio_module.PiGPIOFactory('fake', 8888)
+    factory2 = pigpio_module.PiGPIOFactory('fake', 8888)
+    factory3 = pigpio_module.PiGPIOFactory('fake', 8889)
+    try:
+        assert factory1.connection is factory2.connection
+        assert factory1.connection is not factory3.connection
+        assert set(PiGPIOConnection._connections) == {
+            ('fake', 8888), ('fake', 8889)}
+        conn = factory1.connection
+        pi = conn._pi
+        factory1.close()
+        assert factory1.connection is None
+        assert conn._factories == [factory2]
+        assert pi.sl.s is not None
+        factory2.close()
+        assert pi.sl.s is None
+        assert set(PiGPIOConnection._connections) == {('fake', 8889)}
+    finally:
+        factory1.close()
+        factory2.close()
+        factory3.close()
+    assert not PiGPIOConnection._connections
+
+
+def test_pigpio_connection_refused(pigpio, pigpio_module):
+    pigpio.refuse = 1
+    with pytest.raises(IOError):
+        pigpio_module.PiGPIOFactory('fake', 8888)
+
+
+def test_pigpio_reconnect(pigpio, pigpio_factory):
+    conn = pigpio_factory.connection
+    output = pigpio_factory.pin(4)
+    output.function = 'output'
+    pwm = pwm_pin(pigpio_factory, 17, frequency=150)
+    pwm.state = 0.5
+    button = pigpio_factory.pin(22)
+    button.pull = 'up'
+    button.bounce = 0.01
+    handler = lambda ticks, state: None
+    button.when_changed = handler
+    old_callback = pigpio.daemon.callbacks[-1]
+    pigpio.restart()
+    output.state = True
+    assert (conn.reconnects, conn.retried) == (1, 1)
+    daemon = pigpio.daemon
+    assert daemon.modes == {4: 1, 17: 1, 22: 0}
+    assert daemon.pulls == {22: 2}
+    assert daemon.filters == {4: 0, 17: 0, 22: 10000}
+    assert daemon.pwm == {17: [160, 10000, 5000]}
+    assert daemon.levels == 1 << 4
+    assert [(cb.gpio, cb.edge) for cb in daemon.callbacks] == [(22, 2)]
+    assert button._callback is daemon.callbacks[0]
+    assert button._callback is not old_callback
+    # The PWM settings are restored from the local shadow, not read back
+    # from the daemon, so they survive the daemon restarting again
+    assert not [call for call in daemon.calls if call[0].startswith('get_PWM')]
+    pigpio.restart()
+    assert not conn.check()
+    assert conn.reconnects == 2
+    assert pigpio.daemon.pwm == {17: [160, 10000, 5000]}
+    assert pwm.frequency == 160
+    assert pwm.state == 0.5
+    assert conn.check()
+
+
+def test_pigpio_reconnect_wave(pigpio, pigpio_factory):
+    pin = pwm_pin(pigpio_factory, 17)
+    wave = pin.output_sequence([(1, 0.1), (0.5, 0.1)], None)
+    wave._start -= 0.15
+    pigpio.restart()
+    pigpio_factory.connection.check()
+    # The wave died with the daemon; the pin is left at the state it was
+    # outputting
+    assert pin._wave is None and pigpio_factory._wave is None
+    assert wave._wid is None and not wave.busy
+    assert pigpio.daemon.pwm == {17: [100, 10000, 5000]}
+    assert pin.state == 0.5
+    wave.stop()
+    assert not [
+        call for call in pigpio.daemon.calls if call[0].startswith('wave')]
+
+
+def test_pigpio_reconnect_no_retry(pigpio, pigpio_factory):
+    conn = pigpio_factory.connection
+    conn.read(4)
+    # Wrappers are bound to the connection once
+    assert conn.read is conn.read
+    assert 'read' in vars(conn)
+    # Commands creating daemon-side state aren't repeated on the new daemon,
+    # although the connection is still re-established
+    pigpio.restart()
+    with pytest.raises(OSError):
+        conn.wave_create()
+    assert (conn.reconnects, conn.retried) == (1, 0)
+    assert ('wave_create',) not in pigpio.daemon.calls
+    pigpio.restart()
+    conn.read(4)
+    assert (conn.reconnects, conn.retried) == (2, 1)
+
+
+def test_pigpio_reconnect_backoff(pigpio, pigpio_factory):
+    conn = pigpio_factory.connection
+    conn.BACKOFF = 0.001
+    pigpio.restart()
+    pigpio.refuse = 2
+    conn.read(4)
+    assert conn.reconnects == 1
+    assert pigpio.refuse == 0
+    # Commands only make a few attempts to reconnect, rather than stalling
+    # their caller for the whole backoff
+    pigpio.restart()
+    pigpio.refuse = conn.RETRIES
+    with pytest.raises(IOError):
+        conn.read(4)
+    assert conn.reconnects == 1
+    assert pigpio.refuse == conn.RETRIES - conn.COMMAND_RETRIES
+    # The health check keeps trying for longer
+    pigpio.refuse = conn.RETRIES - 1
+    assert not conn.check()
+    assert conn.reconnects == 2
+
+
+def test_pigpio_reconnect_busy(pigpio, pigpio_factory):
+    conn = pigpio_factory.connection
+    pigpio.restart()
+    # While another thread is reconnecting, commands fail immediately rather
+    # than waiting for it
+    reconnecting = Event()
+    done = Event()
+    def hold():
+        with conn._lock:
+            reconnecting.set()
+            done.wait(1)
+    thread = Thread(target=hold)
+    thread.start()
+    try:
+        reconnecting.wait(1)
+        with pytest.raises(IOError):
+            conn.read(4)
+        with pytest.raises(OSError):
+            conn.wave_create()
+        assert (conn.reconnects, conn.retried) == (0, 0)
+    finally:
+        done.set()
+        thread.join()
+    conn.read(4)
+    assert (conn.reconnects, conn.retried) == (1, 1)
+
+
+def test_pigpio_reconnect_probe(pigpio, capsys):
+    # Unlike the pigpio_module fixture, this leaves the real port probe in
+    # place
+    module = import_module('gpiozero.pins.pigpio')
+    module.PiGPIOConnection.HEALTH_INTERVAL = 60
+    factory = module.PiGPIOFactory('fake', 8888)
+    try:
+        conn = factory.connection
+        conn.BACKOFF = 0.001
+        # Probe a port that nothing is listening on
+        with socket.create_server(('127.0.0.1', 0)) as server:
+            port = server.getsockname()[1]
+        conn._host, conn._port = '127.0.0.1', port
+        attempts = []
+        pigpio.pi = lambda host, port: attempts.append((host, port))
+        pigpio.restart()
+        with pytest.raises(IOError):
+            conn.read(4)
+        # pigpio.pi (which prints a warning on every failure) is never
+        # constructed while the daemon's port is closed
+        assert attempts == []
+        assert capsys.readouterr().out == ''
+        conn._probe = lambda: True
+        del pigpio.pi
+        conn.read(4)
+        assert conn.reconnects == 1
+    finally:
+        factory.close()
+
+
+def test_pigpio_reconnect_restore_fails(pigpio, pigpio_module):
+    pigpio_module.PiGPIOConnection.HEALTH_INTERVAL = 0.01
+    factory = pigpio_module.PiGPIOFactory('fake', 8888)
+    restored = Queue()
+    class BrokenFactory:
+        failures = 2
+        def _restore(self):
+            restored.put(self.failures)
+            if self.failures:
+                self.failures -= 1
+                raise pigpio.error('bad setting')
+    try:
+        conn = factory.connection
+        broken = BrokenFactory()
+        conn._factories.append(broken)
+        with pytest.warns(PinWarning):
+            pigpio.restart()
+            # The health thread survives the failed restores, and tries again
+            # (with a fresh connection) on each following interval
+            assert restored.get(timeout=1) == 2
+            assert restored.get(timeout=1) == 1
+            assert restored.get(timeout=1) == 0
+        assert conn._monitor.is_alive()
+        assert conn.reconnects == 1
+        assert conn.check()
+        conn._factories.remove(broken)
+    finally:
+        factory.close()
+
+
+def test_pigpio_reconnect_spi(pigpio, pigpio_factory):
+    hw = pigpio_factory.spi(port=0, device=0)
+    hw.rate = 1000000
+    sw = pigpio_factory.spi(
+        clock_pin=21, mosi_pin=20, miso_pin=19, select_pin=16)
+    closed = pigpio_factory.spi(port=0, device=1)
+    closed.close()
+    assert pigpio.daemon.spis == {1: (0, 1000000, hw._spi_flags)}
+    pigpio.restart()
+    pigpio_factory.connection.check()
+    # The interfaces are re-opened, with their settings, on the new daemon
+    assert pigpio.daemon.spis == {0: (0, 1000000, hw._spi_flags)}
+    assert hw._handle == 0
+    assert pigpio.daemon.bb_spis == {
+        sw._select_pin: (sw._miso_pin, sw._mosi_pin, sw._clock_pin, 100000, 0)}
+    assert hw.transfer([1, 2, 3]) == [1, 2, 3]
+    assert sw.transfer([1, 2, 3]) == [1, 2, 3]
+    assert closed.closed
+    hw.close()
+    sw.close()
@@ -121,6 +121,23 @@ def test_pi_info():
 def test_pi_info_other_types():
     assert pi_info(b'9000f1') == pi_info(0x9000f1)
 
+@pytest.mark.filterwarnings('ignore::DeprecationWarning')
+def test_pi_info_cached():
+    board_info = PiBoardInfo.from_revision(0xa21041)
+    assert PiBoardInfo.from_revision(0xa21041) is board_info
+    assert pi_info('a21041') is board_info
+    assert PiBoardInfo.from_revision(0x900092) is not board_info
+
+def test_lazy_headers():
+    board_info = PiBoardInfo.from_revision(0xa21041)
+    assert set(board_info.headers) == {'J8', 'RUN'}
+    assert board_info.headers['J8'] is board_info.headers['J8']
+    assert board_info.headers['J8'].pins[11].name == 'GPIO17'
+    assert dict(board_info.headers) == {
+        name: PiBoardInfo._make_header(name, data)
+        for name, data in board_info.headers._dict.items()
+    }
+
 def test_find_pin():
     board_info = PiBoardInfo.from_revision(0xa21041)
     assert {('J8', 1), ('J8', 17)} == {
@@ -136,6 +153,21 @@ def test_find_pin():
         for (head, pin) in board_info.find_pin('GPIO47')
     }
 
+def test_find_pin_aliases():
+    board_info = PiBoardInfo.from_revision(0xa21041)
+    for name in ('GPIO17', 'BCM17', 'BOARD11', 'J8:11', 'WPI0', 17, '17'):
+        assert [
+            (head.name, pin.number) for (head, pin) in board_info.find_pin(name)
+        ] == [('J8', 11)]
+        assert board_info.to_gpio(name) == 'GPIO17'
+    assert [
+        (head.name, pin.number) for (head, pin) in board_info.find_pin('GND')
+    ] == [('J8', n) for n in (6, 9, 14, 20, 25, 30, 34, 39)] + [('RUN', 2)]
+    with pytest.raises(PinInvalidPin):
+        board_info.to_gpio('GND')
+    with pytest.raises(PinInvalidPin):
+        board_info.to_gpio('GPIO47')
+
 @pytest.mark.filterwarnings('ignore::DeprecationWarning')
 def test_physical_pins():
     # Assert physical pins for some well-known Pi's; a21041 is a Pi2B
@@ -12,8 +12,9 @@
 
 import pytest
 from math import isclose
+from time import sleep
 
-from gpiozero.pins.mock import MockSPIDevice
+from gpiozero.pins.mock import MockFactory, MockSPIDevice
 from gpiozero import *
 
 
@@ -290,6 +291,51 @@ def test_spi_software_write(mock_factory):
         assert test_device.rx_word() == 257
 
 
+def test_spi_software_transfer_into(mock_factory):
+    class SPISlave(MockSPIDevice):
+        def on_start(self):
+            super().on_start()
+            for i in range(10):
+                self.tx_word(i)
+    with SPISlave(11, 10, 9, 8) as slave, mock_factory.spi() as master:
+        rx = bytearray(4)
+        assert master.transfer_into(b'\x02\x00\x01', rx) == 3
+        assert rx == b'\x00\x01\x02\x00'
+        # 0b 0000_0010 0000_0000 0000_0001
+        assert slave.rx_word() == 0x020001
+
+
+def test_spi_software_batched_writes():
+    class BatchedMockFactory(MockFactory):
+        batches = 0
+
+        def write_many(self, states):
+            self.batches += 1
+            super().write_many(states)
+
+    class SPISlave(MockSPIDevice):
+        def on_start(self):
+            super().on_start()
+            for i in range(10):
+                self.tx_word(i)
+
+    save_factory = Device.pin_factory
+    Device.pin_factory = factory = BatchedMockFactory()
+    try:
+        with SPISlave(11, 10, 9, 8) as slave, factory.spi() as master:
+            assert master.transfer([2, 0, 1]) == [0, 1, 2]
+            assert slave.rx_word() == 0x020001
+            assert factory.batches == 24
+            slave.clock_phase = True
+            master.clock_phase = True
+            assert master.transfer([2, 0, 1]) == [0, 1, 2]
+            assert slave.rx_word() == 0x020001
+            assert factory.batches == 48
+    finally:
+        factory.reset()
+        Device.pin_factory = save_factory
+
+
 def test_spi_software_write_lsb_first(mock_factory):
     with MockSPIDevice(11, 10, 9, 8, lsb_first=True) as test_device, \
             mock_factory.spi() as master:
@@ -482,3 +528,178 @@ def test_MCP3304(mock_factory):
         single_mcp_test(mock, pot, 5, 12)
     with MCP3304(channel=5, differential=True) as pot:
         differential_mcp_test(mock, pot, 5, 4, 12, full=True)
+
+
+def test_MCP3008_read_channels(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    mock.channels = [i * 0.4 for i in range(8)]
+    with MCP3008() as adc:
+        with pytest.raises(SPIBadChannel):
+            adc.read_channels([8])
+        raw = adc.read_channels(range(8), raw=True)
+        assert raw == tuple(scale(v, 3.3, 10) for v in mock.channels)
+        values = adc.read_channels([7, 0, 3])
+        assert len(values) == 3
+        for value, channel in zip(values, (7, 0, 3)):
+            assert isclose(value, mock.channels[channel] / 3.3, abs_tol=0.01)
+        assert adc.read_channels([]) == ()
+    with pytest.raises(DeviceClosed):
+        adc.read_channels([0])
+
+
+def test_MCP3304_read_channels_differential(mock_factory):
+    mock = MockMCP3304(11, 10, 9, 8)
+    mock.channels = [0.5, 2.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+    with MCP3304(differential=True) as adc:
+        values = adc.read_channels([0, 2])
+        assert isclose(values[0], -1.5 / 3.3, abs_tol=0.01)
+        assert isclose(values[1], 1.0 / 3.3, abs_tol=0.01)
+
+
+def test_MCP3001_read_channels(mock_factory):
+    mock = MockMCP3001(11, 10, 9, 8)
+    mock.channels = [2.0, 0.5]
+    with MCP3001() as adc:
+        with pytest.raises(SPIBadChannel):
+            adc.read_channels([1])
+        assert adc.read_channels([0, 0], raw=True) == (adc.raw_value,) * 2
+
+
+def test_analog_input_channels(mock_factory):
+    mock = MockMCP3208(11, 10, 9, 8)
+    mock.channels = [i * 0.4 for i in range(8)]
+    with pytest.raises(SPIBadChannel):
+        AnalogInputChannels(MCP3208, [0, 8])
+    with pytest.raises(InputDeviceError):
+        AnalogInputChannels(MCP3208, [])
+    with AnalogInputChannels(MCP3208, max_voltage=5.0) as adc:
+        assert repr(adc).startswith(
+            '<gpiozero.AnalogInputChannels object reading channels '
+            '(0, 1, 2, 3, 4, 5, 6, 7) of <gpiozero.MCP3208 object')
+        assert isinstance(adc.adc, MCP3208)
+        assert adc.channels == tuple(range(8))
+        assert adc.raw_value == tuple(scale(v, 3.3, 12) for v in mock.channels)
+        for value, voltage, expected in zip(
+                adc.value, adc.voltage, mock.channels):
+            assert isclose(value, expected / 3.3, abs_tol=0.01)
+            assert isclose(voltage, expected / 3.3 * 5.0, abs_tol=0.01)
+        assert not adc.closed
+    assert adc.closed
+    assert adc.adc is None
+    assert repr(adc) == '<gpiozero.AnalogInputChannels object closed>'
+    with AnalogInputChannels(MCP3201) as adc:
+        assert adc.channels == (0,)
+
+
+def test_analog_input_channels_is_active(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    with AnalogInputChannels(MCP3008, [0, 3, 5]) as adc:
+        assert adc.raw_value == (0, 0, 0)
+        assert not adc.is_active
+        mock.channels[3] = 1.0
+        assert adc.is_active
+        mock.channels[3] = 0.0
+        mock.channels[4] = 1.0
+        assert not adc.is_active
+
+
+def test_analog_input_stream_bad_init(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    with MCP3008() as adc:
+        with pytest.raises(InputDeviceError):
+            adc.stream(0)
+        with pytest.raises(InputDeviceError):
+            adc.stream(100, block_size=0)
+        with pytest.raises(InputDeviceError):
+            adc.stream(100, blocks=1)
+        with pytest.raises(InputDeviceError):
+            adc.stream(100, channels=[])
+        with pytest.raises(SPIBadChannel):
+            adc.stream(100, channels=[8])
+
+
+def test_analog_input_stream(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    mock.channels = [0.4, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0, 3.0]
+    with MCP3008() as adc:
+        with adc.stream(200, channels=[1, 7], block_size=5) as stream:
+            assert stream.channels == (1, 7)
+            assert stream.block_size == 5
+            timestamps, (ch1, ch7) = stream.read(timeout=5)
+            assert len(timestamps) == len(ch1) == len(ch7) == 5
+            assert list(timestamps) == sorted(timestamps)
+            assert list(ch1) == [scale(2.0, 3.3, 10)] * 5
+            assert list(ch7) == [scale(3.0, 3.3, 10)] * 5
+            assert not stream.closed
+        assert stream.closed
+        assert 0 < stream.rate <= 250
+        # Any remaining complete blocks can still be read, then the stream
+        # is exhausted
+        assert all(len(block.timestamps) == 5 for block in stream)
+        assert stream.read() is None
+        with adc.stream(200, block_size=4) as stream:
+            assert stream.channels is None
+            timestamps, (ch0,) = stream.read(timeout=5)
+            assert list(ch0) == [scale(0.4, 3.3, 10)] * 4
+
+
+def test_analog_input_stream_overruns(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    with MCP3008() as adc:
+        with adc.stream(1000, block_size=2, blocks=2) as stream:
+            sleep(0.1)
+            assert stream.overruns > 0
+            assert stream.read(timeout=5) is not None
+
+
+def test_analog_input_stream_device_closed(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    adc = MCP3008()
+    stream = adc.stream(1000, block_size=1000)
+    adc.close()
+    assert stream.closed
+    assert stream.read(timeout=5) is None
+    with pytest.raises(DeviceClosed):
+        adc.stream(1000)
+
+
+def test_analog_input_stream_error(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    with MCP3008() as adc:
+        read_samples = adc._read_samples
+        reads = 0
+        def failing_read_samples(channels, count):
+            nonlocal reads
+            reads += 1
+            if reads > 3:
+                raise IOError('SPI failure')
+            return read_samples(channels, count)
+        adc._read_samples = failing_read_samples
+        stream = adc.stream(1000, block_size=1)
+        with pytest.raises(IOError):
+            # The blocks taken before the failure are read first
+            for block in stream:
+                assert len(block.timestamps) == 1
+        # The stream closed itself when its thread died
+        assert stream.closed
+        assert stream not in adc._streams
+        with pytest.raises(IOError):
+            stream.read(timeout=1)
+        stream.close()
+        assert stream.closed
+
+
+def test_MCP3008_command_frames(mock_factory):
+    mock = MockMCP3008(11, 10, 9, 8)
+    mock.channels[2] = 1.0
+    with MCP3008(channel=2) as adc:
+        assert adc.raw_value == scale(1.0, 3.3, 10)
+        frame = adc._frame(2)
+        assert frame == bytes(adc._send(2))
+        assert adc._frame(2) is frame
+        adc._spi.bits_per_word = 4
+        assert adc._frame(2) == adc._send(2)
+        assert all(word < 16 for word in adc._frame(2))
+        adc._spi.bits_per_word = 8
+        assert adc._frame(2) == frame
+        assert adc.raw_value == scale(1.0, 3.3, 10)
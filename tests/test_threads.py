@@ -9,7 +9,9 @@
 import threading
 from unittest import mock
 
-from gpiozero.threads import GPIOThread
+import pytest
+
+from gpiozero.threads import GPIOThread, EventExecutor
 
 
 def test_join_after_already_joined_does_not_rejoin():
@@ -48,3 +50,77 @@ def test_join_still_waits_for_a_running_thread():
     evt.set()
     thread.join(1)
     assert not thread.is_alive()
+
+
+def blocker(started, gate):
+    # Returns a handler which signals *started* then waits (a bounded time)
+    # for *gate*, occupying its worker
+    def handler():
+        started.set()
+        gate.wait(5)
+    return handler
+
+
+def test_event_executor_orders_per_key():
+    results = []
+    with EventExecutor(max_workers=4) as executor:
+        for i in range(20):
+            executor.submit('a', lambda i=i: results.append(('a', i)))
+            executor.submit('b', lambda i=i: results.append(('b', i)))
+    assert [i for key, i in results if key == 'a'] == list(range(20))
+    assert [i for key, i in results if key == 'b'] == list(range(20))
+    assert executor.queue_depth == 0
+    assert executor.dropped == 0
+
+
+def test_event_executor_drop():
+    started = threading.Event()
+    gate = threading.Event()
+    results = []
+    with EventExecutor(max_workers=1, max_queue=2) as executor:
+        executor.submit('a', blocker(started, gate))
+        # The handler is dequeued before it runs
+        assert started.wait(1)
+        assert executor.queue_depth == 0
+        for i in range(4):
+            executor.submit('a', lambda i=i: results.append(i))
+        assert executor.queue_depth == 2
+        assert executor.dropped == 2
+        gate.set()
+    assert results == [0, 1]
+
+
+def test_event_executor_coalesce():
+    started = threading.Event()
+    gate = threading.Event()
+    results = []
+    with EventExecutor(
+            max_workers=1, max_queue=2, policy='coalesce') as executor:
+        executor.submit('a', blocker(started, gate))
+        # The handler is dequeued before it runs
+        assert started.wait(1)
+        assert executor.queue_depth == 0
+        for i in range(4):
+            executor.submit('a', lambda i=i: results.append(i))
+        assert executor.queue_depth == 2
+        assert executor.dropped == 2
+        gate.set()
+    assert results == [2, 3]
+
+
+def test_event_executor_handler_error():
+    results = []
+    with mock.patch('sys.excepthook') as excepthook:
+        with EventExecutor() as executor:
+            executor.submit('a', lambda: 1 / 0)
+            executor.submit('a', lambda: results.append(1))
+    assert results == [1]
+    assert excepthook.call_count == 1
+    assert excepthook.call_args[0][0] is ZeroDivisionError
+
+
+def test_event_executor_bad_init():
+    with pytest.raises(ValueError):
+        EventExecutor(policy='foo')
+    with pytest.raises(ValueError):
+        EventExecutor(max_queue=0)